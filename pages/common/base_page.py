@@ -0,0 +1,74 @@
+"""Engine-agnostic base page with common functionality."""
+import json
+from pages.common.driver import Driver
+from utils.catalog import CART_STORAGE_KEY, product_ids
+from utils.config import config
+from utils.tracing import traced
+
+class BasePage:
+    """Base class for page objects that run on either engine.
+
+    Wrap the engine's handle in an adapter first:
+    BasePage(SeleniumDriver(webdriver)) or BasePage(PlaywrightDriver(page)).
+    The per-engine page objects in pages/selenium and pages/playwright are
+    these same pages with the adapter built for them.
+    """
+    
+    def __init__(self, browser: Driver):
+        self.browser = browser
+        self.base_url = config.BASE_URL
+        
+    @property
+    def engine(self) -> str:
+        return self.browser.name
+        
+    @traced("navigate_to", locator_args=1)
+    def navigate_to(self, path: str = ""):
+        """Navigate to a specific path."""
+        self.browser.goto(f"{self.base_url}{path}")
+        
+    @traced("seed_cart")
+    def seed_cart(self, products, path: str = "/inventory.html"):
+        """Put products (slugs) in the cart's localStorage, then load path."""
+        ids = product_ids(products)
+        if not self.browser.url.startswith(self.base_url):
+            # Storage can only be written for the loaded origin
+            self.browser.goto(f"{self.base_url}{config.AUTH_BOOTSTRAP_PATH}")
+        self.browser.execute("window.localStorage.setItem(arguments[0], arguments[1]);",
+                             CART_STORAGE_KEY, json.dumps(ids))
+        self.navigate_to(path)
+        
+    @traced("click", locator_args=1)
+    def click(self, selector: str):
+        """Click an element."""
+        self.browser.click(selector)
+        
+    @traced("fill", locator_args=1)
+    def fill(self, selector: str, value: str):
+        """Fill an input field."""
+        self.browser.fill(selector, value)
+        
+    @traced("get_text", locator_args=1)
+    def get_text(self, selector: str) -> str:
+        """Get text content of an element."""
+        return self.browser.text(selector)
+        
+    @traced("is_visible", locator_args=1)
+    def is_visible(self, selector: str) -> bool:
+        """Check if element is visible now."""
+        return self.browser.is_visible(selector)
+        
+    @traced("count_now", locator_args=1)
+    def count_now(self, selector: str) -> int:
+        """Number of matching elements right now (no waiting)."""
+        return self.browser.count(selector)
+        
+    @traced("wait_for_element", locator_args=1, category="wait")
+    def wait_for_element(self, selector: str, state: str = "visible", timeout: float = None) -> bool:
+        """Wait for element to reach state; False on timeout."""
+        return self.browser.wait_for(selector, state, timeout)
+        
+    @traced("wait_for_url", locator_args=1, category="wait")
+    def wait_for_url(self, fragment: str, timeout: float = None):
+        """Wait for URL to contain fragment."""
+        self.browser.wait_for_url(fragment, timeout)
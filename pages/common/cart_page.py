@@ -0,0 +1,38 @@
+"""Engine-agnostic cart page object."""
+from pages.common.base_page import BasePage
+from pages.snapshots import CartSnapshot, snapshot_body
+from utils.tracing import traced
+
+class CartPage(BasePage):
+    """Shopping cart page interactions on either engine."""
+    
+    # Locators
+    CART_ITEMS = ".cart_item"
+    CART_CONTENTS = "#cart_contents_container"
+    CHECKOUT_BUTTON = "#checkout"
+    CONTINUE_SHOPPING = "#continue-shopping"
+    
+    def get_cart_item_count(self) -> int:
+        """Get number of items in cart."""
+        self.wait_for_element(self.CART_CONTENTS, "attached")
+        return self.count_now(self.CART_ITEMS)
+        
+    @traced("snapshot")
+    def snapshot(self) -> CartSnapshot:
+        """Read every cart row and the badge count in one call."""
+        return CartSnapshot.from_dict(self.browser.execute(snapshot_body()))
+        
+    def proceed_to_checkout(self):
+        """Click checkout button."""
+        self.click(self.CHECKOUT_BUTTON)
+        self.wait_for_url("checkout-step-one.html")
+        
+    def continue_shopping(self):
+        """Return to products page."""
+        self.click(self.CONTINUE_SHOPPING)
+        self.wait_for_url("inventory.html")
+        
+    def remove_item(self, product_id: str):
+        """Remove item from cart; returns once its row is gone."""
+        self.click(f"#remove-{product_id}")
+        self.wait_for_element(f"#remove-{product_id}", "detached")
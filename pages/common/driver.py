@@ -0,0 +1,48 @@
+"""Driver protocol the engine-agnostic page objects are written against.
+
+Selectors are CSS, timeouts are seconds and scripts are function bodies
+that read their arguments from ``arguments`` and ``return`` a value, so the
+same page object runs unchanged on SeleniumDriver and PlaywrightDriver.
+Every wait is event-driven on both engines; there are no fixed sleeps.
+"""
+from typing import Any, Protocol
+
+# States accepted by Driver.wait_for, as in Playwright's wait_for_selector
+STATES = ("attached", "detached", "visible", "hidden")
+
+class Driver(Protocol):
+    """Minimal browser surface shared by both engines."""
+    
+    name: str
+    timeout: float
+    
+    @property
+    def url(self) -> str:
+        """URL of the loaded page."""
+        
+    def goto(self, url: str):
+        """Load url and wait for the load event."""
+        
+    def click(self, selector: str):
+        """Wait for the element to be clickable and click it."""
+        
+    def fill(self, selector: str, text: str):
+        """Wait for the input to be visible, clear it and type text."""
+        
+    def text(self, selector: str) -> str:
+        """Wait for the element to be visible and return its rendered text."""
+        
+    def is_visible(self, selector: str) -> bool:
+        """Whether the element is visible right now (no waiting)."""
+        
+    def count(self, selector: str) -> int:
+        """Number of matching elements right now (no waiting)."""
+        
+    def wait_for(self, selector: str, state: str = "visible", timeout: float = None) -> bool:
+        """Wait for the element to reach state; False on timeout."""
+        
+    def wait_for_url(self, fragment: str, timeout: float = None):
+        """Wait for the URL to contain fragment; raise on timeout."""
+        
+    def execute(self, script: str, *args) -> Any:
+        """Run a function body in the page and return its result."""
@@ -0,0 +1,60 @@
+"""Driver adapter for a Playwright Page."""
+from typing import Any
+from playwright.sync_api import Page, TimeoutError as PlaywrightTimeoutError
+from pages.common.driver import STATES
+from utils.config import config
+
+class PlaywrightDriver:
+    """Driver protocol on top of a sync Playwright Page."""
+    
+    name = "playwright"
+    
+    def __init__(self, page: Page, timeout: float = None):
+        self.page = page
+        self.timeout = timeout if timeout is not None else config.PLAYWRIGHT_TIMEOUT / 1000
+        
+    @property
+    def url(self) -> str:
+        return self.page.url
+        
+    def _ms(self, timeout: float = None) -> float:
+        return (self.timeout if timeout is None else timeout) * 1000
+        
+    def goto(self, url: str):
+        self.page.goto(url)
+        
+    def click(self, selector: str):
+        self.page.click(selector, timeout=self._ms())
+        
+    def fill(self, selector: str, text: str):
+        self.page.fill(selector, text, timeout=self._ms())
+        
+    def text(self, selector: str) -> str:
+        locator = self.page.locator(selector).first
+        locator.wait_for(state="visible", timeout=self._ms())
+        return locator.inner_text()
+        
+    def is_visible(self, selector: str) -> bool:
+        return self.page.is_visible(selector)
+        
+    def count(self, selector: str) -> int:
+        return self.page.locator(selector).count()
+        
+    def wait_for(self, selector: str, state: str = "visible", timeout: float = None) -> bool:
+        if state not in STATES:
+            raise ValueError(f"Unknown state {state!r} (choose from {', '.join(STATES)})")
+        try:
+            self.page.wait_for_selector(selector, state=state, timeout=self._ms(timeout))
+            return True
+        except PlaywrightTimeoutError:
+            return False
+            
+    def wait_for_url(self, fragment: str, timeout: float = None):
+        self.page.wait_for_url(lambda url: fragment in url, timeout=self._ms(timeout))
+        
+    def execute(self, script: str, *args) -> Any:
+        # Run the body as a function so `arguments` and `return` behave as
+        # they do in WebDriver's execute_script
+        return self.page.evaluate(
+            "(args) => (function () {" + script + "\n}).apply(null, args)", list(args)
+        )
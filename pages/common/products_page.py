@@ -0,0 +1,53 @@
+"""Engine-agnostic products page object."""
+from pages.common.base_page import BasePage
+from pages.snapshots import InventorySnapshot, snapshot_body
+from utils.tracing import traced
+
+class ProductsPage(BasePage):
+    """Products page interactions on either engine."""
+    
+    # Locators
+    PRODUCTS_TITLE = ".title"
+    INVENTORY_ITEMS = ".inventory_item"
+    CART_BADGE = ".shopping_cart_badge"
+    CART_LINK = ".shopping_cart_link"
+    PRODUCT_SORT = ".product_sort_container"
+    
+    # Reads the badge in-page so an absent badge costs no wait
+    BADGE_COUNT_SCRIPT = (
+        "var badge = document.querySelector('.shopping_cart_badge');"
+        "return badge ? parseInt(badge.textContent, 10) || 0 : 0;"
+    )
+    
+    def is_loaded(self, timeout: float = 5) -> bool:
+        """Check if products page is loaded."""
+        return self.wait_for_element(self.PRODUCTS_TITLE, timeout=timeout)
+        
+    def get_product_count(self) -> int:
+        """Get number of products displayed."""
+        self.wait_for_element(self.INVENTORY_ITEMS)
+        return self.count_now(self.INVENTORY_ITEMS)
+        
+    def add_item_to_cart(self, product_id: str):
+        """Add specific product to cart by ID; returns once the button has flipped."""
+        self.click(f"#add-to-cart-{product_id}")
+        self.wait_for_element(f"#remove-{product_id}", "attached")
+        
+    def remove_item_from_cart(self, product_id: str):
+        """Remove specific product from cart; returns once the button has flipped."""
+        self.click(f"#remove-{product_id}")
+        self.wait_for_element(f"#add-to-cart-{product_id}", "attached")
+        
+    def get_cart_count(self) -> int:
+        """Get number of items in cart."""
+        return self.browser.execute(self.BADGE_COUNT_SCRIPT)
+        
+    @traced("snapshot")
+    def snapshot(self) -> InventorySnapshot:
+        """Read every product, the badge count and the sort order in one call."""
+        return InventorySnapshot.from_dict(self.browser.execute(snapshot_body()))
+        
+    def go_to_cart(self):
+        """Navigate to cart page."""
+        self.click(self.CART_LINK)
+        self.wait_for_url("cart.html")
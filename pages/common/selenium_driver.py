@@ -0,0 +1,93 @@
+"""Driver adapter for Selenium WebDriver."""
+from typing import Any
+from selenium.common.exceptions import StaleElementReferenceException, TimeoutException
+from selenium.webdriver.common.by import By
+from selenium.webdriver.remote.webdriver import WebDriver
+from selenium.webdriver.support import expected_conditions as EC
+from selenium.webdriver.support.ui import WebDriverWait
+from pages.common.driver import STATES
+from utils.config import config
+
+# Element state in one round trip; unlike find_element, an absent element
+# does not cost an implicit wait
+_STATE_SCRIPT = """
+var element = document.querySelector(arguments[0]);
+if (!element) { return 'detached'; }
+var box = element.getBoundingClientRect();
+var style = window.getComputedStyle(element);
+return box.width && box.height && style.visibility !== 'hidden' ? 'visible' : 'hidden';
+"""
+
+_MATCHES = {
+    "attached": ("visible", "hidden"),
+    "detached": ("detached",),
+    "visible": ("visible",),
+    "hidden": ("hidden", "detached"),
+}
+
+class SeleniumDriver:
+    """Driver protocol on top of a WebDriver."""
+    
+    name = "selenium"
+    
+    def __init__(self, driver: WebDriver, timeout: float = None, poll_interval: float = None):
+        self.driver = driver
+        self.timeout = timeout if timeout is not None else config.SELENIUM_WAIT_TIMEOUT
+        self.poll_interval = poll_interval if poll_interval is not None else config.SELENIUM_POLL_INTERVAL
+        
+    @property
+    def url(self) -> str:
+        return self.driver.current_url
+        
+    def _until(self, condition, timeout: float = None, message: str = ""):
+        wait = WebDriverWait(self.driver, self.timeout if timeout is None else timeout,
+                             poll_frequency=self.poll_interval,
+                             ignored_exceptions=(StaleElementReferenceException,))
+        return wait.until(condition, message)
+        
+    def goto(self, url: str):
+        self.driver.get(url)
+        
+    def click(self, selector: str):
+        def clicked(driver):
+            element = EC.element_to_be_clickable((By.CSS_SELECTOR, selector))(driver)
+            if not element:
+                return False
+            element.click()
+            return True
+        self._until(clicked, message=f"{selector} was never clickable")
+        
+    def fill(self, selector: str, text: str):
+        element = self._until(EC.visibility_of_element_located((By.CSS_SELECTOR, selector)),
+                              message=f"{selector} was never visible")
+        element.clear()
+        element.send_keys(text)
+        
+    def text(self, selector: str) -> str:
+        element = self._until(EC.visibility_of_element_located((By.CSS_SELECTOR, selector)),
+                              message=f"{selector} was never visible")
+        return element.text
+        
+    def is_visible(self, selector: str) -> bool:
+        return self.driver.execute_script(_STATE_SCRIPT, selector) == "visible"
+        
+    def count(self, selector: str) -> int:
+        return self.driver.execute_script(
+            "return document.querySelectorAll(arguments[0]).length;", selector
+        )
+        
+    def wait_for(self, selector: str, state: str = "visible", timeout: float = None) -> bool:
+        if state not in STATES:
+            raise ValueError(f"Unknown state {state!r} (choose from {', '.join(STATES)})")
+        try:
+            self._until(lambda driver: driver.execute_script(_STATE_SCRIPT, selector) in _MATCHES[state],
+                        timeout)
+            return True
+        except TimeoutException:
+            return False
+            
+    def wait_for_url(self, fragment: str, timeout: float = None):
+        self._until(EC.url_contains(fragment), timeout, f"URL never contained '{fragment}'")
+        
+    def execute(self, script: str, *args) -> Any:
+        return self.driver.execute_script(script, *args)
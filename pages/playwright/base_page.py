@@ -1,43 +1,40 @@
 """Playwright base page with common functionality."""
 from playwright.sync_api import Page, expect
-from utils.config import config
+from pages.common.base_page import BasePage as CommonBasePage
+from pages.common.playwright_driver import PlaywrightDriver
+from utils.tracing import traced
 
-class BasePage:
-    """Base class for all Playwright page objects."""
+class BasePage(CommonBasePage):
+    """Base class for all Playwright page objects.
+
+    The shared page objects in pages/common run on a PlaywrightDriver over
+    ``page``; this adds what only Playwright pages offer. Absence checks
+    (count_now, is_absent) read the DOM once without auto-waiting;
+    assert_eventually_absent polls only until the element is gone or hidden.
+    """
     
     def __init__(self, page: Page):
+        super().__init__(PlaywrightDriver(page))
         self.page = page
-        self.base_url = config.BASE_URL
-        
-    def navigate_to(self, path: str = ""):
-        """Navigate to a specific path."""
-        url = f"{self.base_url}{path}"
-        self.page.goto(url)
         
     def get_title(self) -> str:
         """Get page title."""
         return self.page.title()
         
-    def wait_for_url(self, url_pattern: str, timeout: int = config.PLAYWRIGHT_TIMEOUT):
-        """Wait for URL to match pattern."""
-        self.page.wait_for_url(url_pattern, timeout=timeout)
-        
-    def click(self, selector: str):
-        """Click an element."""
-        self.page.click(selector)
-        
-    def fill(self, selector: str, value: str):
-        """Fill an input field."""
-        self.page.fill(selector, value)
+    @traced("is_absent", locator_args=1)
+    def is_absent(self, selector: str) -> bool:
+        """Check that no matching element is visible right now (no waiting)."""
+        return self.page.locator(f"{selector} >> visible=true").count() == 0
         
-    def get_text(self, selector: str) -> str:
-        """Get text content of an element."""
-        return self.page.locator(selector).text_content()
-        
-    def is_visible(self, selector: str) -> bool:
-        """Check if element is visible."""
-        return self.page.locator(selector).is_visible()
-        
-    def wait_for_element(self, selector: str, timeout: int = config.PLAYWRIGHT_TIMEOUT):
-        """Wait for element to be visible."""
-        self.page.wait_for_selector(selector, timeout=timeout)
+    @traced("assert_eventually_absent", locator_args=1, category="wait")
+    def assert_eventually_absent(self, selector: str, timeout: float = None,
+                                 message: str = None):
+        """Wait until no matching element is visible.
+
+        Returns as soon as the element is gone or hidden; raises
+        AssertionError if one is still visible after timeout seconds.
+        """
+        timeout = timeout if timeout is not None else self.browser.timeout
+        expect(self.page.locator(f"{selector} >> visible=true"), message).to_have_count(
+            0, timeout=timeout * 1000
+        )
@@ -0,0 +1,43 @@
+"""Async Playwright base page with common functionality."""
+from playwright.async_api import Page
+from utils.config import config
+
+class BasePage:
+    """Base class for all async Playwright page objects."""
+    
+    def __init__(self, page: Page):
+        self.page = page
+        self.base_url = config.BASE_URL
+        
+    async def navigate_to(self, path: str = ""):
+        """Navigate to a specific path."""
+        url = f"{self.base_url}{path}"
+        await self.page.goto(url)
+        
+    async def get_title(self) -> str:
+        """Get page title."""
+        return await self.page.title()
+        
+    async def wait_for_url(self, url_pattern: str, timeout: int = config.PLAYWRIGHT_TIMEOUT):
+        """Wait for URL to match pattern."""
+        await self.page.wait_for_url(url_pattern, timeout=timeout)
+        
+    async def click(self, selector: str):
+        """Click an element."""
+        await self.page.click(selector)
+        
+    async def fill(self, selector: str, value: str):
+        """Fill an input field."""
+        await self.page.fill(selector, value)
+        
+    async def get_text(self, selector: str) -> str:
+        """Get text content of an element."""
+        return await self.page.locator(selector).text_content()
+        
+    async def is_visible(self, selector: str) -> bool:
+        """Check if element is visible."""
+        return await self.page.locator(selector).is_visible()
+        
+    async def wait_for_element(self, selector: str, timeout: int = config.PLAYWRIGHT_TIMEOUT):
+        """Wait for element to be visible."""
+        await self.page.wait_for_selector(selector, timeout=timeout)
@@ -0,0 +1,26 @@
+"""Async Playwright cart page object."""
+from pages.playwright_async.base_page import BasePage
+
+class CartPage(BasePage):
+    """Shopping cart page interactions using the async Playwright API."""
+    
+    # Locators
+    CART_ITEMS = ".cart_item"
+    CHECKOUT_BUTTON = "#checkout"
+    CONTINUE_SHOPPING = "#continue-shopping"
+    
+    async def get_cart_item_count(self) -> int:
+        """Get number of items in cart."""
+        return await self.page.locator(self.CART_ITEMS).count()
+        
+    async def proceed_to_checkout(self):
+        """Click checkout button."""
+        await self.click(self.CHECKOUT_BUTTON)
+        
+    async def continue_shopping(self):
+        """Return to products page."""
+        await self.click(self.CONTINUE_SHOPPING)
+        
+    async def remove_item(self, product_id: str):
+        """Remove item from cart."""
+        await self.click(f"#remove-{product_id}")
@@ -0,0 +1,29 @@
+"""Async Playwright login page object."""
+from pages.playwright_async.base_page import BasePage
+
+class LoginPage(BasePage):
+    """Login page interactions using the async Playwright API."""
+    
+    # Locators
+    USERNAME_INPUT = "#user-name"
+    PASSWORD_INPUT = "#password"
+    LOGIN_BUTTON = "#login-button"
+    ERROR_MESSAGE = "[data-test='error']"
+    
+    async def navigate(self):
+        """Navigate to login page."""
+        await self.navigate_to("/")
+        
+    async def login(self, username: str, password: str):
+        """Perform login action."""
+        await self.fill(self.USERNAME_INPUT, username)
+        await self.fill(self.PASSWORD_INPUT, password)
+        await self.click(self.LOGIN_BUTTON)
+        
+    async def get_error_message(self) -> str:
+        """Get error message text."""
+        return await self.get_text(self.ERROR_MESSAGE)
+        
+    async def is_error_displayed(self) -> bool:
+        """Check if error message is displayed."""
+        return await self.is_visible(self.ERROR_MESSAGE)
@@ -0,0 +1,38 @@
+"""Async Playwright products page object."""
+from pages.playwright_async.base_page import BasePage
+
+class ProductsPage(BasePage):
+    """Products page interactions using the async Playwright API."""
+    
+    # Locators
+    PRODUCTS_TITLE = ".title"
+    INVENTORY_ITEMS = ".inventory_item"
+    CART_BADGE = ".shopping_cart_badge"
+    CART_LINK = ".shopping_cart_link"
+    PRODUCT_SORT = ".product_sort_container"
+    
+    async def is_loaded(self) -> bool:
+        """Check if products page is loaded."""
+        return await self.is_visible(self.PRODUCTS_TITLE)
+        
+    async def get_product_count(self) -> int:
+        """Get number of products displayed."""
+        return await self.page.locator(self.INVENTORY_ITEMS).count()
+        
+    async def add_item_to_cart(self, product_id: str):
+        """Add specific product to cart by ID."""
+        await self.click(f"#add-to-cart-{product_id}")
+        
+    async def remove_item_from_cart(self, product_id: str):
+        """Remove specific product from cart."""
+        await self.click(f"#remove-{product_id}")
+        
+    async def get_cart_count(self) -> int:
+        """Get number of items in cart."""
+        if not await self.is_visible(self.CART_BADGE):
+            return 0
+        return int(await self.get_text(self.CART_BADGE))
+        
+    async def go_to_cart(self):
+        """Navigate to cart page."""
+        await self.click(self.CART_LINK)
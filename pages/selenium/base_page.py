@@ -1,65 +1,288 @@
 """Selenium base page with common functionality."""
+from contextlib import contextmanager
+from typing import Dict
+from selenium.common.exceptions import (
+    ElementClickInterceptedException,
+    ElementNotInteractableException,
+    StaleElementReferenceException,
+    TimeoutException,
+)
 from selenium.webdriver.remote.webdriver import WebDriver
+from selenium.webdriver.remote.webelement import WebElement
 from selenium.webdriver.support.ui import WebDriverWait
 from selenium.webdriver.support import expected_conditions as EC
 from selenium.webdriver.common.by import By
+from pages.common.base_page import BasePage as CommonBasePage
+from pages.common.selenium_driver import SeleniumDriver
 from utils.config import config
+from utils.tracing import traced
 
-class BasePage:
-    """Base class for all Selenium page objects."""
+# Resolves once no DOM mutation has been observed for `quietMs`, or with -1
+# when `timeoutMs` elapses first.
+_DOM_QUIET_SCRIPT = """
+var quietMs = arguments[0], timeoutMs = arguments[1];
+var done = arguments[arguments.length - 1];
+var started = Date.now(), quietTimer = null, hardTimer = null;
+var observer = new MutationObserver(function () {
+    clearTimeout(quietTimer);
+    quietTimer = setTimeout(finish, quietMs);
+});
+function finish() {
+    observer.disconnect();
+    clearTimeout(hardTimer);
+    done(Date.now() - started);
+}
+observer.observe(document, {childList: true, subtree: true, attributes: true, characterData: true});
+quietTimer = setTimeout(finish, quietMs);
+hardTimer = setTimeout(function () {
+    observer.disconnect();
+    clearTimeout(quietTimer);
+    done(-1);
+}, timeoutMs);
+"""
+
+class ElementCache:
+    """Selector-keyed WebElement handles with hit/miss/stale counters.
+
+    ``totals`` aggregates the counters of every cache in the process.
+    """
+    
+    totals: Dict[str, int] = {"hits": 0, "misses": 0, "stale": 0}
     
-    def __init__(self, driver: WebDriver):
+    def __init__(self, enabled: bool = True):
+        self.enabled = enabled
+        self._elements: Dict[str, WebElement] = {}
+        self.hits = 0
+        self.misses = 0
+        self.stale = 0
+        
+    def get(self, key: str):
+        """Return the cached handle for key (counting a hit) or None."""
+        element = self._elements.get(key)
+        if element is not None:
+            self._count("hits")
+        return element
+        
+    def put(self, key: str, element: WebElement):
+        """Remember a freshly located element (counting a miss)."""
+        self._count("misses")
+        if self.enabled:
+            self._elements[key] = element
+            
+    def discard(self, key: str, stale: bool = False):
+        """Forget key, counting a stale handle if it went stale."""
+        if self._elements.pop(key, None) is not None and stale:
+            self._count("stale")
+            
+    def clear(self):
+        """Forget every handle (after navigation)."""
+        self._elements.clear()
+        
+    def stats(self) -> Dict[str, int]:
+        return {"hits": self.hits, "misses": self.misses, "stale": self.stale}
+        
+    def _count(self, kind: str):
+        setattr(self, kind, getattr(self, kind) + 1)
+        ElementCache.totals[kind] += 1
+
+
+class BasePage(CommonBasePage):
+    """Base class for all Selenium page objects.
+
+    The shared page objects in pages/common run on a SeleniumDriver over
+    ``driver``; this adds what only Selenium pages offer. Waits are event
+    driven: every wait_* helper polls its condition every POLL_INTERVAL
+    seconds and returns as soon as it holds, raising TimeoutException after
+    WAIT_TIMEOUT seconds. Both can be overridden per page instance; one
+    WebDriverWait is kept per timeout.
+
+    click/fill/get_text reuse the WebElement found by an earlier call with
+    the same selector. A handle that went stale is re-located transparently
+    and navigate_to() drops all handles.
+
+    Absence checks (is_absent, assert_eventually_absent) query the DOM with
+    the driver's implicit wait at zero, so a missing element answers at once
+    instead of after SELENIUM_IMPLICIT_WAIT seconds; count_now and
+    is_visible read it in one script call.
+    """
+    
+    WAIT_TIMEOUT = config.SELENIUM_WAIT_TIMEOUT
+    POLL_INTERVAL = config.SELENIUM_POLL_INTERVAL
+    
+    def __init__(self, driver: WebDriver, timeout: float = None, poll_interval: float = None):
+        self.timeout = timeout if timeout is not None else self.WAIT_TIMEOUT
+        self.poll_interval = poll_interval if poll_interval is not None else self.POLL_INTERVAL
+        super().__init__(SeleniumDriver(driver, self.timeout, self.poll_interval))
         self.driver = driver
-        self.base_url = config.BASE_URL
-        self.wait = WebDriverWait(driver, 10)
+        self._waits: Dict[float, WebDriverWait] = {}
+        self.wait = self._wait_for(self.timeout)
+        self.elements = ElementCache(config.SELENIUM_ELEMENT_CACHE)
         
     def navigate_to(self, path: str = ""):
-        """Navigate to a specific path."""
-        url = f"{self.base_url}{path}"
-        self.driver.get(url)
+        """Navigate to a specific path, dropping every cached element."""
+        self.elements.clear()
+        super().navigate_to(path)
         
     def get_title(self) -> str:
         """Get page title."""
         return self.driver.title
         
+    @traced("wait_until", category="wait")
+    def wait_until(self, condition, timeout: float = None, message: str = ""):
+        """Wait for a condition to return a truthy value and return it."""
+        return self._wait_for(timeout if timeout is not None else self.timeout).until(
+            condition, message
+        )
+        
+    def _wait_for(self, timeout: float) -> WebDriverWait:
+        """Return the WebDriverWait for timeout, creating it once."""
+        wait = self._waits.get(timeout)
+        if wait is None:
+            wait = self._waits[timeout] = WebDriverWait(
+                self.driver, timeout, poll_frequency=self.poll_interval
+            )
+        return wait
+        
     def wait_for_url_contains(self, url_fragment: str, timeout: int = 10):
         """Wait for URL to contain specific text."""
-        WebDriverWait(self.driver, timeout).until(
-            EC.url_contains(url_fragment)
-        )
+        self.wait_until(EC.url_contains(url_fragment), timeout,
+                        f"URL never contained '{url_fragment}'")
+        
+    def wait_for_url_change(self, previous_url: str, timeout: float = None):
+        """Wait for the URL to move away from previous_url."""
+        self.wait_until(EC.url_changes(previous_url), timeout,
+                        f"URL never changed from '{previous_url}'")
+        
+    def wait_for_staleness(self, element: WebElement, timeout: float = None):
+        """Wait for an element to be detached from the DOM."""
+        self.wait_until(EC.staleness_of(element), timeout,
+                        "Element was never detached from the DOM")
+        
+    def wait_for_script_value_change(self, script: str, previous, timeout: float = None):
+        """Wait for an in-page script to return something other than previous.
+
+        Returns the new value.
+        """
+        def changed(driver):
+            value = driver.execute_script(script)
+            return (value,) if value != previous else False
+        return self.wait_until(changed, timeout,
+                               f"Script value never changed from {previous!r}")[0]
+        
+    @traced("wait_for_dom_quiet", category="wait")
+    def wait_for_dom_quiet(self, quiet_ms: int = 100, timeout: float = None) -> int:
+        """Wait until no DOM mutations occur for quiet_ms milliseconds.
+
+        Uses an injected MutationObserver, so the wait is a single script
+        call. The driver's script timeout is raised to cover it and put
+        back afterwards, so later async scripts (e.g. on a pooled driver)
+        keep their own. Returns the milliseconds spent waiting.
+        """
+        timeout = timeout if timeout is not None else self.timeout
+        previous = self.driver.timeouts.script
+        self.driver.set_script_timeout(timeout + 1)
+        try:
+            elapsed = self.driver.execute_async_script(
+                _DOM_QUIET_SCRIPT, quiet_ms, int(timeout * 1000)
+            )
+        finally:
+            self.driver.set_script_timeout(previous)
+        if elapsed < 0:
+            raise TimeoutException(f"DOM did not settle within {timeout}s")
+        return elapsed
         
-    def click(self, by: By, locator: str):
+    def _cached(self, selector: str, condition, action, timeout: float = None):
+        """Run action on the element for selector, reusing a cached handle.
+
+        A cached handle is used without waiting. If it went stale, or is
+        not ready for the action, the element is located again through
+        condition (an expected_conditions factory taking a locator).
+        """
+        element = self.elements.get(selector)
+        if element is not None:
+            try:
+                return action(element)
+            except StaleElementReferenceException:
+                self.elements.discard(selector, stale=True)
+            except (ElementNotInteractableException, ElementClickInterceptedException):
+                self.elements.discard(selector)
+                
+        element = self.wait_until(condition((By.CSS_SELECTOR, selector)), timeout)
+        self.elements.put(selector, element)
+        return action(element)
+        
+    @traced("click", locator_args=1)
+    def click(self, selector: str):
         """Click an element."""
-        element = self.wait.until(EC.element_to_be_clickable((by, locator)))
-        element.click()
+        self._cached(selector, EC.element_to_be_clickable, lambda element: element.click())
         
-    def send_keys(self, by: By, locator: str, text: str):
-        """Send keys to an input field."""
-        element = self.wait.until(EC.visibility_of_element_located((by, locator)))
-        element.clear()
-        element.send_keys(text)
+    @traced("fill", locator_args=1)
+    def fill(self, selector: str, value: str):
+        """Fill an input field."""
+        def type_text(element):
+            element.clear()
+            element.send_keys(value)
+        self._cached(selector, EC.visibility_of_element_located, type_text)
         
-    def get_text(self, by: By, locator: str) -> str:
+    @traced("get_text", locator_args=1)
+    def get_text(self, selector: str) -> str:
         """Get text content of an element."""
-        element = self.wait.until(EC.visibility_of_element_located((by, locator)))
-        return element.text
+        def read_text(element):
+            text = element.text
+            if not text and not element.is_displayed():
+                # Hidden elements report no text; wait for it to show again
+                raise ElementNotInteractableException("element is hidden")
+            return text
+        return self._cached(selector, EC.visibility_of_element_located, read_text)
         
-    def is_visible(self, by: By, locator: str, timeout: int = 5) -> bool:
-        """Check if element is visible."""
+    @contextmanager
+    def no_implicit_wait(self):
+        """Run the block with the driver's implicit wait at zero, then restore it.
+
+        The factory and the pool set SELENIUM_IMPLICIT_WAIT on every driver,
+        so that is what is restored; asking the driver would cost a round trip.
+        """
+        if not config.SELENIUM_IMPLICIT_WAIT:
+            yield
+            return
+        self.driver.implicitly_wait(0)
         try:
-            WebDriverWait(self.driver, timeout).until(
-                EC.visibility_of_element_located((by, locator))
-            )
-            return True
-        except:
-            return False
+            yield
+        finally:
+            self.driver.implicitly_wait(config.SELENIUM_IMPLICIT_WAIT)
             
-    def wait_for_element(self, by: By, locator: str, timeout: int = 10):
-        """Wait for element to be visible."""
-        WebDriverWait(self.driver, timeout).until(
-            EC.visibility_of_element_located((by, locator))
-        )
+    def _absent(self, selector: str) -> bool:
+        """True when no element matching selector is displayed right now."""
+        for element in self.driver.find_elements(By.CSS_SELECTOR, selector):
+            try:
+                if element.is_displayed():
+                    return False
+            except StaleElementReferenceException:
+                # Removed while we looked at it
+                continue
+        return True
         
+    @traced("is_absent", locator_args=1)
+    def is_absent(self, selector: str) -> bool:
+        """Check that no matching element is displayed right now (no waiting)."""
+        with self.no_implicit_wait():
+            return self._absent(selector)
+            
+    @traced("assert_eventually_absent", locator_args=1, category="wait")
+    def assert_eventually_absent(self, selector: str, timeout: float = None,
+                                 message: str = ""):
+        """Poll until no matching element is displayed.
+
+        Returns as soon as the element is gone or hidden; raises
+        AssertionError if one is still displayed after timeout seconds.
+        """
+        timeout = timeout if timeout is not None else self.timeout
+        try:
+            with self.no_implicit_wait():
+                self._wait_for(timeout).until(lambda driver: self._absent(selector))
+        except TimeoutException:
+            raise AssertionError(message or f"{selector} still displayed after {timeout}s") from None
+            
     def find_element(self, by: By, locator: str):
         """Find and return an element."""
         return self.driver.find_element(by, locator)
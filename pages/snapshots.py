@@ -0,0 +1,163 @@
+"""Page state snapshots read in a single browser round trip.
+
+Both engines run the same in-page script and build the same models, so a
+test can check many facts about the inventory or cart with one call:
+
+    snapshot = products_page.snapshot()
+    assert snapshot.cart_count == 2
+    assert snapshot.item("sauce-labs-backpack").in_cart
+"""
+from typing import Dict, List, Optional
+
+# Function body shared by both engines, run through Driver.execute()
+_SNAPSHOT_BODY = """
+function price(node) {
+    return node ? parseFloat(node.textContent.replace(/[^0-9.]/g, '')) || 0 : 0;
+}
+function itemId(node) {
+    var link = node.querySelector('a[id$="_title_link"]');
+    var match = link ? /item_(\\d+)_title_link/.exec(link.id) : null;
+    return match ? parseInt(match[1], 10) : null;
+}
+function slug(button) {
+    return button ? button.id.replace(/^(add-to-cart|remove)-/, '') : null;
+}
+function read(node) {
+    var button = node.querySelector('button');
+    var name = node.querySelector('.inventory_item_name');
+    var quantity = node.querySelector('.cart_quantity');
+    return {
+        id: itemId(node),
+        slug: slug(button),
+        name: name ? name.textContent.trim() : '',
+        price: price(node.querySelector('.inventory_item_price')),
+        inCart: !!button && button.id.indexOf('remove-') === 0,
+        quantity: quantity ? parseInt(quantity.textContent, 10) || 0 : 0
+    };
+}
+var badge = document.querySelector('.shopping_cart_badge');
+var sort = document.querySelector('.product_sort_container');
+return {
+    url: window.location.href,
+    cartCount: badge ? parseInt(badge.textContent, 10) || 0 : 0,
+    sort: sort ? sort.value : null,
+    items: Array.prototype.map.call(document.querySelectorAll('.inventory_item'), read),
+    rows: Array.prototype.map.call(document.querySelectorAll('.cart_item'), read)
+};
+"""
+
+
+def snapshot_body() -> str:
+    """Snapshot function body for the engine-agnostic Driver.execute()."""
+    return _SNAPSHOT_BODY
+
+
+class InventoryItem:
+    """One product tile on the inventory page."""
+
+    __slots__ = ("item_id", "slug", "name", "price", "in_cart")
+
+    def __init__(self, item_id: Optional[int], slug: str, name: str, price: float, in_cart: bool):
+        self.item_id = item_id
+        self.slug = slug
+        self.name = name
+        self.price = price
+        self.in_cart = in_cart
+
+    @property
+    def button(self) -> str:
+        """Button currently offered for the item: "add" or "remove"."""
+        return "remove" if self.in_cart else "add"
+
+    def __repr__(self) -> str:
+        return f"InventoryItem({self.slug!r}, ${self.price:.2f}, in_cart={self.in_cart})"
+
+
+class CartRow:
+    """One line on the cart page."""
+
+    __slots__ = ("item_id", "slug", "name", "price", "quantity")
+
+    def __init__(self, item_id: Optional[int], slug: str, name: str, price: float, quantity: int):
+        self.item_id = item_id
+        self.slug = slug
+        self.name = name
+        self.price = price
+        self.quantity = quantity
+
+    def __repr__(self) -> str:
+        return f"CartRow({self.slug!r}, qty={self.quantity}, ${self.price:.2f})"
+
+
+class InventorySnapshot:
+    """Inventory page state: products, badge count and sort selection."""
+
+    __slots__ = ("url", "items", "cart_count", "sort")
+
+    def __init__(self, url: str, items: List[InventoryItem], cart_count: int, sort: Optional[str]):
+        self.url = url
+        self.items = items
+        self.cart_count = cart_count
+        self.sort = sort
+
+    @classmethod
+    def from_dict(cls, data: Dict) -> "InventorySnapshot":
+        """Build a snapshot from the in-page script's result."""
+        items = [InventoryItem(item["id"], item["slug"], item["name"], item["price"], item["inCart"])
+                 for item in data["items"]]
+        return cls(data["url"], items, data["cartCount"], data["sort"])
+
+    @property
+    def product_count(self) -> int:
+        return len(self.items)
+
+    @property
+    def names(self) -> List[str]:
+        return [item.name for item in self.items]
+
+    @property
+    def prices(self) -> List[float]:
+        return [item.price for item in self.items]
+
+    @property
+    def in_cart(self) -> List[str]:
+        """Slugs of the items showing a Remove button."""
+        return [item.slug for item in self.items if item.in_cart]
+
+    def item(self, slug: str) -> InventoryItem:
+        """Return the item with slug, raising KeyError if it is not listed."""
+        for item in self.items:
+            if item.slug == slug:
+                return item
+        raise KeyError(slug)
+
+
+class CartSnapshot:
+    """Cart page state: rows and badge count."""
+
+    __slots__ = ("url", "rows", "cart_count")
+
+    def __init__(self, url: str, rows: List[CartRow], cart_count: int):
+        self.url = url
+        self.rows = rows
+        self.cart_count = cart_count
+
+    @classmethod
+    def from_dict(cls, data: Dict) -> "CartSnapshot":
+        """Build a snapshot from the in-page script's result."""
+        rows = [CartRow(row["id"], row["slug"], row["name"], row["price"], row["quantity"])
+                for row in data["rows"]]
+        return cls(data["url"], rows, data["cartCount"])
+
+    @property
+    def item_count(self) -> int:
+        return len(self.rows)
+
+    @property
+    def slugs(self) -> List[str]:
+        return [row.slug for row in self.rows]
+
+    @property
+    def total(self) -> float:
+        """Sum of row prices times quantities."""
+        return round(sum(row.price * row.quantity for row in self.rows), 2)
@@ -1,125 +1,924 @@
-"""Pytest fixtures and configuration for both Selenium and Playwright."""
+"""Pytest fixtures and configuration for both Selenium and Playwright.
+
+Browser engines and page objects are imported by the fixtures that use them,
+so collecting or running one engine's tests never pays for the other.
+"""
+import importlib.util
+import json
+import os
+import sys
+import time
+import warnings
+from typing import TYPE_CHECKING
 import pytest
-from playwright.sync_api import sync_playwright, Browser, BrowserContext, Page
+from utils.startup_profile import ImportProfiler, format_profile
+
+# Options are parsed only after conftest is imported; check argv directly so
+# the profile also covers the imports below
+_import_profiler = ImportProfiler()
+if "--startup-profile" in sys.argv:
+    _import_profiler.install()
+_conftest_started = time.perf_counter()
+
 from utils.config import config
-from utils.helpers import take_screenshot
-from utils.driver_factory import DriverFactory
+from utils.local_server import LocalStorefront
+from utils.auth_cache import AuthCache
+from utils.benchmark import Benchmark, compare, format_table, write_results
+from utils.screenshots import ScreenshotSink
+from utils.resource_blocking import BlockingPolicy, BlockingStats, format_stats, route_context
+from utils.impact import ChangeSet, CoverageRecorder, load_map, save_map, select
+from utils.tracing import (format_slowest, merge_summary, summarize, summary_rows,
+                           tracer, write_trace)
+
+if TYPE_CHECKING:
+    from playwright.sync_api import Browser, BrowserContext, Page
+    from pages.common.driver import Driver
+    from utils.flake_tracker import AttemptRecorder, RerunBudget
+    from utils.lpt_scheduler import LPTScheduling
+    from utils.prelaunch import PlaywrightServer, SeleniumPrelaunch
+    from utils.timing_history import PhaseRecorder
+
+# ========== BROWSER ENGINES ==========
+
+# Engine -> installed; fixtures of a missing engine are never registered
+ENGINES = {engine: importlib.util.find_spec(engine) is not None
+           for engine in ("selenium", "playwright")}
+# Fixture name -> engine, for fixtures left unregistered
+_missing_fixtures = {}
+
+def _engine_fixture(engine: str):
+    """pytest.fixture if engine is installed, else a decorator that only records the name."""
+    if ENGINES[engine]:
+        return pytest.fixture
+    
+    def unregistered(function=None, **kwargs):
+        def record(function):
+            _missing_fixtures[function.__name__] = engine
+            return function
+        return record(function) if function is not None else record
+    return unregistered
+
+selenium_fixture = _engine_fixture("selenium")
+playwright_fixture = _engine_fixture("playwright")
+
+def _skip_missing_engines(items):
+    """Skip tests needing an engine that is not installed."""
+    for item in items:
+        missing = {_missing_fixtures[name] for name in item.fixturenames if name in _missing_fixtures}
+        missing.update(engine for engine, installed in ENGINES.items()
+                       if not installed and item.get_closest_marker(engine))
+        if missing:
+            item.add_marker(pytest.mark.skip(reason=f"{', '.join(sorted(missing))} not installed"))
+
+# ========== LOCAL STOREFRONT ==========
+
+LOCAL_STOREFRONT_KEY = pytest.StashKey[LocalStorefront]()
+ORIGINAL_BASE_URL_KEY = pytest.StashKey[str]()
+
+def _start_local_storefront(pytest_config):
+    """Serve the bundled storefront on a random port when enabled.
+    
+    Runs at session start, i.e. once per xdist worker and before browsers
+    are pre-launched, and points config.BASE_URL at the loopback server.
+    """
+    if not (pytest_config.getoption("--local-server") or config.USE_LOCAL_SERVER):
+        return
+    server = LocalStorefront().start()
+    pytest_config.stash[LOCAL_STOREFRONT_KEY] = server
+    pytest_config.stash[ORIGINAL_BASE_URL_KEY] = config.BASE_URL
+    config.BASE_URL = server.url
+
+def _stop_local_storefront(pytest_config):
+    server = pytest_config.stash.get(LOCAL_STOREFRONT_KEY, None)
+    if server is not None:
+        config.BASE_URL = pytest_config.stash[ORIGINAL_BASE_URL_KEY]
+        server.stop()
+        del pytest_config.stash[LOCAL_STOREFRONT_KEY]
+
+@pytest.fixture(scope="session", autouse=True)
+def local_storefront(request):
+    """The local storefront started for this session, or None when disabled."""
+    return request.config.stash.get(LOCAL_STOREFRONT_KEY, None)
+
+# ========== RESOURCE BLOCKING ==========
+
+# Run-wide counters of requests blocked in Playwright contexts
+_blocked_resources = BlockingStats()
+
+@pytest.fixture(scope="session", autouse=True)
+def resource_policy(local_storefront):
+    """Blocking policy for this run; drivers read it from config at launch."""
+    return BlockingPolicy.from_config()
+
+# ========== AUTHENTICATION ==========
+
+@pytest.fixture(scope="session")
+def auth_cache(request):
+    """Session-wide login cache, or None when disabled."""
+    if request.config.getoption("--no-auth-cache") or not config.AUTH_CACHE:
+        return None
+    return AuthCache()
+
+def _login_user(request) -> str:
+    """User to authenticate as: @pytest.mark.login_as(user) or VALID_USER."""
+    marker = request.node.get_closest_marker("login_as")
+    return marker.args[0] if marker else config.VALID_USER
+
+def _cart_products(request) -> list:
+    """Products to pre-load into the cart: @pytest.mark.cart_with(*slugs)."""
+    marker = request.node.get_closest_marker("cart_with")
+    return list(marker.args) if marker else []
 
-# Selenium imports
-from pages.selenium.login_page import LoginPage as SeleniumLoginPage
-from pages.selenium.products_page import ProductsPage as SeleniumProductsPage
-from pages.selenium.cart_page import CartPage as SeleniumCartPage
+# ========== BROWSER PRE-LAUNCH ==========
 
-# Playwright imports
-from pages.playwright.login_page import LoginPage as PlaywrightLoginPage
-from pages.playwright.products_page import ProductsPage as PlaywrightProductsPage
-from pages.playwright.cart_page import CartPage as PlaywrightCartPage
+SELENIUM_PRELAUNCH_KEY = pytest.StashKey["SeleniumPrelaunch"]()
+PLAYWRIGHT_SERVER_KEY = pytest.StashKey["PlaywrightServer"]()
+
+def _is_xdist_controller(pytest_config) -> bool:
+    """Whether this process only distributes tests to xdist workers."""
+    return (not hasattr(pytest_config, "workerinput")
+            and getattr(pytest_config.option, "dist", "no") != "no")
+
+def pytest_sessionstart(session):
+    """Start the local storefront and the --prelaunch browsers before collection."""
+    pytest_config = session.config
+    if _is_xdist_controller(pytest_config):
+        return
+    _start_local_storefront(pytest_config)
+    # Drivers read the blocking policy from config when they launch
+    preset = pytest_config.getoption("--block-resources")
+    if preset:
+        config.BLOCK_RESOURCES = preset
+    launch_profile = pytest_config.getoption("--launch-profile")
+    if launch_profile:
+        config.LAUNCH_PROFILE = launch_profile
+    
+    from utils.prelaunch import PlaywrightServer, SeleniumPrelaunch, parse_engines
+    try:
+        engines = parse_engines(pytest_config.getoption("--prelaunch") or config.PRELAUNCH)
+    except ValueError as error:
+        raise pytest.UsageError(str(error))
+    if "selenium" in engines and ENGINES["selenium"]:
+        browser = pytest_config.getoption("--selenium-browser", default=None) or config.SELENIUM_BROWSER
+        pytest_config.stash[SELENIUM_PRELAUNCH_KEY] = SeleniumPrelaunch(browser).start()
+    if "playwright" in engines and ENGINES["playwright"]:
+        pytest_config.stash[PLAYWRIGHT_SERVER_KEY] = PlaywrightServer().start()
+
+# Fixture through which each engine uses its pre-launched browser
+PRELAUNCH_FIXTURES = {"selenium": "selenium_driver", "playwright": "playwright_browser"}
+
+def pytest_collection_finish(session):
+    """Stop pre-launched browsers that no collected test needs."""
+    fixturenames = set()
+    for item in session.items:
+        fixturenames.update(item.fixturenames)
+        # engine_driver requests its browser only at run time
+        callspec = getattr(item, "callspec", None)
+        if callspec is not None and "engine" in callspec.params:
+            fixturenames.add(PRELAUNCH_FIXTURES[callspec.params["engine"]])
+    unused = [engine for engine, fixture in PRELAUNCH_FIXTURES.items()
+              if fixture not in fixturenames]
+    _close_prelaunched(session.config, unused)
+
+def _close_prelaunched(pytest_config, engines=("selenium", "playwright")):
+    stash = pytest_config.stash
+    if "selenium" in engines and SELENIUM_PRELAUNCH_KEY in stash:
+        stash[SELENIUM_PRELAUNCH_KEY].close()
+        del stash[SELENIUM_PRELAUNCH_KEY]
+    if "playwright" in engines and PLAYWRIGHT_SERVER_KEY in stash:
+        stash[PLAYWRIGHT_SERVER_KEY].stop()
+        del stash[PLAYWRIGHT_SERVER_KEY]
+
+# ========== FAILURE ARTIFACTS ==========
+
+def _artifact_mode(request) -> str:
+    """Artifact mode from --artifacts or config.ARTIFACT_MODE."""
+    return request.config.getoption("--artifacts") or config.ARTIFACT_MODE
+
+def _test_failed(request) -> bool:
+    """Whether any phase of the requesting test has failed so far."""
+    return any(getattr(getattr(request.node, f"rep_{when}", None), "failed", False)
+               for when in ("setup", "call"))
 
 # ========== SELENIUM FIXTURES ==========
 
-@pytest.fixture(scope="function")
-def selenium_driver(request):
-    """Create Selenium WebDriver instance for each test."""
+# Run-wide element cache counters: hits, misses (findElement calls), stale
+_element_cache_totals = {}
+
+def _selenium_browser(request) -> str:
+    """Resolve the Selenium browser from the command line or config."""
     # Get browser from command line option, default to config value
     browser = request.config.getoption("--selenium-browser", default=None)
     if browser is None:
         browser = config.SELENIUM_BROWSER  # This should be "firefox"
+    return browser
+
+@selenium_fixture(scope="session")
+def selenium_pool(request):
+    """Per-worker pool of warm drivers, or None when pooling is disabled."""
+    if not (request.config.getoption("--selenium-pool") or config.SELENIUM_POOL):
+        yield None
+        return
+    
+    from utils.driver_factory import DriverFactory
+    pool = DriverFactory.get_pool(browser=_selenium_browser(request))
+    prelaunched = request.config.stash.get(SELENIUM_PRELAUNCH_KEY, None)
+    if prelaunched is not None:
+        for driver in prelaunched.take_all():
+            pool.add(driver)
+        _close_prelaunched(request.config, ["selenium"])
+    yield pool
+    pool.close()
+
+@selenium_fixture(scope="function")
+def selenium_driver(request, selenium_pool):
+    """Create Selenium WebDriver instance for each test."""
+    from pages.selenium.base_page import ElementCache
+    from utils.driver_factory import DriverFactory
+    
+    if selenium_pool is None:
+        raw_driver = None
+        prelaunched = request.config.stash.get(SELENIUM_PRELAUNCH_KEY, None)
+        if prelaunched is not None:
+            # Only the first test gets a pre-launched driver
+            raw_driver = prelaunched.take()
+            if raw_driver is None:
+                warnings.warn(f"Selenium pre-launch failed or timed out, launching: {prelaunched.error}")
+            _close_prelaunched(request.config, ["selenium"])
+        if raw_driver is None:
+            raw_driver = DriverFactory.get_driver(browser=_selenium_browser(request))
+    else:
+        raw_driver = selenium_pool.acquire()
+    
+    # Buffer the last actions in memory; written out only if the test fails
+    recorder = None
+    driver = raw_driver
+    cache_before = dict(ElementCache.totals)
+    if _artifact_mode(request) != "off":
+        from selenium.webdriver.support.events import EventFiringWebDriver
+        from utils.artifacts import SeleniumFlightRecorder, should_keep
+        recorder = SeleniumFlightRecorder()
+        driver = EventFiringWebDriver(raw_driver, recorder)
     
-    driver = DriverFactory.get_driver(browser=browser)
     yield driver
-    driver.quit()
+    
+    cache_delta = {kind: ElementCache.totals[kind] - count for kind, count in cache_before.items()}
+    if any(cache_delta.values()):
+        request.node.user_properties.append(("element_cache", cache_delta))
+    
+    failed = _test_failed(request)
+    if recorder is not None and should_keep(_artifact_mode(request), failed):
+        recorder.dump(request.node.nodeid)
+    if selenium_pool is None:
+        raw_driver.quit()
+    else:
+        # Reuse a warm driver; one that saw a failure is recycled, not reset
+        selenium_pool.release(raw_driver, discard=failed)
 
-@pytest.fixture
+@selenium_fixture
 def selenium_login_page(selenium_driver):
     """Create Selenium LoginPage instance."""
-    return SeleniumLoginPage(selenium_driver)
+    from pages.selenium.login_page import LoginPage
+    return LoginPage(selenium_driver)
 
-@pytest.fixture
+@selenium_fixture
 def selenium_products_page(selenium_driver):
     """Create Selenium ProductsPage instance."""
-    return SeleniumProductsPage(selenium_driver)
+    from pages.selenium.products_page import ProductsPage
+    return ProductsPage(selenium_driver)
 
-@pytest.fixture
+@selenium_fixture
 def selenium_cart_page(selenium_driver):
     """Create Selenium CartPage instance."""
-    return SeleniumCartPage(selenium_driver)
+    from pages.selenium.cart_page import CartPage
+    return CartPage(selenium_driver)
 
-@pytest.fixture
-def selenium_authenticated(selenium_driver):
-    """Provide an authenticated Selenium session."""
-    login_page = SeleniumLoginPage(selenium_driver)
-    login_page.navigate()
-    login_page.login(config.VALID_USER, config.PASSWORD)
+@selenium_fixture
+def selenium_authenticated(request, selenium_driver, auth_cache):
+    """Provide an authenticated Selenium session.
+
+    With @pytest.mark.cart_with(*slugs) the cart already holds those
+    products and the browser is on /inventory.html.
+    """
+    user = _login_user(request)
+    from pages.selenium.login_page import LoginPage
+    login_page = LoginPage(selenium_driver)
+    if auth_cache is not None:
+        auth_cache.selenium_login(selenium_driver, user)
+    else:
+        login_page.navigate()
+        login_page.login(user, config.PASSWORD)
+    
+    products = _cart_products(request)
+    if products:
+        login_page.seed_cart(products)
     return selenium_driver
 
 # ========== PLAYWRIGHT FIXTURES ==========
 
-@pytest.fixture(scope="session")
-def playwright_browser():
+@playwright_fixture(scope="session")
+def playwright_browser(request):
     """Create Playwright browser instance for test session."""
+    from playwright.sync_api import Error, sync_playwright
+    
+    server = request.config.stash.get(PLAYWRIGHT_SERVER_KEY, None)
     with sync_playwright() as p:
-        browser = p.chromium.launch(headless=config.HEADLESS)
+        # Connect to the browser pre-launched during collection if it came up
+        browser = None
+        endpoint = server.endpoint() if server is not None else None
+        if endpoint:
+            try:
+                browser = p.chromium.connect(endpoint)
+            except Error as error:
+                warnings.warn(f"Pre-launched Playwright browser unusable, launching: {error}")
+        elif server is not None:
+            warnings.warn(f"Playwright pre-launch failed or timed out, launching: {server.error}")
+        if browser is None:
+            browser = p.chromium.launch(headless=config.HEADLESS)
         yield browser
         browser.close()
 
-@pytest.fixture(scope="function")
-def playwright_context(playwright_browser: Browser):
+@playwright_fixture(scope="function")
+def playwright_context(request, playwright_browser: "Browser", resource_policy):
     """Create new Playwright browser context for each test."""
+    # Authenticated tests start from the cached storage state of their user
+    storage_state = None
+    if {"playwright_authenticated", "engine_authenticated"} & set(request.fixturenames):
+        cache = request.getfixturevalue("auth_cache")
+        if cache is not None:
+            storage_state = cache.playwright_state(playwright_browser, _login_user(request))
+    
+    from utils.artifacts import PlaywrightArtifacts
+    mode = _artifact_mode(request)
     context = playwright_browser.new_context(
         viewport=config.VIEWPORT,
-        record_video_dir="videos/" if not config.HEADLESS else None
+        storage_state=storage_state,
+        **(PlaywrightArtifacts.context_options() if mode != "off" else {})
     )
+    artifacts = PlaywrightArtifacts(context, mode) if mode != "off" else None
+    stats = None
+    if resource_policy.enabled:
+        stats = BlockingStats()
+        route_context(context, resource_policy, stats)
     yield context
-    context.close()
+    if artifacts is not None:
+        # Trace and video are recorded for every test but kept only on failure
+        artifacts.close(request.node.nodeid, _test_failed(request))
+    else:
+        context.close()
+    if stats is not None and stats.total:
+        # Reported per test so xdist workers' counts reach the controller
+        request.node.user_properties.append(
+            ("blocked_resources", [dict(stats.by_type), dict(stats.by_url)])
+        )
 
-@pytest.fixture(scope="function")
-def playwright_page(playwright_context: BrowserContext):
+@playwright_fixture(scope="function")
+def playwright_page(playwright_context: "BrowserContext"):
     """Create new Playwright page for each test."""
     page = playwright_context.new_page()
     yield page
     page.close()
 
-@pytest.fixture
-def playwright_login_page(playwright_page: Page):
+@playwright_fixture
+def playwright_login_page(playwright_page: "Page"):
     """Create Playwright LoginPage instance."""
-    return PlaywrightLoginPage(playwright_page)
+    from pages.playwright.login_page import LoginPage
+    return LoginPage(playwright_page)
 
-@pytest.fixture
-def playwright_products_page(playwright_page: Page):
+@playwright_fixture
+def playwright_products_page(playwright_page: "Page"):
     """Create Playwright ProductsPage instance."""
-    return PlaywrightProductsPage(playwright_page)
+    from pages.playwright.products_page import ProductsPage
+    return ProductsPage(playwright_page)
 
-@pytest.fixture
-def playwright_cart_page(playwright_page: Page):
+@playwright_fixture
+def playwright_cart_page(playwright_page: "Page"):
     """Create Playwright CartPage instance."""
-    return PlaywrightCartPage(playwright_page)
+    from pages.playwright.cart_page import CartPage
+    return CartPage(playwright_page)
 
-@pytest.fixture
-def playwright_authenticated(playwright_page: Page):
-    """Provide an authenticated Playwright session."""
-    login_page = PlaywrightLoginPage(playwright_page)
-    login_page.navigate()
-    login_page.login(config.VALID_USER, config.PASSWORD)
+@playwright_fixture
+def playwright_authenticated(request, playwright_page: "Page", auth_cache):
+    """Provide an authenticated Playwright session.
+
+    With @pytest.mark.cart_with(*slugs) the cart already holds those
+    products and the page is on /inventory.html.
+    """
+    from pages.playwright.login_page import LoginPage
+    user = _login_user(request)
+    login_page = LoginPage(playwright_page)
+    if auth_cache is not None:
+        # The context already carries the session; fall back to the UI
+        # only if the storefront rejects it
+        login_page.navigate_to("/inventory.html")
+        if "inventory.html" not in playwright_page.url:
+            auth_cache.invalidate(user)
+            auth_cache = None
+    if auth_cache is None:
+        login_page.navigate()
+        login_page.login(user, config.PASSWORD)
+    
+    products = _cart_products(request)
+    if products:
+        login_page.seed_cart(products)
     return playwright_page
 
+# ========== ENGINE-AGNOSTIC FIXTURES ==========
+
+@pytest.fixture(params=[pytest.param("selenium", marks=pytest.mark.selenium),
+                        pytest.param("playwright", marks=pytest.mark.playwright)])
+def engine(request) -> str:
+    """Run the test once per engine."""
+    return request.param
+
+@pytest.fixture
+def engine_driver(request, engine) -> "Driver":
+    """Driver adapter over this test's browser, for the pages/common page objects."""
+    if engine == "selenium":
+        from pages.common.selenium_driver import SeleniumDriver
+        return SeleniumDriver(request.getfixturevalue("selenium_driver"))
+    from pages.common.playwright_driver import PlaywrightDriver
+    return PlaywrightDriver(request.getfixturevalue("playwright_page"))
+
+@pytest.fixture
+def engine_authenticated(request, engine, engine_driver) -> "Driver":
+    """engine_driver after selenium_/playwright_authenticated (login_as and cart_with apply)."""
+    request.getfixturevalue(f"{engine}_authenticated")
+    return engine_driver
+
+# ========== BENCHMARKS ==========
+
+BENCHMARK_RESULTS_KEY = pytest.StashKey[dict]()
+BENCHMARK_REGRESSIONS_KEY = pytest.StashKey[list]()
+
+@pytest.fixture(scope="session")
+def benchmark_results(request):
+    """Benchmark statistics collected across the session, keyed by metric."""
+    return request.config.stash.setdefault(BENCHMARK_RESULTS_KEY, {})
+
+@pytest.fixture
+def benchmark(request, benchmark_results):
+    """Benchmark harness configured from the command line."""
+    bench = Benchmark(
+        rounds=request.config.getoption("--benchmark-rounds"),
+        warmup=request.config.getoption("--benchmark-warmup"),
+    )
+    yield bench
+    benchmark_results.update(bench.results)
+
+def pytest_sessionfinish(session, exitstatus):
+    """Flush screenshots, stop servers, store durations, impact map, outcomes and timings, write benchmarks."""
+    sink = session.config.stash.get(SCREENSHOT_SINK_KEY, None)
+    if sink is not None:
+        session.config.stash[SCREENSHOT_ERRORS_KEY] = sink.close()
+    _close_prelaunched(session.config)
+    _stop_local_storefront(session.config)
+    
+    # Durations and coverage reach the controller (or the only process);
+    # workers skip saving
+    if not os.getenv("PYTEST_XDIST_WORKER"):
+        if _test_durations:
+            from utils.lpt_scheduler import DurationStore
+            DurationStore(getattr(session.config, "cache", None)).update(
+                _test_durations, _test_groups, _group_setups
+            )
+        if _impact_map:
+            save_map(_impact_map)
+        if _flake_attempts.results and _flake_tracking(session.config):
+            from utils.flake_tracker import FlakeStore
+            FlakeStore().record(_flake_attempts.results)
+        if _phase_timings.rows and _timing_history(session.config):
+            from utils.timing_history import TimingStore
+            store = TimingStore()
+            store.record(_phase_timings.rows)
+            session.config.stash[TIMING_SLOWDOWNS_KEY] = store.slowdowns(
+                {nodeid for nodeid, *_ in _phase_timings.rows}
+            )
+    
+    results = session.config.stash.get(BENCHMARK_RESULTS_KEY, None)
+    if not results:
+        return
+    
+    path = session.config.getoption("--benchmark-json")
+    worker = os.getenv("PYTEST_XDIST_WORKER")
+    if worker:
+        root, ext = os.path.splitext(path)
+        path = f"{root}-{worker}{ext}"
+    document = write_results(results, path)
+    
+    baseline_path = session.config.getoption("--benchmark-baseline")
+    if baseline_path:
+        with open(baseline_path) as handle:
+            baseline = json.load(handle)
+        regressions = compare(document, baseline,
+                              session.config.getoption("--benchmark-threshold"))
+        session.config.stash[BENCHMARK_REGRESSIONS_KEY] = regressions
+        if regressions:
+            session.exitstatus = pytest.ExitCode.TESTS_FAILED
+
+def pytest_terminal_summary(terminalreporter):
+    """Print benchmarks, traced actions, profiles, reruns, slowdowns, screenshot errors and blocking counters."""
+    stash = terminalreporter.config.stash
+    results = stash.get(BENCHMARK_RESULTS_KEY, None)
+    if results:
+        terminalreporter.section("benchmark")
+        for line in format_table(results):
+            terminalreporter.write_line(line)
+        for regression in stash.get(BENCHMARK_REGRESSIONS_KEY, []):
+            terminalreporter.write_line(f"REGRESSION {regression}", red=True)
+    
+    if _action_summary:
+        terminalreporter.section("slowest page-object actions")
+        for line in format_slowest(_action_summary):
+            terminalreporter.write_line(line)
+        terminalreporter.write_line(f"Per-test traces: {config.TRACES_DIR}/")
+    
+    if _import_profiler.installed:
+        terminalreporter.section("startup profile")
+        for line in format_profile(_conftest_seconds, _collect_times, _import_profiler.imports):
+            terminalreporter.write_line(line)
+    
+    flaky_lines = _format_flaky(terminalreporter.config)
+    if flaky_lines:
+        terminalreporter.section("flaky tests")
+        for line in flaky_lines:
+            terminalreporter.write_line(line)
+    
+    slowdowns = stash.get(TIMING_SLOWDOWNS_KEY, None)
+    if slowdowns:
+        terminalreporter.section("slower tests")
+        for trend in slowdowns:
+            terminalreporter.write_line(f"SLOWER {trend.describe()}", yellow=True)
+        terminalreporter.write_line("Trends: python -m utils.timing_history report")
+    
+    impact_reason = stash.get(IMPACT_REASON_KEY, None)
+    if impact_reason:
+        terminalreporter.section("impact analysis")
+        terminalreporter.write_line(impact_reason)
+    
+    scheduler = stash.get(LPT_SCHEDULER_KEY, None)
+    if scheduler is not None or len(_worker_busy) > 1:
+        from utils.lpt_scheduler import format_makespan
+        terminalreporter.section("xdist makespan")
+        for line in format_makespan(scheduler.plan if scheduler else None, _worker_busy):
+            terminalreporter.write_line(line)
+    
+    if _element_cache_totals:
+        hits = _element_cache_totals.get("hits", 0)
+        misses = _element_cache_totals.get("misses", 0)
+        stale = _element_cache_totals.get("stale", 0)
+        terminalreporter.section("selenium element cache")
+        terminalreporter.write_line(
+            f"hits {hits}, misses {misses}, stale {stale}: "
+            f"{hits / max(hits + misses, 1):.0%} of element lookups skipped findElement"
+        )
+    
+    for error in stash.get(SCREENSHOT_ERRORS_KEY, []):
+        terminalreporter.write_line(f"Screenshot not saved: {error!r}", yellow=True)
+    
+    policy = BlockingPolicy.from_config(terminalreporter.config.getoption("--block-resources"))
+    if policy.enabled:
+        if _blocked_resources.total and terminalreporter.config.getoption("--estimate-blocked-bytes"):
+            # Network lookups to the blocked hosts: once, after every test has run
+            _blocked_resources.estimate_bytes_saved()
+        terminalreporter.section("resource blocking")
+        for line in format_stats(policy, _blocked_resources):
+            terminalreporter.write_line(line)
+
+# ========== ACTION TRACING ==========
+
+# Run-wide aggregate of traced actions: (action, locator) -> [calls, total, max, wait]
+_action_summary = {}
+
+@pytest.fixture(autouse=True)
+def action_trace(request):
+    """Trace page-object actions of each test when --trace-actions is set."""
+    if not (request.config.getoption("--trace-actions") or config.TRACE_ACTIONS):
+        yield
+        return
+    
+    tracer.start()
+    yield
+    events = tracer.stop()
+    if events:
+        write_trace(events, request.node.nodeid, config.TRACES_DIR)
+        # Ship the per-test aggregate with the report so xdist workers'
+        # traces reach the controller's summary
+        request.node.user_properties.append(
+            ("action_trace", summary_rows(summarize(events)))
+        )
+
+def pytest_runtest_logreport(report):
+    """Fold durations, traced action summaries and counters into run-wide totals."""
+    _record_timing(report)
+    _flake_attempts.observe(report)
+    _phase_timings.observe(report)
+    if report.when != "teardown":
+        return
+    for name, value in report.user_properties:
+        if name == "action_trace":
+            merge_summary(_action_summary, value)
+        elif name == "blocked_resources":
+            _blocked_resources.merge(*value)
+        elif name == "impact":
+            _impact_map[report.nodeid] = value
+        elif name == "element_cache":
+            for kind, count in value.items():
+                _element_cache_totals[kind] = _element_cache_totals.get(kind, 0) + count
+
+# ========== TEST SCHEDULING ==========
+
+LPT_SCHEDULER_KEY = pytest.StashKey["LPTScheduling"]()
+
+# Per-run measurements: nodeid -> seconds, nodeid -> group,
+# group -> setup seconds, worker id -> busy seconds
+_test_durations = {}
+_test_groups = {}
+_group_setups = {}
+_worker_busy = {}
+
+@pytest.hookimpl(optionalhook=True)
+def pytest_xdist_make_scheduler(config, log):
+    """Distribute tests longest-processing-time first with --lpt-schedule."""
+    # `config` is the pytest config here, as the hook spec requires
+    if not config.getoption("--lpt-schedule"):
+        return None
+    from utils.lpt_scheduler import LPTScheduling
+    scheduler = LPTScheduling(config, log)
+    config.stash[LPT_SCHEDULER_KEY] = scheduler
+    return scheduler
+
+@pytest.hookimpl(hookwrapper=True)
+def pytest_runtest_setup(item):
+    """Tag the test's fixture group, start impact recording and time the fixtures it sets up."""
+    # Imported here: the scheduler module pulls in xdist's scheduling code
+    from utils.lpt_scheduler import group_for_item
+    item.user_properties.append(("lpt_group", group_for_item(item)))
+    if _import_profiler.installed:
+        _import_profiler.context = item.nodeid
+    if item.config.getoption("--impact-record"):
+        _impact_recorder.start()
+    timing = _timing_history(item.config)
+    if timing:
+        _fixture_seconds.clear()
+        item.user_properties.append(("timing_browser", _timing_browser(item)))
+    yield
+    if timing and _fixture_seconds:
+        # Sub-millisecond fixtures are left out to keep the store compact
+        item.user_properties.append(("fixture_timings", {
+            name: round(seconds, 4) for name, seconds in _fixture_seconds.items() if seconds >= 0.001
+        }))
+
+def _record_timing(report):
+    """Accumulate one phase report into the per-run measurements."""
+    _test_durations[report.nodeid] = _test_durations.get(report.nodeid, 0.0) + report.duration
+    gateway = getattr(getattr(report, "node", None), "gateway", None)
+    worker = gateway.id if gateway is not None else "main"
+    _worker_busy[worker] = _worker_busy.get(worker, 0.0) + report.duration
+    if report.when == "setup":
+        group = dict(report.user_properties).get("lpt_group")
+        if group:
+            _test_groups[report.nodeid] = group
+            _group_setups.setdefault(group, []).append(report.duration)
+
+# ========== IMPACT ANALYSIS ==========
+
+IMPACT_REASON_KEY = pytest.StashKey[str]()
+
+_impact_recorder = CoverageRecorder()
+# nodeid -> page-object symbols exercised, gathered on the controller
+_impact_map = {}
+
+@pytest.hookimpl(hookwrapper=True)
+def pytest_runtest_teardown(item):
+    """Stop impact recording once fixtures are torn down and attach the symbols."""
+    yield
+    if item.config.getoption("--impact-record"):
+        item.user_properties.append(("impact", _impact_recorder.stop()))
+
+def pytest_collection_modifyitems(config, items):
+    """Skip missing engines, quarantine flaky tests; with --impact-since, deselect unaffected tests."""
+    # `config` is the pytest config here, as the hook spec requires
+    _skip_missing_engines(items)
+    _quarantine_flaky(config, items)
+    ref = config.getoption("--impact-since")
+    if not ref:
+        return
+    selected, reason = select([item.nodeid for item in items], ChangeSet.from_git(ref),
+                              load_map())
+    if selected is None:
+        config.stash[IMPACT_REASON_KEY] = f"running the full suite: {reason}"
+        return
+    config.stash[IMPACT_REASON_KEY] = f"{len(selected)}/{len(items)} tests affected ({reason})"
+    deselected = [item for item in items if item.nodeid not in selected]
+    if deselected:
+        config.hook.pytest_deselected(items=deselected)
+        items[:] = [item for item in items if item.nodeid in selected]
+
+# ========== FLAKE TRACKING ==========
+
+RERUN_BUDGET_KEY = pytest.StashKey["RerunBudget"]()
+QUARANTINED_KEY = pytest.StashKey[dict]()
+
+# Attempts seen by this process: (nodeid, attempt, outcome, seconds); only
+# the controller (or the only process) stores them
+_flake_attempts: "AttemptRecorder" = None
+
+def _flake_tracking(pytest_config) -> bool:
+    return config.FLAKE_TRACKING and not pytest_config.getoption("--no-flake-tracking")
+
+def _quarantine_flaky(pytest_config, items):
+    """Mark tests whose recorded flake rate is over the threshold as non-strict xfail."""
+    if not _flake_tracking(pytest_config) or pytest_config.getoption("--no-quarantine"):
+        return
+    from utils.flake_tracker import QUARANTINE_REASON, FlakeStore
+    quarantined = FlakeStore().quarantined()
+    pytest_config.stash[QUARANTINED_KEY] = {}
+    for item in items:
+        entry = quarantined.get(item.nodeid)
+        # Tests already marked xfail keep their own reason
+        if entry is None or item.get_closest_marker("xfail"):
+            continue
+        item.add_marker(pytest.mark.xfail(
+            reason=f"{QUARANTINE_REASON} flaky in {entry.flaky} of the last {entry.runs} runs",
+            strict=False,
+        ))
+        pytest_config.stash[QUARANTINED_KEY][item.nodeid] = entry
+
+def _attempt_failed(reports, quarantined: bool) -> bool:
+    """Whether an attempt should be retried: it failed (or a quarantined test xfailed)."""
+    return any(report.failed or (quarantined and report.skipped and hasattr(report, "wasxfail"))
+               for report in reports)
+
+@pytest.hookimpl(tryfirst=True)
+def pytest_runtest_protocol(item, nextitem):
+    """Rerun a failed test right away, within the rerun budget."""
+    budget = item.config.stash.get(RERUN_BUDGET_KEY, None)
+    if budget is None or not budget.enabled:
+        return None
+    from _pytest.runner import call_and_report, show_test_item
+    
+    item.ihook.pytest_runtest_logstart(nodeid=item.nodeid, location=item.location)
+    quarantined = item.nodeid in item.config.stash.get(QUARANTINED_KEY, {})
+    properties = list(item.user_properties)
+    attempt = 0
+    while True:
+        # runtestprotocol(), but deciding on a rerun before the teardown
+        if hasattr(item, "_request") and not item._request:
+            item._initrequest()
+        reports = [call_and_report(item, "setup", log=False)]
+        if reports[0].passed:
+            if item.config.getoption("setupshow", False):
+                show_test_item(item)
+            if not item.config.getoption("setuponly", False):
+                reports.append(call_and_report(item, "call", log=False))
+        rerun = _attempt_failed(reports, quarantined) and budget.allow(attempt)
+        # Before a rerun only the test's own fixtures are torn down; class,
+        # module and session fixtures stay up for the next attempt
+        reports.append(call_and_report(item, "teardown", log=False,
+                                       nextitem=item.parent if rerun else nextitem))
+        if hasattr(item, "_request"):
+            item._request = False
+            item.funcargs = None
+        for report in reports:
+            report.rerun = attempt
+            if rerun and (report.failed or report.skipped and hasattr(report, "wasxfail")):
+                report.outcome = "rerun"
+            item.ihook.pytest_runtest_logreport(report=report)
+        if not rerun:
+            break
+        budget.spend()
+        attempt += 1
+        item.user_properties[:] = properties
+        for when in ("setup", "call", "teardown"):
+            item.__dict__.pop(f"rep_{when}", None)
+    item.ihook.pytest_runtest_logfinish(nodeid=item.nodeid, location=item.location)
+    return True
+
+@pytest.hookimpl(tryfirst=True)
+def pytest_report_teststatus(report):
+    """Show attempts that are retried as RERUN rather than failures."""
+    if report.outcome == "rerun":
+        return "rerun", "R", ("RERUN", {"yellow": True})
+
+def _format_flaky(pytest_config):
+    """Summary lines for reruns and quarantined tests of this session."""
+    lines = []
+    reruns = sum(1 for result in _flake_attempts.results if result[1] > 0)
+    if reruns:
+        flaky = _flake_attempts.flaky()
+        lines.append(f"reruns: {reruns}, passed on a rerun: {len(flaky)}")
+        lines.extend(f"  {nodeid}" for nodeid in flaky)
+    quarantined = pytest_config.stash.get(QUARANTINED_KEY, {})
+    if quarantined:
+        lines.append(f"quarantined as xfail: {len(quarantined)}")
+        lines.extend(f"  {entry.flake_rate:.0%} flaky  {nodeid}" for nodeid, entry in quarantined.items())
+    if lines:
+        lines.append("Flake rates: python -m utils.flake_tracker")
+    return lines
+
+# ========== TIMING HISTORY ==========
+
+TIMING_SLOWDOWNS_KEY = pytest.StashKey[list]()
+
+# Phase timings seen by this process; only the controller (or the only
+# process) stores them
+_phase_timings: "PhaseRecorder" = None
+# Fixture name -> setup seconds, for the test being set up
+_fixture_seconds = {}
+
+def _timing_history(pytest_config) -> bool:
+    return config.TIMING_HISTORY and not pytest_config.getoption("--no-timing-history")
+
+def _timing_browser(item) -> str:
+    """Browser(s) a test drives, from its engine parameter, markers or fixtures."""
+    callspec = getattr(item, "callspec", None)
+    engine = callspec.params.get("engine") if callspec is not None else None
+    engines = [engine] if engine else [
+        name for name in ("selenium", "playwright")
+        if item.get_closest_marker(name)
+        or any(fixture.startswith(f"{name}_") for fixture in item.fixturenames)
+    ]
+    browsers = {
+        "selenium": item.config.getoption("--selenium-browser", default=None) or config.SELENIUM_BROWSER,
+        "playwright": config.PLAYWRIGHT_BROWSER,
+    }
+    return "+".join(browsers[name] for name in engines) or "none"
+
+@pytest.hookimpl(hookwrapper=True)
+def pytest_fixture_setup(fixturedef, request):
+    """Time each fixture setup; cached fixtures are not set up again, so not charged again."""
+    started = time.perf_counter()
+    yield
+    _fixture_seconds[fixturedef.argname] = (
+        _fixture_seconds.get(fixturedef.argname, 0.0) + time.perf_counter() - started
+    )
+
+# ========== STARTUP PROFILE ==========
+
+# Test module path -> seconds spent importing and collecting it
+_collect_times = {}
+
+def pytest_configure(config):
+    """Set up flake and timing tracking; profile imports for --startup-profile given outside argv."""
+    # `config` is the pytest config here, as the hook spec requires
+    global _flake_attempts, _phase_timings
+    from utils.flake_tracker import AttemptRecorder, RerunBudget
+    from utils.timing_history import PhaseRecorder
+    _flake_attempts = AttemptRecorder()
+    _phase_timings = PhaseRecorder()
+    config.stash[RERUN_BUDGET_KEY] = RerunBudget(config.getoption("--reruns"),
+                                                 config.getoption("--rerun-budget"))
+    
+    if config.getoption("--startup-profile"):
+        _import_profiler.install()
+    else:
+        _import_profiler.uninstall()
+
+@pytest.hookimpl(hookwrapper=True)
+def pytest_make_collect_report(collector):
+    """Time the import and collection of each test module."""
+    if not (_import_profiler.installed and isinstance(collector, pytest.Module)):
+        yield
+        return
+    _import_profiler.context = f"collecting {collector.nodeid}"
+    started = time.perf_counter()
+    yield
+    _collect_times[collector.nodeid] = time.perf_counter() - started
+
 # ========== SCREENSHOT ON FAILURE ==========
 
+SCREENSHOT_SINK_KEY = pytest.StashKey[ScreenshotSink]()
+SCREENSHOT_ERRORS_KEY = pytest.StashKey[list]()
+
+def _screenshot_sink(pytest_config) -> ScreenshotSink:
+    """Session-wide screenshot sink, created on the first failure."""
+    if SCREENSHOT_SINK_KEY not in pytest_config.stash:
+        pytest_config.stash[SCREENSHOT_SINK_KEY] = ScreenshotSink()
+    return pytest_config.stash[SCREENSHOT_SINK_KEY]
+
 @pytest.hookimpl(tryfirst=True, hookwrapper=True)
 def pytest_runtest_makereport(item, call):
     """Take screenshot on test failure."""
     outcome = yield
     report = outcome.get_result()
     
+    # Expose phase reports (item.rep_setup / rep_call / rep_teardown) to fixtures
+    setattr(item, f"rep_{report.when}", report)
+    
     if report.when == "call" and report.failed:
+        # Only the capture happens here; encoding and writing are queued
+        sink = _screenshot_sink(item.config)
+        
         # Check if test uses Selenium
         if "selenium_driver" in item.funcargs:
             driver = item.funcargs["selenium_driver"]
-            take_screenshot(driver, item.name, "selenium")
+            sink.capture(driver, item.name, "selenium")
         
         # Check if test uses Playwright
         if "playwright_page" in item.funcargs:
             page = item.funcargs["playwright_page"]
-            take_screenshot(page, item.name, "playwright")
+            sink.capture(page, item.name, "playwright")
 
 # ========== COMMAND LINE OPTIONS ==========
 
@@ -131,3 +930,153 @@ def pytest_addoption(parser):
         default="chrome",
         help="Browser to use for Selenium tests: chrome, firefox, edge"
     )
+    parser.addoption(
+        "--local-server",
+        action="store_true",
+        default=False,
+        help="Run against the bundled local storefront instead of BASE_URL"
+    )
+    parser.addoption(
+        "--selenium-pool",
+        action="store_true",
+        default=False,
+        help="Reuse warm Selenium drivers across tests with per-test state reset"
+    )
+    parser.addoption(
+        "--no-auth-cache",
+        action="store_true",
+        default=False,
+        help="Log in through the UI for every authenticated test"
+    )
+    parser.addoption(
+        "--benchmark-rounds",
+        action="store",
+        type=int,
+        default=config.BENCHMARK_ROUNDS,
+        help="Recorded iterations per benchmark metric"
+    )
+    parser.addoption(
+        "--benchmark-warmup",
+        action="store",
+        type=int,
+        default=config.BENCHMARK_WARMUP,
+        help="Unrecorded warmup iterations per benchmark metric"
+    )
+    parser.addoption(
+        "--benchmark-json",
+        action="store",
+        default=config.BENCHMARK_JSON,
+        help="Where to write benchmark results"
+    )
+    parser.addoption(
+        "--benchmark-baseline",
+        action="store",
+        default=None,
+        help="Benchmark JSON to compare against; regressions fail the run"
+    )
+    parser.addoption(
+        "--benchmark-threshold",
+        action="store",
+        type=float,
+        default=config.BENCHMARK_THRESHOLD,
+        help="Allowed relative slowdown against the baseline (0.2 = 20%%)"
+    )
+    parser.addoption(
+        "--trace-actions",
+        action="store_true",
+        default=False,
+        help="Write a Chrome trace of page-object actions per test and summarize the slowest"
+    )
+    parser.addoption(
+        "--block-resources",
+        action="store",
+        default=None,
+        choices=["none", "media", "third-party", "lean"],
+        help="Block heavy or third-party requests: none, media, third-party, lean"
+    )
+    parser.addoption(
+        "--estimate-blocked-bytes",
+        action="store_true",
+        default=False,
+        help="At session end, HEAD each blocked URL to estimate the transfer saved"
+    )
+    parser.addoption(
+        "--launch-profile",
+        action="store",
+        default=None,
+        choices=["default", "fastest-headless", "ci-stable", "debug"],
+        help="Selenium launch profile: default, fastest-headless, ci-stable, debug"
+    )
+    parser.addoption(
+        "--artifacts",
+        action="store",
+        default=None,
+        choices=["off", "retain-on-failure", "on"],
+        help="Playwright trace/video and Selenium action frames: off, retain-on-failure, on"
+    )
+    parser.addoption(
+        "--lpt-schedule",
+        action="store_true",
+        default=False,
+        help="With -n, assign tests to xdist workers longest-first using stored durations"
+    )
+    parser.addoption(
+        "--impact-record",
+        action="store_true",
+        default=False,
+        help="Record which page-object functions each test calls into IMPACT_MAP"
+    )
+    parser.addoption(
+        "--impact-since",
+        action="store",
+        default=None,
+        metavar="GIT_REF",
+        help="Run only tests affected by changes since GIT_REF (full suite for utils/conftest changes)"
+    )
+    parser.addoption(
+        "--startup-profile",
+        action="store_true",
+        default=False,
+        help="Report conftest import, per-module collection and first-time import times"
+    )
+    parser.addoption(
+        "--prelaunch",
+        action="store",
+        default=None,
+        metavar="ENGINES",
+        help="Launch browsers while tests are collected: selenium, playwright or both, comma-separated"
+    )
+    parser.addoption(
+        "--reruns",
+        action="store",
+        type=int,
+        default=config.FLAKE_RERUNS,
+        help="Rerun a failed test up to this many times with fresh fixtures (0 disables)"
+    )
+    parser.addoption(
+        "--rerun-budget",
+        action="store",
+        type=int,
+        default=config.FLAKE_RERUN_BUDGET,
+        help="Maximum reruns per process (per xdist worker)"
+    )
+    parser.addoption(
+        "--no-flake-tracking",
+        action="store_true",
+        default=False,
+        help="Do not record outcomes in FLAKE_DB or quarantine flaky tests"
+    )
+    parser.addoption(
+        "--no-timing-history",
+        action="store_true",
+        default=False,
+        help="Do not record per-phase timings in TIMING_DB"
+    )
+    parser.addoption(
+        "--no-quarantine",
+        action="store_true",
+        default=False,
+        help="Run quarantined flaky tests as normal tests"
+    )
+
+_conftest_seconds = time.perf_counter() - _conftest_started
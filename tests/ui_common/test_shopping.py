@@ -0,0 +1,56 @@
+"""Shopping flow tests written once against the engine-agnostic page objects.
+
+Every test runs on Selenium and on Playwright through the `engine` fixture.
+"""
+import pytest
+from pages.common.cart_page import CartPage
+from pages.common.login_page import LoginPage
+from pages.common.products_page import ProductsPage
+from utils.config import config
+
+@pytest.mark.ui
+@pytest.mark.regression
+class TestShopping:
+    """Login, cart and checkout on both engines with one set of page objects."""
+    
+    def test_successful_login(self, engine_driver):
+        """Test successful login with valid credentials."""
+        login_page = LoginPage(engine_driver)
+        login_page.navigate()
+        login_page.login(config.VALID_USER, config.PASSWORD)
+        
+        assert ProductsPage(engine_driver).is_loaded(), \
+            "Products page should be displayed after login"
+        
+    def test_locked_out_user(self, engine_driver):
+        """Test that a locked out user sees an error."""
+        login_page = LoginPage(engine_driver)
+        login_page.navigate()
+        login_page.login(config.LOCKED_USER, config.PASSWORD)
+        
+        assert login_page.is_error_displayed(), "Error message should be displayed"
+        assert "locked out" in login_page.get_error_message()
+        
+    def test_add_and_remove_items(self, engine_authenticated):
+        """Test that the badge and buttons follow adds and removes."""
+        products_page = ProductsPage(engine_authenticated)
+        products_page.add_item_to_cart("sauce-labs-backpack")
+        products_page.add_item_to_cart("sauce-labs-bike-light")
+        products_page.remove_item_from_cart("sauce-labs-backpack")
+        
+        inventory = products_page.snapshot()
+        assert inventory.cart_count == 1, "Cart should show 1 item"
+        assert inventory.in_cart == ["sauce-labs-bike-light"]
+        
+    @pytest.mark.cart_with("sauce-labs-backpack", "sauce-labs-onesie")
+    def test_checkout_from_cart(self, engine_authenticated):
+        """Test removing a cart row and starting checkout."""
+        ProductsPage(engine_authenticated).go_to_cart()
+        cart_page = CartPage(engine_authenticated)
+        assert cart_page.get_cart_item_count() == 2, "Cart should display 2 items"
+        
+        cart_page.remove_item("sauce-labs-onesie")
+        assert cart_page.snapshot().slugs == ["sauce-labs-backpack"]
+        
+        cart_page.proceed_to_checkout()
+        assert "checkout-step-one.html" in engine_authenticated.url
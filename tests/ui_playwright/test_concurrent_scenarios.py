@@ -0,0 +1,52 @@
+"""Concurrent Playwright scenarios on the async page objects."""
+import pytest
+from utils.config import config
+
+
+async def login_and_fill_cart(page):
+    """Log in, add two items and check them on the cart page."""
+    from pages.playwright_async.cart_page import CartPage
+    from pages.playwright_async.login_page import LoginPage
+    from pages.playwright_async.products_page import ProductsPage
+    
+    login_page = LoginPage(page)
+    await login_page.navigate()
+    await login_page.login(config.VALID_USER, config.PASSWORD)
+    
+    products_page = ProductsPage(page)
+    assert await products_page.is_loaded(), "Products page should be displayed"
+    await products_page.add_item_to_cart("sauce-labs-backpack")
+    await products_page.add_item_to_cart("sauce-labs-bike-light")
+    assert await products_page.get_cart_count() == 2
+    
+    await products_page.go_to_cart()
+    assert await CartPage(page).get_cart_item_count() == 2
+
+
+async def locked_out_login(page):
+    """Locked out user sees an error instead of the inventory."""
+    from pages.playwright_async.login_page import LoginPage
+    
+    login_page = LoginPage(page)
+    await login_page.navigate()
+    await login_page.login(config.LOCKED_USER, config.PASSWORD)
+    assert await login_page.is_error_displayed()
+
+
+@pytest.mark.playwright
+@pytest.mark.ui
+@pytest.mark.regression
+class TestPlaywrightConcurrentScenarios:
+    """Run many isolated shopper scenarios in one browser."""
+    
+    def test_concurrent_scenarios_are_isolated(self):
+        """Contexts run side by side without sharing cart state."""
+        from utils.scenario_runner import ScenarioRunner
+        
+        scenarios = [login_and_fill_cart] * 6 + [locked_out_login] * 2
+        
+        results = ScenarioRunner(concurrency=4).run_sync(scenarios)
+        
+        failures = [result for result in results if not result.passed]
+        assert len(results) == 8
+        assert not failures, "\n".join(result.error for result in failures)
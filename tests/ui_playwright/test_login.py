@@ -1,8 +1,12 @@
 """Playwright login functionality tests."""
+from typing import TYPE_CHECKING
 import pytest
-from pages.playwright.login_page import LoginPage
-from pages.playwright.products_page import ProductsPage
 from utils.config import config
+from utils.helpers import parametrize_data
+
+if TYPE_CHECKING:
+    from pages.playwright.login_page import LoginPage
+    from pages.playwright.products_page import ProductsPage
 
 @pytest.mark.smoke
 @pytest.mark.playwright
@@ -10,8 +14,8 @@ from utils.config import config
 class TestPlaywrightLogin:
     """Test suite for login functionality using Playwright."""
     
-    def test_successful_login(self, playwright_login_page: LoginPage, 
-                             playwright_products_page: ProductsPage):
+    def test_successful_login(self, playwright_login_page: "LoginPage", 
+                             playwright_products_page: "ProductsPage"):
         """Test successful login with valid credentials."""
         playwright_login_page.navigate()
         playwright_login_page.login(config.VALID_USER, config.PASSWORD)
@@ -19,7 +23,14 @@ class TestPlaywrightLogin:
         assert playwright_products_page.is_loaded(), \
             "Products page should be displayed after login"
         
-    def test_invalid_username(self, playwright_login_page: LoginPage):
+    def test_no_error_before_submit(self, playwright_login_page: "LoginPage"):
+        """Test that a freshly loaded login form shows no error."""
+        playwright_login_page.navigate()
+        
+        assert playwright_login_page.is_absent(playwright_login_page.ERROR_MESSAGE), \
+            "Error message should not be displayed"
+        
+    def test_invalid_username(self, playwright_login_page: "LoginPage"):
         """Test login with invalid username."""
         playwright_login_page.navigate()
         playwright_login_page.login("invalid_user", config.PASSWORD)
@@ -29,7 +40,7 @@ class TestPlaywrightLogin:
         error_text = playwright_login_page.get_error_message()
         assert "Epic sadface" in error_text
         
-    def test_invalid_password(self, playwright_login_page: LoginPage):
+    def test_invalid_password(self, playwright_login_page: "LoginPage"):
         """Test login with invalid password."""
         playwright_login_page.navigate()
         playwright_login_page.login(config.VALID_USER, "wrong_password")
@@ -37,7 +48,7 @@ class TestPlaywrightLogin:
         assert playwright_login_page.is_error_displayed(), \
             "Error message should be displayed"
         
-    def test_empty_credentials(self, playwright_login_page: LoginPage):
+    def test_empty_credentials(self, playwright_login_page: "LoginPage"):
         """Test login with empty credentials."""
         playwright_login_page.navigate()
         playwright_login_page.login("", "")
@@ -47,7 +58,7 @@ class TestPlaywrightLogin:
         error_text = playwright_login_page.get_error_message()
         assert "Username is required" in error_text
         
-    def test_locked_out_user(self, playwright_login_page: LoginPage):
+    def test_locked_out_user(self, playwright_login_page: "LoginPage"):
         """Test login with locked out user."""
         playwright_login_page.navigate()
         playwright_login_page.login(config.LOCKED_USER, config.PASSWORD)
@@ -56,3 +67,18 @@ class TestPlaywrightLogin:
             "Error message should be displayed"
         error_text = playwright_login_page.get_error_message()
         assert "locked out" in error_text.lower()
+        
+    @parametrize_data("username,password,error", "login_cases.csv", id_field="case")
+    def test_login_cases(self, playwright_login_page: "LoginPage",
+                         playwright_products_page: "ProductsPage", username, password, error):
+        """Test each credential combination in tests/data/login_cases.csv."""
+        playwright_login_page.navigate()
+        playwright_login_page.login(username, password)
+        
+        if not error:
+            assert playwright_products_page.is_loaded(), \
+                "Products page should be displayed after login"
+            return
+        assert playwright_login_page.is_error_displayed(), \
+            "Error message should be displayed"
+        assert error in playwright_login_page.get_error_message()
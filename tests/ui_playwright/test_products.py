@@ -1,6 +1,10 @@
 """Playwright products page tests."""
+from typing import TYPE_CHECKING
 import pytest
-from pages.playwright.products_page import ProductsPage
+
+if TYPE_CHECKING:
+    from pages.playwright.products_page import ProductsPage
+    from pages.playwright.cart_page import CartPage
 
 @pytest.mark.playwright
 @pytest.mark.ui
@@ -9,7 +13,7 @@ class TestPlaywrightProducts:
     """Test suite for products functionality using Playwright."""
     
     def test_products_displayed(self, playwright_authenticated, 
-                               playwright_products_page: ProductsPage):
+                               playwright_products_page: "ProductsPage"):
         """Test that products are displayed after login."""
         playwright_products_page.navigate_to("/inventory.html")
         
@@ -18,7 +22,7 @@ class TestPlaywrightProducts:
         assert product_count == 6, "Should display 6 products"
         
     def test_add_single_item_to_cart(self, playwright_authenticated,
-                                    playwright_products_page: ProductsPage):
+                                    playwright_products_page: "ProductsPage"):
         """Test adding a single item to cart."""
         playwright_products_page.navigate_to("/inventory.html")
         playwright_products_page.add_item_to_cart("sauce-labs-backpack")
@@ -27,7 +31,7 @@ class TestPlaywrightProducts:
         assert cart_count == 1, "Cart should show 1 item"
         
     def test_add_multiple_items(self, playwright_authenticated,
-                               playwright_products_page: ProductsPage):
+                               playwright_products_page: "ProductsPage"):
         """Test adding multiple items to cart."""
         playwright_products_page.navigate_to("/inventory.html")
         playwright_products_page.add_item_to_cart("sauce-labs-backpack")
@@ -37,12 +41,34 @@ class TestPlaywrightProducts:
         cart_count = playwright_products_page.get_cart_count()
         assert cart_count == 3, "Cart should show 3 items"
         
+    @pytest.mark.cart_with("sauce-labs-backpack")
     def test_remove_item_from_cart(self, playwright_authenticated,
-                                  playwright_products_page: ProductsPage):
+                                  playwright_products_page: "ProductsPage"):
         """Test removing item from cart."""
-        playwright_products_page.navigate_to("/inventory.html")
-        playwright_products_page.add_item_to_cart("sauce-labs-backpack")
         playwright_products_page.remove_item_from_cart("sauce-labs-backpack")
         
+        playwright_products_page.assert_eventually_absent(playwright_products_page.CART_BADGE,
+                                                          message="Cart badge should disappear")
         cart_count = playwright_products_page.get_cart_count()
         assert cart_count == 0, "Cart should be empty"
+        
+    def test_snapshot_reflects_cart_state(self, playwright_authenticated,
+                                          playwright_products_page: "ProductsPage",
+                                          playwright_cart_page: "CartPage"):
+        """Test that one snapshot captures inventory, badge and cart rows."""
+        playwright_products_page.navigate_to("/inventory.html")
+        playwright_products_page.add_item_to_cart("sauce-labs-backpack")
+        playwright_products_page.add_item_to_cart("sauce-labs-bike-light")
+        
+        inventory = playwright_products_page.snapshot()
+        assert inventory.product_count == 6, "Should display 6 products"
+        assert inventory.cart_count == 2, "Cart should show 2 items"
+        assert sorted(inventory.in_cart) == ["sauce-labs-backpack", "sauce-labs-bike-light"]
+        assert inventory.item("sauce-labs-backpack").price == 29.99
+        assert inventory.sort == "az", "Default sort should be name A to Z"
+        
+        playwright_products_page.go_to_cart()
+        playwright_cart_page.wait_for_url("cart.html")
+        cart = playwright_cart_page.snapshot()
+        assert sorted(cart.slugs) == ["sauce-labs-backpack", "sauce-labs-bike-light"]
+        assert cart.total == 39.98
@@ -1,8 +1,12 @@
 """Selenium login functionality tests."""
+from typing import TYPE_CHECKING
 import pytest
-from pages.selenium.login_page import LoginPage
-from pages.selenium.products_page import ProductsPage
 from utils.config import config
+from utils.helpers import parametrize_data
+
+if TYPE_CHECKING:
+    from pages.selenium.login_page import LoginPage
+    from pages.selenium.products_page import ProductsPage
 
 @pytest.mark.smoke
 @pytest.mark.selenium
@@ -10,8 +14,8 @@ from utils.config import config
 class TestSeleniumLogin:
     """Test suite for login functionality using Selenium."""
     
-    def test_successful_login(self, selenium_login_page: LoginPage, 
-                             selenium_products_page: ProductsPage):
+    def test_successful_login(self, selenium_login_page: "LoginPage", 
+                             selenium_products_page: "ProductsPage"):
         """Test successful login with valid credentials."""
         selenium_login_page.navigate()
         selenium_login_page.login(config.VALID_USER, config.PASSWORD)
@@ -19,7 +23,14 @@ class TestSeleniumLogin:
         assert selenium_products_page.is_loaded(), \
             "Products page should be displayed after login"
         
-    def test_invalid_username(self, selenium_login_page: LoginPage):
+    def test_no_error_before_submit(self, selenium_login_page: "LoginPage"):
+        """Test that a freshly loaded login form shows no error."""
+        selenium_login_page.navigate()
+        
+        assert selenium_login_page.is_absent(selenium_login_page.ERROR_MESSAGE), \
+            "Error message should not be displayed"
+        
+    def test_invalid_username(self, selenium_login_page: "LoginPage"):
         """Test login with invalid username."""
         selenium_login_page.navigate()
         selenium_login_page.login("invalid_user", config.PASSWORD)
@@ -29,7 +40,7 @@ class TestSeleniumLogin:
         error_text = selenium_login_page.get_error_message()
         assert "Epic sadface" in error_text
         
-    def test_invalid_password(self, selenium_login_page: LoginPage):
+    def test_invalid_password(self, selenium_login_page: "LoginPage"):
         """Test login with invalid password."""
         selenium_login_page.navigate()
         selenium_login_page.login(config.VALID_USER, "wrong_password")
@@ -37,7 +48,7 @@ class TestSeleniumLogin:
         assert selenium_login_page.is_error_displayed(), \
             "Error message should be displayed"
         
-    def test_empty_credentials(self, selenium_login_page: LoginPage):
+    def test_empty_credentials(self, selenium_login_page: "LoginPage"):
         """Test login with empty credentials."""
         selenium_login_page.navigate()
         selenium_login_page.login("", "")
@@ -47,7 +58,7 @@ class TestSeleniumLogin:
         error_text = selenium_login_page.get_error_message()
         assert "Username is required" in error_text
         
-    def test_locked_out_user(self, selenium_login_page: LoginPage):
+    def test_locked_out_user(self, selenium_login_page: "LoginPage"):
         """Test login with locked out user."""
         selenium_login_page.navigate()
         selenium_login_page.login(config.LOCKED_USER, config.PASSWORD)
@@ -56,3 +67,18 @@ class TestSeleniumLogin:
             "Error message should be displayed"
         error_text = selenium_login_page.get_error_message()
         assert "locked out" in error_text.lower()
+        
+    @parametrize_data("username,password,error", "login_cases.csv", id_field="case")
+    def test_login_cases(self, selenium_login_page: "LoginPage",
+                         selenium_products_page: "ProductsPage", username, password, error):
+        """Test each credential combination in tests/data/login_cases.csv."""
+        selenium_login_page.navigate()
+        selenium_login_page.login(username, password)
+        
+        if not error:
+            assert selenium_products_page.is_loaded(), \
+                "Products page should be displayed after login"
+            return
+        assert selenium_login_page.is_error_displayed(), \
+            "Error message should be displayed"
+        assert error in selenium_login_page.get_error_message()
@@ -1,6 +1,10 @@
 """Selenium products page tests."""
+from typing import TYPE_CHECKING
 import pytest
-from pages.selenium.products_page import ProductsPage
+
+if TYPE_CHECKING:
+    from pages.selenium.products_page import ProductsPage
+    from pages.selenium.cart_page import CartPage
 
 @pytest.mark.selenium
 @pytest.mark.ui
@@ -9,7 +13,7 @@ class TestSeleniumProducts:
     """Test suite for products functionality using Selenium."""
     
     def test_products_displayed(self, selenium_authenticated, 
-                               selenium_products_page: ProductsPage):
+                               selenium_products_page: "ProductsPage"):
         """Test that products are displayed after login."""
         selenium_products_page.navigate_to("/inventory.html")
         
@@ -17,9 +21,8 @@ class TestSeleniumProducts:
         assert product_count > 0, "Products should be displayed"
         assert product_count == 6, "Should display 6 products"
     
-    @pytest.mark.xfail(reason="Selenium cart state isolation issue in CI")
     def test_add_single_item_to_cart(self, selenium_authenticated,
-                                    selenium_products_page: ProductsPage):
+                                    selenium_products_page: "ProductsPage"):
         """Test adding a single item to cart."""
         selenium_products_page.navigate_to("/inventory.html")
         selenium_products_page.add_item_to_cart("sauce-labs-backpack")
@@ -27,9 +30,8 @@ class TestSeleniumProducts:
         cart_count = selenium_products_page.get_cart_count()
         assert cart_count == 1, "Cart should show 1 item"
     
-    @pytest.mark.xfail(reason="Selenium cart state isolation issue in CI")
     def test_add_multiple_items(self, selenium_authenticated,
-                               selenium_products_page: ProductsPage):
+                               selenium_products_page: "ProductsPage"):
         """Test adding multiple items to cart."""
         selenium_products_page.navigate_to("/inventory.html")
         selenium_products_page.add_item_to_cart("sauce-labs-backpack")
@@ -38,13 +40,33 @@ class TestSeleniumProducts:
         cart_count = selenium_products_page.get_cart_count()
         assert cart_count == 2, "Cart should show 2 items"
     
-    @pytest.mark.xfail(reason="Selenium cart state isolation issue in CI")
+    @pytest.mark.cart_with("sauce-labs-backpack")
     def test_remove_item_from_products_page(self, selenium_authenticated,
-                                           selenium_products_page: ProductsPage):
+                                           selenium_products_page: "ProductsPage"):
         """Test removing item from products page."""
-        selenium_products_page.navigate_to("/inventory.html")
-        selenium_products_page.add_item_to_cart("sauce-labs-backpack")
         selenium_products_page.remove_item_from_cart("sauce-labs-backpack")
         
+        selenium_products_page.assert_eventually_absent(selenium_products_page.CART_BADGE,
+                                                        message="Cart badge should disappear")
         cart_count = selenium_products_page.get_cart_count()
         assert cart_count == 0, "Cart should be empty"
+        
+    def test_snapshot_reflects_cart_state(self, selenium_authenticated,
+                                          selenium_products_page: "ProductsPage",
+                                          selenium_cart_page: "CartPage"):
+        """Test that one snapshot captures inventory, badge and cart rows."""
+        selenium_products_page.navigate_to("/inventory.html")
+        selenium_products_page.add_item_to_cart("sauce-labs-backpack")
+        selenium_products_page.add_item_to_cart("sauce-labs-bike-light")
+        
+        inventory = selenium_products_page.snapshot()
+        assert inventory.product_count == 6, "Should display 6 products"
+        assert inventory.cart_count == 2, "Cart should show 2 items"
+        assert sorted(inventory.in_cart) == ["sauce-labs-backpack", "sauce-labs-bike-light"]
+        assert inventory.item("sauce-labs-backpack").price == 29.99
+        assert inventory.sort == "az", "Default sort should be name A to Z"
+        
+        selenium_products_page.go_to_cart()
+        cart = selenium_cart_page.snapshot()
+        assert sorted(cart.slugs) == ["sauce-labs-backpack", "sauce-labs-bike-light"]
+        assert cart.total == 39.98
@@ -0,0 +1,94 @@
+"""Absence helper tests for both engines, against mocked drivers."""
+from unittest.mock import MagicMock, call
+import pytest
+from utils.config import config
+
+BADGE = ".shopping_cart_badge"
+
+def element(displayed=True):
+    handle = MagicMock()
+    handle.is_displayed.return_value = displayed
+    return handle
+
+@pytest.fixture
+def selenium_page(monkeypatch):
+    """Selenium BasePage over a mock WebDriver with a 10s implicit wait configured."""
+    from pages.selenium.base_page import BasePage
+    monkeypatch.setattr(config, "SELENIUM_IMPLICIT_WAIT", 10)
+    return BasePage(MagicMock(), poll_interval=0.01)
+
+@pytest.fixture
+def playwright_page():
+    """Playwright BasePage over a mock Page."""
+    from pages.playwright.base_page import BasePage
+    return BasePage(MagicMock())
+
+class TestSeleniumAbsence:
+    """is_absent / assert_eventually_absent on Selenium pages."""
+    
+    def test_absent_without_implicit_wait(self, selenium_page):
+        """Test that the lookup runs with the implicit wait off and restores it."""
+        driver = selenium_page.driver
+        driver.find_elements.return_value = []
+        
+        assert selenium_page.is_absent(BADGE)
+        assert driver.implicitly_wait.call_args_list == [call(0), call(10)]
+        
+    def test_hidden_elements_count_as_absent(self, selenium_page):
+        """Test that only displayed elements make a selector present."""
+        selenium_page.driver.find_elements.return_value = [element(displayed=False)]
+        assert selenium_page.is_absent(BADGE)
+        
+        selenium_page.driver.find_elements.return_value = [element(displayed=False), element()]
+        assert not selenium_page.is_absent(BADGE)
+        
+    def test_eventually_absent_returns_once_gone(self, selenium_page):
+        """Test that polling stops as soon as the element disappears."""
+        driver = selenium_page.driver
+        driver.find_elements.side_effect = [[element()], [element()], []]
+        
+        selenium_page.assert_eventually_absent(BADGE, timeout=5)
+        
+        assert driver.find_elements.call_count == 3
+        assert driver.implicitly_wait.call_args_list[-1] == call(10)
+        
+    def test_eventually_absent_fails_after_timeout(self, selenium_page):
+        """Test that a still-displayed element raises AssertionError with the message."""
+        selenium_page.driver.find_elements.return_value = [element()]
+        
+        with pytest.raises(AssertionError, match="badge should disappear"):
+            selenium_page.assert_eventually_absent(BADGE, timeout=0.05,
+                                                   message="badge should disappear")
+        assert selenium_page.driver.implicitly_wait.call_args_list[-1] == call(10)
+
+class TestPlaywrightAbsence:
+    """is_absent / assert_eventually_absent on Playwright pages."""
+    
+    def test_absent_counts_visible_matches(self, playwright_page):
+        """Test that is_absent counts only visible matches, once."""
+        page = playwright_page.page
+        page.locator.return_value.count.return_value = 0
+        
+        assert playwright_page.is_absent(BADGE)
+        page.locator.assert_called_once_with(f"{BADGE} >> visible=true")
+        
+    def test_eventually_absent_takes_seconds(self, playwright_page, monkeypatch):
+        """Test that the timeout is given in seconds, like the Selenium helper."""
+        assertion = MagicMock()
+        monkeypatch.setattr("pages.playwright.base_page.expect", assertion)
+        
+        playwright_page.assert_eventually_absent(BADGE, timeout=2.5, message="badge")
+        
+        assertion.assert_called_once_with(playwright_page.page.locator.return_value, "badge")
+        assertion.return_value.to_have_count.assert_called_once_with(0, timeout=2500)
+        
+    def test_eventually_absent_defaults_to_page_timeout(self, playwright_page, monkeypatch):
+        """Test that the default timeout is PLAYWRIGHT_TIMEOUT."""
+        assertion = MagicMock()
+        monkeypatch.setattr("pages.playwright.base_page.expect", assertion)
+        
+        playwright_page.assert_eventually_absent(BADGE)
+        
+        assertion.return_value.to_have_count.assert_called_once_with(
+            0, timeout=config.PLAYWRIGHT_TIMEOUT
+        )
@@ -0,0 +1,95 @@
+"""Benchmark statistics and baseline comparison tests."""
+import math
+import pytest
+from utils.benchmark import BenchmarkStats, compare, percentile
+
+def document(**metrics):
+    """Build a write_results-style document from name=(median_ms, p95_ms) pairs."""
+    return {"metrics": {name.replace("_", "."): {"median_ms": median, "p95_ms": p95}
+                        for name, (median, p95) in metrics.items()}}
+
+class TestPercentile:
+    """Linear-interpolated percentile."""
+    
+    def test_single_sample_is_every_percentile(self):
+        """Test that one sample is returned for any percentile."""
+        for pct in (0, 50, 95, 100):
+            assert percentile([7.0], pct) == 7.0
+            
+    def test_bounds_are_min_and_max(self):
+        """Test that p0 and p100 are the smallest and largest values."""
+        values = [5.0, 1.0, 3.0, 9.0]
+        
+        assert percentile(values, 0) == 1.0
+        assert percentile(values, 100) == 9.0
+        
+    def test_interpolates_between_ranks(self):
+        """Test that a percentile between two ranks is interpolated."""
+        assert percentile([10.0, 20.0], 50) == 15.0
+        assert percentile([0.0, 10.0, 20.0, 30.0, 40.0], 95) == pytest.approx(38.0)
+        
+    def test_empty_is_nan(self):
+        """Test that no samples give NaN rather than an error."""
+        assert math.isnan(percentile([], 50))
+
+class TestBenchmarkStats:
+    """Summary statistics over recorded samples."""
+    
+    def test_statistics_in_milliseconds(self):
+        """Test that nanosecond samples are summarized in milliseconds."""
+        stats = BenchmarkStats("selenium.login", [1_000_000, 2_000_000, 3_000_000, 10_000_000])
+        
+        assert stats.samples_ms == [1.0, 2.0, 3.0, 10.0]
+        assert stats.median_ms == 2.5
+        assert stats.mean_ms == 4.0
+        assert stats.p95_ms == pytest.approx(8.95)
+        
+    def test_single_round_has_zero_stddev(self):
+        """Test that one round reports a stddev of 0 instead of failing."""
+        stats = BenchmarkStats("playwright.login", [4_000_000], warmup=2)
+        
+        assert stats.stddev_ms == 0.0
+        assert stats.to_dict()["rounds"] == 1
+        assert stats.to_dict()["warmup"] == 2
+        
+    def test_to_dict_rounds_values(self):
+        """Test that the serialized statistics are rounded to microseconds."""
+        result = BenchmarkStats("cart", [1_234_567, 2_345_678]).to_dict()
+        
+        assert result["min_ms"] == 1.235
+        assert result["max_ms"] == 2.346
+        assert result["samples_ms"] == [1.235, 2.346]
+
+class TestCompare:
+    """Regression detection against a stored baseline."""
+    
+    def test_change_at_threshold_passes(self):
+        """Test that a slowdown exactly at the threshold is not a regression."""
+        baseline = document(selenium_login=(100.0, 200.0))
+        current = document(selenium_login=(120.0, 240.0))
+        
+        assert compare(current, baseline, 0.2) == []
+        
+    def test_change_beyond_threshold_fails(self):
+        """Test that each metric beyond the threshold is reported."""
+        baseline = document(selenium_login=(100.0, 200.0))
+        current = document(selenium_login=(121.0, 200.0))
+        
+        regressions = compare(current, baseline, 0.2)
+        
+        assert len(regressions) == 1
+        assert regressions[0].startswith("selenium.login median_ms: 100.0ms -> 121.0ms")
+        
+    def test_speedup_passes(self):
+        """Test that getting faster is never a regression."""
+        baseline = document(playwright_cart=(100.0, 200.0))
+        current = document(playwright_cart=(50.0, 90.0))
+        
+        assert compare(current, baseline, 0.0) == []
+        
+    def test_metrics_missing_from_baseline_are_skipped(self):
+        """Test that new metrics and zero baselines are not compared."""
+        baseline = document(selenium_login=(0.0, 0.0))
+        current = document(selenium_login=(50.0, 90.0), playwright_login=(500.0, 900.0))
+        
+        assert compare(current, baseline, 0.2) == []
@@ -0,0 +1,177 @@
+"""Rerun, rerun budget and quarantine tests, run in a separate pytest process."""
+from types import SimpleNamespace
+import pytest
+from utils.flake_tracker import FlakeStats, FlakeStore, attempt_outcome
+from utils.helpers import ROOT
+
+pytest_plugins = ["pytester"]
+
+# The inner session loads this repo's hooks and fixtures
+CONFTEST = "from tests.conftest import *  # noqa: F401,F403\n"
+
+FLAKY_MODULE = """
+import pytest
+
+setups = {"module": 0, "function": 0}
+
+@pytest.fixture(scope="module")
+def shared():
+    setups["module"] += 1
+    yield
+    print(f"module fixture set up {setups['module']} time(s)")
+
+@pytest.fixture
+def fresh():
+    setups["function"] += 1
+    yield
+
+def test_first(shared):
+    assert setups["module"] == 1
+
+# Last in its module, so a full teardown would also end `shared`
+def test_flaky(shared, fresh):
+    assert setups["function"] > 1
+"""
+
+@pytest.fixture
+def inner(pytester, monkeypatch):
+    """Pytester whose sessions use the repo conftest and record to its own directory."""
+    monkeypatch.setenv("PYTHONPATH", str(ROOT))
+    monkeypatch.delenv("PYTEST_XDIST_WORKER", raising=False)
+    pytester.makeconftest(CONFTEST)
+    return pytester
+
+def run(pytester, *args):
+    return pytester.runpytest_subprocess("-p", "no:playwright", "-p", "no:cacheprovider",
+                                         "-s", "--no-timing-history", *args)
+
+def history(pytester):
+    return FlakeStore(str(pytester.path / "reports" / "flakes.sqlite")).stats()
+
+class TestReruns:
+    """Reruns of failed tests within the budget."""
+    
+    def test_rerun_keeps_module_fixtures(self, inner):
+        """Test that a rerun gets fresh function fixtures but the same module fixture."""
+        inner.makepyfile(test_flaky=FLAKY_MODULE)
+        
+        result = run(inner, "--reruns", "1")
+        
+        assert result.parseoutcomes() == {"passed": 2, "rerun": 1}
+        result.stdout.fnmatch_lines(["*module fixture set up 1 time(s)*"])
+        result.stdout.no_fnmatch_line("*module fixture set up 2 time(s)*")
+        stats = history(inner)["test_flaky.py::test_flaky"]
+        assert (stats.runs, stats.flaky, stats.failed) == (1, 1, 0)
+        
+    def test_budget_exhaustion(self, inner):
+        """Test that reruns stop once the per-process budget is spent."""
+        inner.makepyfile(test_broken="""
+            def test_first():
+                assert False
+
+            def test_second():
+                assert False
+        """)
+        
+        result = run(inner, "--reruns", "3", "--rerun-budget", "2")
+        
+        assert result.parseoutcomes() == {"failed": 2, "rerun": 2}
+        stats = history(inner)
+        assert stats["test_broken.py::test_first"].failed == 1
+        assert stats["test_broken.py::test_second"].failed == 1
+        
+    def test_no_reruns(self, inner):
+        """Test that --reruns 0 leaves pytest's own protocol in charge."""
+        inner.makepyfile(test_flaky=FLAKY_MODULE)
+        
+        result = run(inner, "--reruns", "0")
+        
+        result.assert_outcomes(passed=1, failed=1)
+        
+    def test_off_by_default(self, inner, monkeypatch):
+        """Test that a failure is not rerun unless reruns are asked for."""
+        monkeypatch.delenv("FLAKE_RERUNS", raising=False)
+        inner.makepyfile(test_flaky=FLAKY_MODULE)
+        
+        result = run(inner)
+        
+        assert result.parseoutcomes() == {"passed": 1, "failed": 1}
+
+class TestQuarantine:
+    """Quarantine of tests with a flaky history."""
+    
+    def test_flaky_history_runs_as_xfail(self, inner):
+        """Test that a quarantined test cannot fail the build but is still recorded."""
+        nodeid = "test_quarantine.py::test_unstable"
+        store = FlakeStore(str(inner.path / "reports" / "flakes.sqlite"))
+        for started in range(5):
+            store.record([(nodeid, 0, "rerun", 0.1), (nodeid, 1, "passed", 0.1)], started=started)
+        inner.makepyfile(test_quarantine="""
+            def test_unstable():
+                assert False
+        """)
+        
+        result = run(inner, "--reruns", "1")
+        
+        assert result.parseoutcomes() == {"xfailed": 1, "rerun": 1}
+        result.stdout.fnmatch_lines(["*quarantined as xfail: 1*"])
+        stats = history(inner)[nodeid]
+        assert (stats.runs, stats.flaky, stats.failed) == (6, 5, 1)
+        
+    def test_no_quarantine(self, inner):
+        """Test that --no-quarantine runs a flaky test normally."""
+        nodeid = "test_quarantine.py::test_unstable"
+        store = FlakeStore(str(inner.path / "reports" / "flakes.sqlite"))
+        for started in range(5):
+            store.record([(nodeid, 0, "rerun", 0.1), (nodeid, 1, "passed", 0.1)], started=started)
+        inner.makepyfile(test_quarantine="""
+            def test_unstable():
+                assert False
+        """)
+        
+        result = run(inner, "--reruns", "0", "--no-quarantine")
+        
+        result.assert_outcomes(failed=1)
+        
+    def test_declared_xfail_is_not_a_failure(self, inner):
+        """Test that an expected failure is neither rerun nor counted as failed."""
+        inner.makepyfile(test_expected="""
+            import pytest
+
+            @pytest.mark.xfail(reason="known bug")
+            def test_known_bug():
+                assert False
+        """)
+        
+        result = run(inner, "--reruns", "1")
+        
+        result.assert_outcomes(xfailed=1)
+        stats = history(inner)["test_expected.py::test_known_bug"]
+        assert (stats.runs, stats.flaky, stats.failed, stats.fail_rate) == (1, 0, 0, 0.0)
+
+class TestOutcomes:
+    """Attempt outcomes and per-session stats."""
+    
+    @staticmethod
+    def report(outcome, **attributes):
+        return SimpleNamespace(outcome=outcome, failed=outcome == "failed",
+                               skipped=outcome == "skipped", duration=0.0, **attributes)
+        
+    def test_quarantined_xfail_is_a_failure(self):
+        """Test that only quarantine's own xfail is recorded as a failure."""
+        quarantined = self.report("skipped", wasxfail="quarantined: flaky in 2 of the last 5 runs")
+        declared = self.report("skipped", wasxfail="known bug")
+        
+        assert attempt_outcome([self.report("passed"), quarantined]) == "failed"
+        assert attempt_outcome([self.report("passed"), declared]) == "xfailed"
+        
+    def test_session_outcomes(self):
+        """Test how one session's attempts count toward flaky and failed."""
+        stats = FlakeStats("test_x")
+        stats.add_session([("rerun", 1.0), ("passed", 1.0)])
+        stats.add_session([("rerun", 1.0), ("failed", 1.0)])
+        stats.add_session([("xfailed", 1.0)])
+        stats.add_session([("skipped", 0.0)])
+        
+        assert (stats.runs, stats.flaky, stats.failed) == (3, 1, 1)
+        assert stats.mean_duration == pytest.approx(5 / 3)
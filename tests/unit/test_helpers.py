@@ -0,0 +1,189 @@
+"""Test data loader tests: memoization, streaming and parametrize ids."""
+import json
+import pytest
+from utils import helpers
+from utils.helpers import get_test_data, iter_test_data, parametrize_data
+
+CSV = "case,username,error\nok,standard_user,\nlocked,locked_out_user,locked out\n"
+
+@pytest.fixture
+def data_cache(tmp_path, monkeypatch):
+    """Fresh in-process memo and on-disk cache for each test."""
+    cache_dir = tmp_path / "cache"
+    monkeypatch.setattr(helpers, "DATA_CACHE_DIR", cache_dir)
+    monkeypatch.setattr(helpers, "_data_cache", {})
+    return cache_dir
+
+@pytest.fixture
+def parse_calls(monkeypatch):
+    """Count the data files actually parsed."""
+    calls = []
+    parse = helpers._parse
+    
+    def counting_parse(path):
+        calls.append(path.name)
+        return parse(path)
+    
+    monkeypatch.setattr(helpers, "_parse", counting_parse)
+    return calls
+
+class TestGetTestData:
+    """get_test_data() parsing and caching."""
+    
+    def test_csv_rows_are_dicts_of_strings(self, tmp_path, data_cache):
+        """Test that CSV rows keep every column as a string."""
+        path = tmp_path / "users.csv"
+        path.write_text(CSV)
+        
+        assert get_test_data(str(path)) == [
+            {"case": "ok", "username": "standard_user", "error": ""},
+            {"case": "locked", "username": "locked_out_user", "error": "locked out"},
+        ]
+        
+    def test_key_selects_top_level_value(self, tmp_path, data_cache):
+        """Test that key= picks one value of a JSON object."""
+        path = tmp_path / "accounts.json"
+        path.write_text(json.dumps({"users": [{"name": "a"}], "admins": []}))
+        
+        assert get_test_data(str(path), key="users") == [{"name": "a"}]
+        with pytest.raises(KeyError, match="missing"):
+            get_test_data(str(path), key="missing")
+            
+    def test_unsupported_format(self, tmp_path, data_cache):
+        """Test that an unknown extension is rejected."""
+        path = tmp_path / "users.yaml"
+        path.write_text("users: []\n")
+        
+        with pytest.raises(ValueError, match="Unsupported test data format"):
+            get_test_data(str(path))
+            
+    def test_parsed_once_per_process(self, tmp_path, data_cache, parse_calls):
+        """Test that repeated loads are served from memory."""
+        path = tmp_path / "users.csv"
+        path.write_text(CSV)
+        
+        get_test_data(str(path))
+        get_test_data(str(path))
+        
+        assert parse_calls == ["users.csv"]
+        
+    def test_disk_cache_is_json_and_shared(self, tmp_path, data_cache, parse_calls, monkeypatch):
+        """Test that another process reuses the JSON cache file instead of parsing."""
+        path = tmp_path / "users.csv"
+        path.write_text(CSV)
+        expected = get_test_data(str(path))
+        
+        cached_files = list(data_cache.iterdir())
+        assert [cached.suffix for cached in cached_files] == [".json"]
+        assert json.loads(cached_files[0].read_text()) == expected
+        
+        # A new worker starts with an empty memo
+        monkeypatch.setattr(helpers, "_data_cache", {})
+        assert get_test_data(str(path)) == expected
+        assert parse_calls == ["users.csv"]
+        
+    def test_corrupt_disk_cache_is_reparsed(self, tmp_path, data_cache, parse_calls, monkeypatch):
+        """Test that an unreadable cache file falls back to the data file."""
+        path = tmp_path / "users.csv"
+        path.write_text(CSV)
+        expected = get_test_data(str(path))
+        for cached in data_cache.iterdir():
+            cached.write_text("{not json")
+        
+        monkeypatch.setattr(helpers, "_data_cache", {})
+        
+        assert get_test_data(str(path)) == expected
+        assert parse_calls == ["users.csv", "users.csv"]
+        
+    def test_editing_file_invalidates_cache(self, tmp_path, data_cache):
+        """Test that a changed file is parsed again."""
+        path = tmp_path / "users.csv"
+        path.write_text(CSV)
+        get_test_data(str(path))
+        
+        path.write_text("case,username,error\nnew,problem_user,\n")
+        
+        assert [row["case"] for row in get_test_data(str(path))] == ["new"]
+        
+    def test_mutations_do_not_leak(self, tmp_path, data_cache):
+        """Test that each caller gets its own copy of the cached document."""
+        path = tmp_path / "accounts.json"
+        path.write_text(json.dumps({"users": [{"name": "a", "roles": ["buyer"]}]}))
+        
+        users = get_test_data(str(path), key="users")
+        users[0]["roles"].append("admin")
+        users.append({"name": "b"})
+        
+        assert get_test_data(str(path), key="users") == [{"name": "a", "roles": ["buyer"]}]
+        assert list(iter_test_data(str(path), key="users")) == [{"name": "a", "roles": ["buyer"]}]
+
+class TestIterTestData:
+    """iter_test_data() streaming."""
+    
+    def test_jsonl_is_streamed(self, tmp_path, data_cache):
+        """Test that JSONL records are yielded before later lines are parsed."""
+        path = tmp_path / "orders.jsonl"
+        path.write_text('{"id": 1}\n\n{"id": 2}\nnot json\n')
+        
+        records = iter_test_data(str(path))
+        
+        assert next(records) == {"id": 1}
+        assert next(records) == {"id": 2}
+        with pytest.raises(ValueError, match=r"orders\.jsonl:4"):
+            next(records)
+            
+    def test_csv_is_not_memoized(self, tmp_path, data_cache, parse_calls):
+        """Test that streaming neither parses the whole file nor fills the cache."""
+        path = tmp_path / "users.csv"
+        path.write_text(CSV)
+        
+        assert [row["case"] for row in iter_test_data(str(path))] == ["ok", "locked"]
+        assert parse_calls == []
+        assert not data_cache.exists()
+        
+    def test_json_object_needs_key(self, tmp_path, data_cache):
+        """Test that a JSON object is not iterated by its keys."""
+        path = tmp_path / "accounts.json"
+        path.write_text(json.dumps({"users": [{"name": "a"}]}))
+        
+        with pytest.raises(TypeError, match="pass key="):
+            list(iter_test_data(str(path)))
+        assert list(iter_test_data(str(path), key="users")) == [{"name": "a"}]
+
+class TestParametrizeData:
+    """parametrize_data() parameter sets."""
+    
+    def test_ids_and_values(self, tmp_path, data_cache):
+        """Test that the id field names each case and only argnames are passed."""
+        path = tmp_path / "users.csv"
+        path.write_text(CSV)
+        
+        mark = parametrize_data("username, error", str(path), id_field="case").mark
+        argnames, params = mark.args
+        
+        assert argnames == ["username", "error"]
+        assert [(param.id, param.values) for param in params] == [
+            ("ok", ("standard_user", "")),
+            ("locked", ("locked_out_user", "locked out")),
+        ]
+        # Re-iterable, as pytest may walk the parameter sets more than once
+        assert len(list(params)) == 2
+        
+    def test_without_id_field(self, tmp_path, data_cache):
+        """Test that pytest generates the ids when no id field is given."""
+        path = tmp_path / "users.csv"
+        path.write_text(CSV)
+        
+        mark = parametrize_data("username", str(path)).mark
+        
+        assert [param.id for param in mark.args[1]] == [None, None]
+        
+    def test_missing_field(self, tmp_path, data_cache):
+        """Test that a record without an argname is reported by index."""
+        path = tmp_path / "users.csv"
+        path.write_text(CSV)
+        
+        mark = parametrize_data("username,password", str(path)).mark
+        
+        with pytest.raises(KeyError, match="Record 0 of .* has no field 'password'"):
+            list(mark.args[1])
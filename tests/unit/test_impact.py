@@ -0,0 +1,171 @@
+"""Change-aware selection tests: diff parsing, test selection and coverage recording."""
+from unittest.mock import MagicMock
+from utils.impact import ROOT, ChangeSet, CoverageRecorder, select
+
+COMMON_CART = "pages/common/cart_page.py"
+SELENIUM_CART = "pages/selenium/cart_page.py"
+PLAYWRIGHT_CART = "pages/playwright/cart_page.py"
+
+CART_TEST = "tests/ui_selenium/test_cart.py::TestCart::test_remove"
+LOGIN_TEST = "tests/ui_selenium/test_login.py::TestLogin::test_valid"
+IMPACT_MAP = {
+    CART_TEST: [f"{COMMON_CART}::CartPage", f"{COMMON_CART}::CartPage.remove_item",
+                f"{SELENIUM_CART}::CartPage"],
+    LOGIN_TEST: ["pages/common/login_page.py::LoginPage.login"],
+}
+
+def line_of(path, text):
+    """1-based number of the first line of path containing text."""
+    lines = (ROOT / path).read_text().splitlines()
+    return next(number for number, line in enumerate(lines, 1) if text in line)
+
+def changes(path, *lines):
+    """ChangeSet with lines changed in one file."""
+    return ChangeSet({path: set(lines)}, set())
+
+class TestChangeSetParse:
+    """Parsing `git diff --unified=0` output."""
+    
+    def test_added_and_modified_lines(self):
+        """Test that hunks record the new-side line range."""
+        diff = (
+            "diff --git a/pages/common/cart_page.py b/pages/common/cart_page.py\n"
+            "--- a/pages/common/cart_page.py\n"
+            "+++ b/pages/common/cart_page.py\n"
+            "@@ -10 +10 @@ class CartPage(BasePage):\n"
+            "-    CART_ITEMS = '.cart_item'\n"
+            "+    CART_ITEMS = '.cart-item'\n"
+            "@@ -30,0 +31,3 @@ def remove_item\n"
+        )
+        
+        result = ChangeSet.parse(diff)
+        
+        assert result.files == {COMMON_CART: {10, 31, 32, 33}}
+        assert result.deleted == set()
+        
+    def test_pure_deletion_touches_preceding_line(self):
+        """Test that removed lines mark the line they were removed after."""
+        diff = (
+            "--- a/pages/common/cart_page.py\n"
+            "+++ b/pages/common/cart_page.py\n"
+            "@@ -12,2 +11,0 @@\n"
+            "@@ -1 +0,0 @@\n"
+        )
+        
+        assert ChangeSet.parse(diff).files == {COMMON_CART: {11, 1}}
+        
+    def test_deleted_file(self):
+        """Test that a file removed in the diff is reported as deleted."""
+        diff = (
+            "--- a/pages/playwright/cart_page.py\n"
+            "+++ /dev/null\n"
+            "@@ -1,6 +0,0 @@\n"
+        )
+        
+        result = ChangeSet.parse(diff)
+        
+        assert result.deleted == {PLAYWRIGHT_CART}
+        assert result.files == {}
+        
+    def test_untracked_files_change_at_module_level(self):
+        """Test that untracked files are marked with line 0 (whole module)."""
+        result = ChangeSet.parse("", untracked=["pages/common/new_page.py"])
+        
+        assert result.files == {"pages/common/new_page.py": {0}}
+
+class TestSelect:
+    """Choosing the tests affected by a change set."""
+    
+    def test_method_edit_selects_callers(self):
+        """Test that a changed method selects only the tests that called it."""
+        line = line_of(COMMON_CART, "self.click(f\"#remove-")
+        
+        selected, reason = select(IMPACT_MAP, changes(COMMON_CART, line), IMPACT_MAP)
+        
+        assert selected == {CART_TEST}
+        assert reason == "1 changed symbols, 0 changed modules"
+        
+    def test_class_level_edit_selects_class_users(self):
+        """Test that a changed locator selects every test that used the class."""
+        line = line_of(COMMON_CART, "CART_ITEMS =")
+        
+        selected, _ = select(IMPACT_MAP, changes(COMMON_CART, line), IMPACT_MAP)
+        
+        assert selected == {CART_TEST}
+        
+    def test_engine_subclass_edit_selects_its_users(self):
+        """Test that an edit to an empty per-engine subclass selects the tests that used it."""
+        line = line_of(SELENIUM_CART, "class CartPage")
+        
+        selected, reason = select(IMPACT_MAP, changes(SELENIUM_CART, line), IMPACT_MAP)
+        
+        assert selected == {CART_TEST}
+        assert reason == "1 changed symbols, 0 changed modules"
+        
+    def test_module_level_edit_selects_module_users(self):
+        """Test that an import change selects every test that used the module."""
+        selected, reason = select(IMPACT_MAP, changes(SELENIUM_CART, 1), IMPACT_MAP)
+        
+        assert selected == {CART_TEST}
+        assert reason == "0 changed symbols, 1 changed modules"
+        
+    def test_no_recorded_symbols_selects_nothing(self):
+        """Test that a change no recorded test touched selects no mapped test."""
+        selected, reason = select(IMPACT_MAP, changes(PLAYWRIGHT_CART, 1), IMPACT_MAP)
+        
+        assert selected == set()
+        assert reason == "0 changed symbols, 1 changed modules"
+        
+    def test_unmapped_and_changed_tests_always_run(self):
+        """Test that new tests and tests in changed test files are selected."""
+        new_test = "tests/ui_selenium/test_new.py::test_it"
+        
+        selected, _ = select([*IMPACT_MAP, new_test],
+                             changes("tests/ui_selenium/test_login.py", 5), IMPACT_MAP)
+        
+        assert selected == {LOGIN_TEST, new_test}
+        
+    def test_deleted_page_module_runs_full_suite(self):
+        """Test that deleting a page module falls back to the full suite."""
+        deleted = ChangeSet({}, {PLAYWRIGHT_CART})
+        
+        assert select(IMPACT_MAP, deleted, IMPACT_MAP) == (None, f"{PLAYWRIGHT_CART} deleted")
+        
+    def test_utils_change_runs_full_suite(self):
+        """Test that framework changes fall back to the full suite."""
+        selected, reason = select(IMPACT_MAP, changes("utils/config.py", 3), IMPACT_MAP)
+        
+        assert selected is None
+        assert reason == "utils/config.py changed"
+
+class TestCoverageRecorder:
+    """Recording the page-object symbols a test exercises."""
+    
+    def test_records_functions_and_engine_classes(self):
+        """Test that inherited calls also record every page class of the instance."""
+        from pages.selenium.cart_page import CartPage
+        recorder = CoverageRecorder()
+        
+        recorder.start()
+        try:
+            CartPage(MagicMock()).count_now(".cart_item")
+        finally:
+            symbols = recorder.stop()
+            
+        assert "pages/common/base_page.py::BasePage.count_now" in symbols
+        assert f"{SELENIUM_CART}::CartPage" in symbols
+        assert f"{COMMON_CART}::CartPage" in symbols
+        assert "pages/selenium/base_page.py::BasePage" in symbols
+        
+    def test_ignores_code_outside_pages(self):
+        """Test that nothing is recorded for calls outside pages/."""
+        recorder = CoverageRecorder()
+        
+        recorder.start()
+        try:
+            sorted([3, 1, 2])
+            line_of(COMMON_CART, "class CartPage")
+        finally:
+            symbols = recorder.stop()
+            
+        assert symbols == []
@@ -0,0 +1,68 @@
+"""Launch profile tests: throwaway profile directories and their cleanup."""
+import os
+import pytest
+from utils import launch_profiles
+from utils.launch_profiles import LaunchProfile, remove_on_quit
+
+class FakeDriver:
+    """Stand-in for a WebDriver whose quit may fail."""
+    
+    def __init__(self, error=None):
+        self.error = error
+        self.quits = 0
+        
+    def quit(self):
+        self.quits += 1
+        if self.error:
+            raise self.error
+
+class TestProfileDir:
+    """Throwaway profile directories."""
+    
+    def test_only_throwaway_profiles_make_a_dir(self):
+        """Test that default and debug let the driver choose its own profile."""
+        assert LaunchProfile("default").make_profile_dir() is None
+        assert LaunchProfile("debug").make_profile_dir() is None
+        
+    def test_removed_when_driver_quits(self):
+        """Test that the directory lives exactly as long as its driver."""
+        path = LaunchProfile("ci-stable").make_profile_dir()
+        driver = remove_on_quit(FakeDriver(), path)
+        
+        assert os.path.isdir(path)
+        driver.quit()
+        
+        assert driver.quits == 1
+        assert not os.path.exists(path)
+        
+    def test_removed_when_quit_fails(self):
+        """Test that a driver failing to quit still releases its directory."""
+        path = LaunchProfile("ci-stable").make_profile_dir()
+        driver = remove_on_quit(FakeDriver(RuntimeError("session gone")), path)
+        
+        with pytest.raises(RuntimeError):
+            driver.quit()
+            
+        assert not os.path.exists(path)
+        
+    def test_removed_when_launch_fails(self):
+        """Test that a browser failing to start does not leave its directory behind."""
+        from utils.driver_factory import DriverFactory
+        path = LaunchProfile("ci-stable").make_profile_dir()
+        
+        def launch(options):
+            raise RuntimeError("no browser")
+            
+        with pytest.raises(RuntimeError):
+            DriverFactory._start(launch, None, path)
+            
+        assert not os.path.exists(path)
+        
+    def test_small_dev_shm_is_not_used(self, monkeypatch):
+        """Test that fastest-headless falls back to the temp dir when /dev/shm is small."""
+        monkeypatch.setattr(launch_profiles, "SHM_MIN_FREE", float("inf"))
+        path = LaunchProfile("fastest-headless").make_profile_dir()
+        try:
+            assert not path.startswith("/dev/shm/")
+        finally:
+            os.rmdir(path)
@@ -0,0 +1,88 @@
+"""Local storefront smoke tests over plain HTTP, no browser needed.
+
+Login itself runs in the page script (it sets the session cookie and loads
+/inventory.html), so these check the pieces the server owns: the login
+form, the redirect of protected pages and the session cookie check.
+"""
+import urllib.error
+import urllib.request
+import pytest
+from utils.catalog import PRODUCTS, SESSION_COOKIE
+from utils.local_server import LocalStorefront
+
+class _NoRedirect(urllib.request.HTTPRedirectHandler):
+    def redirect_request(self, *args, **kwargs):
+        return None
+
+_opener = urllib.request.build_opener(_NoRedirect)
+
+@pytest.fixture(scope="module")
+def storefront():
+    with LocalStorefront() as server:
+        yield server
+
+def fetch(storefront, path, user=None, method="GET"):
+    """(status, headers, body) of a request, without following redirects."""
+    request = urllib.request.Request(f"{storefront.url}{path}", method=method)
+    if user is not None:
+        request.add_header("Cookie", f"{SESSION_COOKIE}={user}")
+    try:
+        with _opener.open(request, timeout=5) as response:
+            return response.status, response.headers, response.read().decode("utf-8")
+    except urllib.error.HTTPError as error:
+        return error.code, error.headers, error.read().decode("utf-8")
+
+class TestLocalStorefront:
+    """Routing and session handling of the stand-in storefront."""
+    
+    def test_login_page(self, storefront):
+        """Test that the login form has the ids the page objects use."""
+        status, _, body = fetch(storefront, "/")
+        
+        assert status == 200
+        for element_id in ('id="user-name"', 'id="password"', 'id="login-button"'):
+            assert element_id in body
+        assert 'data-test="error"' not in body
+        
+    def test_login_script_sets_session_cookie(self, storefront):
+        """Test that the login script stores the user in the session cookie and redirects."""
+        status, headers, script = fetch(storefront, "/static/app.js")
+        
+        assert status == 200
+        assert headers["Content-Type"].startswith("application/javascript")
+        assert f'"{SESSION_COOKIE}"' in script
+        assert 'window.location.assign("/inventory.html")' in script
+        
+    def test_protected_page_redirects_to_login(self, storefront):
+        """Test that a page behind login redirects anonymous visitors with an error."""
+        status, headers, _ = fetch(storefront, "/inventory.html")
+        
+        assert status == 302
+        assert headers["Location"] == "/?from=/inventory.html"
+        _, _, body = fetch(storefront, headers["Location"])
+        assert "You can only access &#x27;/inventory.html&#x27; when you are logged in." in body
+        
+    def test_session_cookie_grants_inventory(self, storefront):
+        """Test that a valid session cookie serves every product."""
+        status, _, body = fetch(storefront, "/inventory.html", user="standard_user")
+        
+        assert status == 200
+        assert body.count('class="inventory_item"') == len(PRODUCTS)
+        for product in PRODUCTS:
+            # Buttons get their ids from the page script; links are server-rendered
+            assert f'id="item_{product.item_id}_title_link"' in body
+            
+    @pytest.mark.parametrize("user", ["locked_out_user", "unknown_user", ""])
+    def test_invalid_session_cookie(self, storefront, user):
+        """Test that locked-out and unknown users are sent back to login."""
+        status, headers, _ = fetch(storefront, "/cart.html", user=user)
+        
+        assert status == 302
+        assert headers["Location"] == "/?from=/cart.html"
+        
+    def test_unknown_path_and_head(self, storefront):
+        """Test 404s and HEAD sizing of static assets."""
+        assert fetch(storefront, "/missing.html")[0] == 404
+        status, headers, body = fetch(storefront, "/static/style.css", method="HEAD")
+        assert (status, body) == (200, "")
+        assert int(headers["Content-Length"]) > 0
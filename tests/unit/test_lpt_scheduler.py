@@ -0,0 +1,222 @@
+"""Duration store, LPT planning and xdist scheduler tests."""
+from types import SimpleNamespace
+import pytest
+from utils.lpt_scheduler import (
+    CACHE_KEY,
+    DEFAULT_DURATION,
+    DEFAULT_GROUP_COST,
+    DurationStore,
+    LPTScheduling,
+    group_for_item,
+    plan_lpt,
+)
+
+class FakeCache:
+    """Stand-in for pytest's config.cache."""
+    
+    def __init__(self, data=None):
+        self.data = {CACHE_KEY: data} if data is not None else {}
+        
+    def get(self, key, default):
+        return self.data.get(key, default)
+        
+    def set(self, key, value):
+        self.data[key] = value
+
+class FakeNode:
+    """Stand-in for an xdist WorkerController."""
+    
+    def __init__(self, name):
+        self.gateway = SimpleNamespace(id=name)
+        self.shutting_down = False
+        self.sent = []
+        
+    def send_runtest_some(self, indices):
+        self.sent.extend(indices)
+        
+    def shutdown(self):
+        self.shutting_down = True
+
+def store(tests, groups=None):
+    """DurationStore over a cache holding nodeid -> (seconds, group) and group costs."""
+    return DurationStore(FakeCache({"tests": {nodeid: list(entry) for nodeid, entry in tests.items()},
+                                    "groups": dict(groups or {})}))
+
+def item(fixtures=(), engine=None):
+    """Collected test item stand-in, optionally parametrized over engine."""
+    options = {"--selenium-browser": "firefox"}
+    return SimpleNamespace(
+        fixturenames=["request", *fixtures],
+        config=SimpleNamespace(getoption=lambda name, default=None: options.get(name, default)),
+        **({"callspec": SimpleNamespace(params={"engine": engine})} if engine else {}),
+    )
+
+class TestGroupForItem:
+    """Expensive-fixture group of collected tests."""
+    
+    def test_group_from_fixtures(self):
+        """Test that engine-specific tests are grouped by their browser fixture."""
+        assert group_for_item(item(["selenium_driver"])) == "selenium:firefox"
+        assert group_for_item(item(["playwright_browser", "page"])) == "playwright:chromium"
+        assert group_for_item(item()) == "none"
+        
+    def test_group_from_engine_parameter(self):
+        """Test that engine-parametrized tests are grouped by the engine they run on."""
+        assert group_for_item(item(["engine_driver"], engine="selenium")) == "selenium:firefox"
+        assert group_for_item(item(["engine_driver"], engine="playwright")) == "playwright:chromium"
+
+class TestDurationStore:
+    """Smoothed durations and group launch costs."""
+    
+    def test_defaults_without_history(self):
+        """Test that unknown tests and groups get the default estimates."""
+        empty = DurationStore(None)
+        
+        assert empty.duration("tests/ui_selenium/test_login.py::test_x") == DEFAULT_DURATION
+        assert empty.group("tests/ui_selenium/test_login.py::test_x") == "selenium"
+        assert empty.group("tests/unit/test_helpers.py::test_x") == "none"
+        assert empty.group_cost("playwright:chromium") == DEFAULT_GROUP_COST
+        
+    def test_first_measurement_is_stored_as_is(self):
+        """Test that a test's first duration is stored unsmoothed with its group."""
+        durations = DurationStore(FakeCache())
+        
+        durations.update({"t::a": 3.0}, {"t::a": "selenium:chrome"}, {})
+        
+        assert durations.duration("t::a") == 3.0
+        assert durations.group("t::a") == "selenium:chrome"
+        
+    def test_update_smooths_with_previous_run(self):
+        """Test that later runs are averaged with the stored duration."""
+        durations = store({"t::a": (4.0, "none")})
+        
+        durations.update({"t::a": 2.0}, {"t::a": "none"}, {})
+        
+        assert durations.duration("t::a") == 3.0
+        
+    def test_update_persists_to_cache(self):
+        """Test that a new store over the same cache sees the update."""
+        cache = FakeCache()
+        DurationStore(cache).update({"t::a": 1.5}, {"t::a": "none"}, {"none": [0.1]})
+        
+        reloaded = DurationStore(cache)
+        
+        assert reloaded.duration("t::a") == 1.5
+        assert reloaded.group_cost("none") == 0.1
+        
+    def test_group_launch_is_slowest_setup_above_median(self):
+        """Test that the launch cost is the first setup's excess over a typical one."""
+        durations = DurationStore(FakeCache())
+        
+        durations.update({}, {}, {"selenium:chrome": [0.1, 4.1, 0.2, 0.1]})
+        
+        assert durations.group_cost("selenium:chrome") == pytest.approx(3.95)
+        
+    def test_single_setup_is_the_launch(self):
+        """Test that a group with one test is charged its whole setup."""
+        durations = DurationStore(FakeCache())
+        
+        durations.update({}, {}, {"playwright:chromium": [2.5]})
+        
+        assert durations.group_cost("playwright:chromium") == 2.5
+        
+    def test_group_launch_is_smoothed(self):
+        """Test that launch costs are averaged with the stored cost."""
+        durations = store({}, {"playwright:chromium": 3.0})
+        
+        durations.update({}, {}, {"playwright:chromium": [1.0]})
+        
+        assert durations.group_cost("playwright:chromium") == 2.0
+
+class TestPlanLPT:
+    """Longest-processing-time-first assignment."""
+    
+    def test_longest_tests_first(self):
+        """Test the LPT assignment, loads and makespan against in-order greedy."""
+        nodeids = ["t::a", "t::b", "t::c", "t::d", "t::e"]
+        durations = store({nodeid: (seconds, "none") for nodeid, seconds
+                           in zip(nodeids, (3.0, 3.0, 3.0, 4.0, 5.0))}, {"none": 0.0})
+        
+        plan = plan_lpt(nodeids, durations, 2)
+        
+        # 5 and 4 start the workers, the 3s go to whichever finishes first
+        assert plan.assignments == [[1, 4], [0, 2, 3]]
+        assert plan.loads == [8.0, 10.0]
+        assert plan.makespan == 10.0
+        # In collection order the 5s test lands last on a worker already at 6s
+        assert plan.baseline_makespan == 11.0
+        
+    def test_group_launch_keeps_tests_together(self):
+        """Test that a second launch of a group is avoided when it does not pay off."""
+        nodeids = ["t::selenium_a", "t::selenium_b", "t::slow"]
+        durations = store({"t::selenium_a": (1.0, "selenium:chrome"),
+                           "t::selenium_b": (1.0, "selenium:chrome"),
+                           "t::slow": (4.0, "none")},
+                          {"selenium:chrome": 3.0, "none": 0.0})
+        
+        plan = plan_lpt(nodeids, durations, 2)
+        
+        assert plan.assignments == [[2], [0, 1]]
+        assert plan.loads == [4.0, 5.0]
+        
+    def test_group_launch_charged_once_per_worker(self):
+        """Test that every worker running a group pays its launch cost."""
+        nodeids = ["t::a", "t::b"]
+        durations = store({"t::a": (5.0, "selenium:chrome"), "t::b": (5.0, "selenium:chrome")},
+                          {"selenium:chrome": 2.0})
+        
+        plan = plan_lpt(nodeids, durations, 2)
+        
+        assert plan.assignments == [[0], [1]]
+        assert plan.loads == [7.0, 7.0]
+        
+    def test_more_workers_than_tests(self):
+        """Test that idle workers get empty shares."""
+        plan = plan_lpt(["t::a"], store({"t::a": (1.0, "none")}, {"none": 0.0}), 3)
+        
+        assert plan.assignments == [[0], [], []]
+        assert plan.makespan == 1.0
+
+class TestLPTScheduling:
+    """Up-front distribution of the plan to xdist workers."""
+    
+    def scheduler(self, cache, nodes):
+        config = SimpleNamespace(
+            cache=cache,
+            getvalue=lambda name: [f"{len(nodes)}*popen"],
+            getoption=lambda name: None,
+        )
+        scheduler = LPTScheduling(config, log=SimpleNamespace(loadsched=lambda *args: None))
+        for node in nodes:
+            scheduler.add_node(node)
+        return scheduler
+        
+    def test_sends_each_worker_its_share(self):
+        """Test that every worker receives its planned share once and is shut down."""
+        nodeids = ["t::a", "t::b", "t::c", "t::d", "t::e"]
+        cache = FakeCache({"tests": {nodeid: [seconds, "none"] for nodeid, seconds
+                                     in zip(nodeids, (3.0, 3.0, 3.0, 4.0, 5.0))},
+                           "groups": {"none": 0.0}})
+        nodes = [FakeNode("gw0"), FakeNode("gw1")]
+        scheduler = self.scheduler(cache, nodes)
+        for node in nodes:
+            scheduler.add_node_collection(node, nodeids)
+            
+        scheduler.schedule()
+        
+        assert [node.sent for node in nodes] == [[1, 4], [0, 2, 3]]
+        assert [scheduler.node2pending[node] for node in nodes] == [[1, 4], [0, 2, 3]]
+        assert all(node.shutting_down for node in nodes)
+        assert scheduler.plan.makespan == 10.0
+        
+    def test_idle_worker_gets_nothing(self):
+        """Test that a worker without a share is shut down without tests."""
+        nodes = [FakeNode("gw0"), FakeNode("gw1")]
+        scheduler = self.scheduler(FakeCache(), nodes)
+        for node in nodes:
+            scheduler.add_node_collection(node, ["t::only"])
+            
+        scheduler.schedule()
+        
+        assert [node.sent for node in nodes] == [[0], []]
+        assert all(node.shutting_down for node in nodes)
@@ -0,0 +1,131 @@
+"""Resource blocking policy tests: presets, first-party exclusion and URL globs."""
+import json
+import re
+import pytest
+from utils.resource_blocking import BlockingPolicy
+
+STORE = "storefront.test"
+HOME = f"https://{STORE}/inventory.html"
+
+def policy(preset="none", patterns=()):
+    return BlockingPolicy(preset, patterns, first_party_host=STORE)
+
+def pac_patterns(script):
+    """Regular expressions embedded in a PAC script, compiled as Python regexes."""
+    patterns = json.loads(re.search(r"var patterns = (\[.*?\]);", script).group(1))
+    return [re.compile(pattern) for pattern in patterns]
+
+class TestPresets:
+    """Preset matching by resource type and origin."""
+    
+    def test_unknown_preset_rejected(self):
+        """Test that a misspelt preset fails instead of blocking nothing."""
+        with pytest.raises(ValueError, match="Unknown resource blocking preset"):
+            policy("images")
+            
+    def test_none_blocks_nothing(self):
+        """Test that the default preset lets every request through."""
+        none = policy()
+        
+        assert not none.enabled
+        assert not none.should_block(f"https://{STORE}/logo.png", "image")
+        assert not none.should_block("https://cdn.example/app.js", "script")
+        
+    @pytest.mark.parametrize("url, resource_type", [
+        (f"https://{STORE}/static/media/bolt.png", "image"),
+        (f"https://{STORE}/fonts/dm.woff2", None),
+        (f"https://{STORE}/intro.MP4", None),
+    ])
+    def test_media_blocks_media_types(self, url, resource_type):
+        """Test that media blocks images, fonts and video by type or URL suffix."""
+        assert policy("media").should_block(url, resource_type)
+        
+    def test_media_keeps_documents_and_scripts(self):
+        """Test that media leaves pages, scripts and third parties alone."""
+        media = policy("media")
+        
+        assert not media.should_block(HOME, "document")
+        assert not media.should_block("https://cdn.example/app.js", "script")
+        
+    def test_type_reported_by_browser_wins_over_suffix(self):
+        """Test that the reported resource type is used before the URL suffix."""
+        assert not policy("media").should_block(f"https://{STORE}/image.png", "document")
+        
+    def test_third_party_blocks_other_hosts(self):
+        """Test that third-party blocks every host except the storefront."""
+        third_party = policy("third-party")
+        
+        assert third_party.should_block("https://www.google-analytics.com/collect", "xhr")
+        assert third_party.should_block(f"https://cdn.{STORE}/app.js", "script")
+        
+    def test_third_party_keeps_first_party(self):
+        """Test that first-party requests are never blocked by third-party."""
+        third_party = policy("third-party")
+        
+        assert not third_party.should_block(HOME, "document")
+        assert not third_party.should_block(f"http://{STORE}:8080/logo.png", "image")
+        
+    def test_lean_combines_media_and_third_party(self):
+        """Test that lean blocks first-party media and all third parties."""
+        lean = policy("lean")
+        
+        assert lean.should_block(f"https://{STORE}/logo.png", "image")
+        assert lean.should_block("https://cdn.example/app.js", "script")
+        assert not lean.should_block(HOME, "document")
+        
+    def test_non_http_urls_pass(self):
+        """Test that data: and blob: URLs are never blocked."""
+        lean = policy("lean", ["*"])
+        
+        assert not lean.should_block("data:image/png;base64,AAAA", "image")
+        assert not lean.should_block("blob:https://cdn.example/1234", "media")
+
+class TestPatterns:
+    """URL globs from BLOCK_PATTERNS."""
+    
+    def test_star_matches_any_characters(self):
+        """Test that * matches across path segments."""
+        analytics = policy(patterns=["*analytics*"])
+        
+        assert analytics.enabled
+        assert analytics.should_block("https://www.google-analytics.com/g/collect?v=2")
+        assert not analytics.should_block(HOME)
+        
+    @pytest.mark.parametrize("url", [
+        "https://cdn.example/app.js?v=1",
+        "https://cdn.example/appXjs",
+        "https://cdn.example/ap.js",
+    ])
+    def test_other_characters_are_literal(self, url):
+        """Test that ?, [, ] and . in a pattern match only themselves."""
+        literal = policy(patterns=["https://cdn.example/app.js?v=[1]", "*/ap?.js"])
+        
+        assert not literal.should_block(url)
+        
+    def test_literal_metacharacters_match(self):
+        """Test that a pattern with regex metacharacters matches its own URL."""
+        literal = policy(patterns=["https://cdn.example/app.js?v=[1]+(2)"])
+        
+        assert literal.should_block("https://cdn.example/app.js?v=[1]+(2)")
+        
+    def test_pac_script_matches_like_should_block(self):
+        """Test that the Firefox PAC script uses the same glob semantics."""
+        patterns = ["*analytics*", "https://cdn.example/app.js?v=[1]"]
+        regexes = pac_patterns(policy(patterns=patterns)._pac_script())
+        
+        def pac_blocks(url):
+            return any(regex.fullmatch(url) for regex in regexes)
+            
+        for url in ("https://www.google-analytics.com/collect",
+                    "https://cdn.example/app.js?v=[1]",
+                    "https://cdn.example/app.js?v=1",
+                    "https://cdn.example/appXjs?v=[1]",
+                    HOME):
+            assert pac_blocks(url) == policy(patterns=patterns).should_block(url), url
+            
+    def test_pac_script_excludes_first_party(self):
+        """Test that the PAC script compares hosts against the storefront."""
+        script = policy("third-party")._pac_script()
+        
+        assert f'host !== "{STORE}"' in script
+        assert "if (true &&" in script
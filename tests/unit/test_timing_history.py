@@ -0,0 +1,164 @@
+"""Timing history tests: phase recording, trend splits and slowdown detection."""
+from types import SimpleNamespace
+import pytest
+from utils.timing_history import PhaseRecorder, TimingStore, TimingTrend
+
+TEST = "tests/ui_selenium/test_login.py::test_valid"
+OTHER = "tests/ui_selenium/test_login.py::test_locked"
+
+def report(when, outcome="passed", duration=1.0, nodeid=TEST, **properties):
+    return SimpleNamespace(nodeid=nodeid, when=when, outcome=outcome, duration=duration,
+                           user_properties=list({"timing_browser": "chrome", **properties}.items()))
+
+def trend(*points, phase="call"):
+    """TimingTrend over (commit, seconds) points, oldest first."""
+    result = TimingTrend((TEST, "chrome", "3.11", phase))
+    result.points = list(points)
+    return result
+
+def session(store, commit, started, call=1.0, call_outcome="passed", nodeid=TEST):
+    """Record one run of nodeid with 0.1s setup/teardown and the given call."""
+    rows = [(nodeid, "chrome", "setup", "passed", 0.1),
+            (nodeid, "chrome", "call", call_outcome, call),
+            (nodeid, "chrome", "teardown", "passed", 0.1),
+            (nodeid, "chrome", "fixture:selenium_driver", "passed", 0.05)]
+    store.record(rows, commit=commit, python="3.11", started=started)
+
+class TestPhaseRecorder:
+    """Rows collected from phase reports."""
+    
+    def test_one_row_per_phase_and_fixture(self):
+        """Test that setup reports also record their fixtures' setup time."""
+        recorder = PhaseRecorder()
+        
+        recorder.observe(report("setup", duration=0.5, fixture_timings={"selenium_driver": 0.4}))
+        recorder.observe(report("call", duration=2.0))
+        recorder.observe(report("teardown", duration=0.1))
+        
+        assert sorted(recorder.rows) == sorted([
+            (TEST, "chrome", "setup", "passed", 0.5),
+            (TEST, "chrome", "fixture:selenium_driver", "passed", 0.4),
+            (TEST, "chrome", "call", "passed", 2.0),
+            (TEST, "chrome", "teardown", "passed", 0.1),
+        ])
+        
+    def test_rerun_replaces_earlier_attempt(self):
+        """Test that a rerun's phases replace the failed attempt's rows."""
+        recorder = PhaseRecorder()
+        
+        recorder.observe(report("setup", duration=0.5))
+        recorder.observe(report("call", outcome="failed", duration=9.0))
+        recorder.observe(report("setup", duration=0.3))
+        recorder.observe(report("call", duration=2.0))
+        
+        assert sorted(recorder.rows) == [
+            (TEST, "chrome", "call", "passed", 2.0),
+            (TEST, "chrome", "setup", "passed", 0.3),
+        ]
+        
+    def test_browser_defaults_to_none(self):
+        """Test that tests without a timing browser are recorded under "none"."""
+        recorder = PhaseRecorder()
+        
+        recorder.observe(SimpleNamespace(nodeid=TEST, when="call", outcome="passed",
+                                         duration=0.2, user_properties=[]))
+        
+        assert recorder.rows == [(TEST, "none", "call", "passed", 0.2)]
+
+class TestTimingTrend:
+    """Splitting a trend at the newest commit and detecting slowdowns."""
+    
+    def test_split_at_newest_commit(self):
+        """Test that every run on the newest commit is compared with the runs before it."""
+        runs = trend(("a", 1.0), ("b", 1.1), ("b", 0.9), ("c", 2.0), ("c", 2.2))
+        
+        assert runs.latest_commit == "c"
+        assert runs.split(window=10) == ([2.0, 2.2], [1.0, 1.1, 0.9])
+        
+    def test_window_limits_baseline(self):
+        """Test that only the last `window` runs before the newest commit are the baseline."""
+        runs = trend(("a", 5.0), ("a", 5.0), ("b", 1.0), ("b", 1.2), ("c", 1.1))
+        
+        assert runs.split(window=2) == ([1.1], [1.0, 1.2])
+        
+    def test_single_commit_has_no_change(self):
+        """Test that a trend with one commit has no baseline to compare with."""
+        runs = trend(("a", 1.0), ("a", 1.5))
+        
+        assert runs.split(window=10) == ([1.0, 1.5], [])
+        assert runs.change(window=10) is None
+        assert not runs.slowed_down(threshold=0.0, min_seconds=0.0, window=10, min_runs=0)
+        
+    def test_slowed_down_beyond_threshold(self):
+        """Test that a median above threshold and min_seconds is a slowdown."""
+        runs = trend(("a", 1.0), ("a", 1.0), ("a", 1.0), ("b", 1.5))
+        
+        assert runs.change(window=10) == (1.5, 1.0)
+        assert runs.slowed_down(threshold=0.2, min_seconds=0.1, window=10, min_runs=3)
+        
+    def test_small_or_absolute_tiny_changes_pass(self):
+        """Test that changes within threshold or below min_seconds are not slowdowns."""
+        runs = trend(("a", 1.0), ("a", 1.0), ("a", 1.0), ("b", 1.15))
+        tiny = trend(("a", 0.01), ("a", 0.01), ("a", 0.01), ("b", 0.02))
+        
+        assert not runs.slowed_down(threshold=0.2, min_seconds=0.0, window=10, min_runs=3)
+        assert not tiny.slowed_down(threshold=0.2, min_seconds=0.05, window=10, min_runs=3)
+        
+    def test_min_runs_required_in_baseline(self):
+        """Test that too few earlier runs never report a slowdown."""
+        runs = trend(("a", 1.0), ("a", 1.0), ("b", 3.0))
+        
+        assert not runs.slowed_down(threshold=0.2, min_seconds=0.0, window=10, min_runs=3)
+        assert runs.slowed_down(threshold=0.2, min_seconds=0.0, window=10, min_runs=2)
+
+class TestTimingStore:
+    """SQLite history and the trends read back from it."""
+    
+    @pytest.fixture
+    def store(self, tmp_path):
+        return TimingStore(str(tmp_path / "timings.sqlite"))
+        
+    def test_missing_database_has_no_trends(self, store):
+        """Test that reading before any run neither fails nor creates the file."""
+        assert store.trends() == {}
+        assert not store.path.exists()
+        
+    def test_trends_per_phase_in_run_order(self, store):
+        """Test that runs come back oldest first per test, browser, Python and phase."""
+        session(store, "b", started=2, call=1.2)
+        session(store, "a", started=1, call=1.0)
+        
+        trends = store.trends()
+        
+        call = trends[(TEST, "chrome", "3.11", "call")]
+        assert call.points == [("a", 1.0), ("b", 1.2)]
+        assert (TEST, "chrome", "3.11", "fixture:selenium_driver") in trends
+        
+    def test_total_only_for_fully_passing_runs(self, store):
+        """Test that "total" sums setup, call and teardown of runs where all passed."""
+        session(store, "a", started=1, call=1.0)
+        session(store, "b", started=2, call=5.0, call_outcome="failed")
+        
+        trends = store.trends()
+        
+        assert trends[(TEST, "chrome", "3.11", "call")].points == [("a", 1.0)]
+        total = trends[(TEST, "chrome", "3.11", "total")]
+        assert total.points == [("a", pytest.approx(1.2))]
+        
+    def test_trends_filtered_by_nodeid(self, store):
+        """Test that only the requested tests are read."""
+        session(store, "a", started=1)
+        session(store, "a", started=1, nodeid=OTHER)
+        
+        assert {key[0] for key in store.trends([OTHER])} == {OTHER}
+        
+    def test_slowdowns_exclude_totals(self, store):
+        """Test that a slower call is reported once, as a phase and not as a total."""
+        for started in range(3):
+            session(store, "a", started=started, call=1.0)
+        session(store, "b", started=3, call=2.0)
+        
+        slowdowns = store.slowdowns(threshold=0.2, min_seconds=0.1, window=10)
+        
+        assert [(found.phase, found.latest_commit) for found in slowdowns] == [("call", "b")]
+        assert slowdowns[0].describe(window=10).startswith(f"{TEST} [call] chrome py3.11")
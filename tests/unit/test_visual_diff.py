@@ -0,0 +1,183 @@
+"""Visual regression tests: pixel diff, ignore regions and baseline storage."""
+import json
+import numpy as np
+import pytest
+from PIL import Image
+from utils.visual_diff import (
+    BaselineStore,
+    VisualComparer,
+    _compare_frame,
+    dhash,
+    frame_name,
+    latest_frames,
+)
+
+WIDTH, HEIGHT = 40, 30
+
+def frame(path, changes=(), size=(WIDTH, HEIGHT), **save_options):
+    """Write a grey frame with (x, y, rgb) pixels changed and return its path."""
+    pixels = np.full((size[1], size[0], 3), 128, dtype=np.uint8)
+    for x, y, rgb in changes:
+        pixels[y, x] = rgb
+    Image.fromarray(pixels).save(path, **save_options)
+    return path
+
+def job(tmp_path, candidate, baseline, regions=(), tolerance=16, max_ratio=0.0):
+    with Image.open(baseline) as image:
+        baseline_hash = f"{dhash(image):016x}"
+    return {"name": "checkout", "candidate": str(candidate), "baseline": str(baseline),
+            "baseline_hash": baseline_hash, "regions": list(regions),
+            "tolerance": tolerance, "max_ratio": max_ratio, "diff_dir": str(tmp_path / "diffs")}
+
+class TestCompareFrame:
+    """Pixel diff of one frame against its baseline."""
+    
+    def test_reencoded_identical_pixels_pass(self, tmp_path):
+        """Test that a frame differing only in encoding passes."""
+        baseline = frame(tmp_path / "baseline.png")
+        candidate = frame(tmp_path / "candidate.png", compress_level=0)
+        
+        result = _compare_frame(job(tmp_path, candidate, baseline))
+        
+        assert (result.status, result.diff_ratio, result.hash_distance) == ("passed", 0.0, 0)
+        
+    def test_one_changed_pixel_fails(self, tmp_path):
+        """Test that a single pixel beyond the tolerance fails the frame by default."""
+        baseline = frame(tmp_path / "baseline.png")
+        candidate = frame(tmp_path / "candidate.png", [(7, 5, (128, 128, 200))])
+        
+        result = _compare_frame(job(tmp_path, candidate, baseline))
+        
+        assert result.status == "failed"
+        assert result.diff_ratio == pytest.approx(1 / (WIDTH * HEIGHT))
+        assert result.bbox == (7, 5, 1, 1)
+        with Image.open(result.diff_path) as diff:
+            assert diff.getpixel((7, 5)) == (255, 0, 0)
+            assert diff.getpixel((0, 0)) != (255, 0, 0)
+            
+    def test_change_within_tolerance_passes(self, tmp_path):
+        """Test that per-channel differences up to the tolerance count as equal."""
+        baseline = frame(tmp_path / "baseline.png")
+        candidate = frame(tmp_path / "candidate.png", [(7, 5, (144, 112, 128))])
+        
+        assert _compare_frame(job(tmp_path, candidate, baseline, tolerance=16)).status == "passed"
+        assert _compare_frame(job(tmp_path, candidate, baseline, tolerance=15)).status == "failed"
+        
+    def test_max_ratio(self, tmp_path):
+        """Test that an explicit ratio lets that share of pixels change."""
+        baseline = frame(tmp_path / "baseline.png")
+        candidate = frame(tmp_path / "candidate.png", [(x, 0, (0, 0, 0)) for x in range(3)])
+        ratio = 3 / (WIDTH * HEIGHT)
+        
+        assert _compare_frame(job(tmp_path, candidate, baseline, max_ratio=ratio)).status == "passed"
+        assert _compare_frame(job(tmp_path, candidate, baseline, max_ratio=ratio / 2)).status == "failed"
+        
+    def test_resized_frame(self, tmp_path):
+        """Test that a frame of another size is reported, not diffed."""
+        baseline = frame(tmp_path / "baseline.png")
+        candidate = frame(tmp_path / "candidate.png", size=(WIDTH, HEIGHT + 1))
+        
+        result = _compare_frame(job(tmp_path, candidate, baseline))
+        
+        assert (result.status, result.diff_ratio) == ("resized", 1.0)
+
+class TestIgnoreRegions:
+    """Rectangles left out of the pixel diff."""
+    
+    def test_change_inside_region_passes(self, tmp_path):
+        """Test that changes inside an ignore region do not count."""
+        baseline = frame(tmp_path / "baseline.png")
+        candidate = frame(tmp_path / "candidate.png", [(11, 21, (0, 0, 0)), (14, 24, (0, 0, 0))])
+        
+        result = _compare_frame(job(tmp_path, candidate, baseline, regions=[(10, 20, 5, 5)]))
+        
+        assert (result.status, result.diff_ratio) == ("passed", 0.0)
+        
+    def test_change_outside_region_fails(self, tmp_path):
+        """Test that only the ignored pixels are excluded, from both counts."""
+        baseline = frame(tmp_path / "baseline.png")
+        candidate = frame(tmp_path / "candidate.png", [(11, 21, (0, 0, 0)), (15, 21, (0, 0, 0))])
+        
+        result = _compare_frame(job(tmp_path, candidate, baseline, regions=[(10, 20, 5, 5)]))
+        
+        assert result.status == "failed"
+        assert result.bbox == (15, 21, 1, 1)
+        assert result.diff_ratio == pytest.approx(1 / (WIDTH * HEIGHT - 25))
+        
+    def test_region_clipped_to_frame(self, tmp_path):
+        """Test that a region reaching past the frame edges is clipped."""
+        baseline = frame(tmp_path / "baseline.png")
+        candidate = frame(tmp_path / "candidate.png", [(0, 0, (0, 0, 0)), (WIDTH - 1, 3, (0, 0, 0))])
+        regions = [(-5, -5, 10, 10), (WIDTH - 2, 0, 50, 5)]
+        
+        result = _compare_frame(job(tmp_path, candidate, baseline, regions=regions))
+        
+        assert (result.status, result.diff_ratio) == ("passed", 0.0)
+
+class TestBaselineStore:
+    """Baseline files and their manifest."""
+    
+    def test_accept_writes_file_and_manifest(self, tmp_path):
+        """Test that an accepted frame is copied and described in the manifest."""
+        source = frame(tmp_path / "checkout_20240101_120000.png")
+        store = BaselineStore(str(tmp_path / "baselines"))
+        
+        store.accept("checkout", source)
+        store.save()
+        
+        entry = json.loads((tmp_path / "baselines" / "manifest.json").read_text())["checkout"]
+        assert entry["file"] == "checkout.png"
+        assert entry["size"] == [WIDTH, HEIGHT]
+        assert (tmp_path / "baselines" / "checkout.png").read_bytes() == source.read_bytes()
+        assert BaselineStore(str(tmp_path / "baselines")).entry("checkout") == entry
+        
+    def test_accept_replaces_old_baseline(self, tmp_path):
+        """Test that accepting a frame in another format removes the old file."""
+        store = BaselineStore(str(tmp_path / "baselines"))
+        store.accept("checkout", frame(tmp_path / "old.png"))
+        
+        store.accept("checkout", frame(tmp_path / "new.webp", lossless=True))
+        store.save()
+        
+        assert sorted(path.name for path in store.directory.iterdir()) == ["checkout.webp", "manifest.json"]
+        assert store.path("checkout") == store.directory / "checkout.webp"
+        
+    def test_hand_copied_baseline_is_described(self, tmp_path):
+        """Test that a baseline missing from the manifest is added on first use."""
+        directory = tmp_path / "baselines"
+        directory.mkdir()
+        frame(directory / "checkout.png")
+        store = BaselineStore(str(directory))
+        
+        assert store.entry("checkout")["file"] == "checkout.png"
+        store.save()
+        assert "checkout" in json.loads((directory / "manifest.json").read_text())
+
+class TestVisualComparer:
+    """Frame selection and comparison across a directory."""
+    
+    def test_frame_names_and_latest_frames(self, tmp_path):
+        """Test that timestamps are stripped, the newest capture wins and diffs are skipped."""
+        frame(tmp_path / "checkout_20240101_120000.png")
+        newest = frame(tmp_path / "checkout_20240102_090000.png")
+        frame(tmp_path / "checkout.diff.png")
+        
+        assert frame_name(newest) == "checkout"
+        assert latest_frames(tmp_path) == {"checkout": newest}
+        
+    def test_compare(self, tmp_path):
+        """Test identical, failed and new frames in one run."""
+        store = BaselineStore(str(tmp_path / "baselines"))
+        store.accept("same", frame(tmp_path / "base_same.png"))
+        store.accept("changed", frame(tmp_path / "base_changed.png"))
+        store.save()
+        frames = {
+            "same": frame(tmp_path / "same.png"),
+            "changed": frame(tmp_path / "changed.png", [(1, 1, (0, 0, 0))]),
+            "added": frame(tmp_path / "added.png"),
+        }
+        comparer = VisualComparer(store, diff_dir=str(tmp_path / "diffs"), ignore_rules={}, workers=1)
+        
+        results = {result.name: result.status for result in comparer.compare(frames)}
+        
+        assert results == {"same": "identical", "changed": "failed", "added": "new"}
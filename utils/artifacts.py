@@ -0,0 +1,131 @@
+"""Retain-on-failure debugging artifacts for Playwright and Selenium.
+
+In ``retain-on-failure`` mode every Playwright context records a trace
+(screenshots + DOM snapshots) and a video, but both are only written to
+``ARTIFACTS_DIR`` when the test fails; passing tests discard them. Selenium
+drivers keep a ring buffer of the last N action screenshots and DOM
+snapshots in memory and dump it on failure. ``on`` keeps everything and
+``off``, the default, records nothing.
+"""
+import base64
+import re
+import tempfile
+import time
+from collections import deque
+from pathlib import Path
+from typing import List
+
+from selenium.common.exceptions import WebDriverException
+from selenium.webdriver.support.events import AbstractEventListener
+
+from utils.config import config
+
+MODES = ("off", "retain-on-failure", "on")
+
+# Playwright can only record video to disk; unkept videos are deleted here
+VIDEO_SPOOL_DIR = Path(tempfile.gettempdir()) / "playwright-video-spool"
+
+
+def artifact_dir(test_name: str) -> Path:
+    """Directory holding the artifacts of one test (not created)."""
+    safe_name = re.sub(r"[^A-Za-z0-9_.-]+", "_", test_name).strip("_")
+    return Path(config.ARTIFACTS_DIR) / safe_name
+
+
+def should_keep(mode: str, failed: bool) -> bool:
+    """Whether a test's artifacts are written under mode."""
+    return mode == "on" or (mode == "retain-on-failure" and failed)
+
+
+class PlaywrightArtifacts:
+    """Trace and video recording for one BrowserContext."""
+
+    def __init__(self, context, mode: str):
+        self.context = context
+        self.mode = mode
+        context.tracing.start(screenshots=True, snapshots=True, sources=False)
+
+    @staticmethod
+    def context_options() -> dict:
+        """Extra new_context() keyword arguments enabling video."""
+        return {"record_video_dir": str(VIDEO_SPOOL_DIR)}
+
+    def close(self, test_name: str, failed: bool) -> List[str]:
+        """Close the context, keeping trace and videos only if required.
+
+        Returns:
+            Paths of the artifacts written
+        """
+        keep = should_keep(self.mode, failed)
+        directory = artifact_dir(test_name)
+        videos = [page.video for page in self.context.pages if page.video]
+        written = []
+        if keep:
+            directory.mkdir(parents=True, exist_ok=True)
+            trace_path = directory / "trace.zip"
+            self.context.tracing.stop(path=str(trace_path))
+            written.append(str(trace_path))
+        else:
+            self.context.tracing.stop()
+
+        # Videos are finalized when the context closes
+        self.context.close()
+        for index, video in enumerate(videos):
+            if keep:
+                video_path = directory / f"video-{index}.webm"
+                video.save_as(str(video_path))
+                written.append(str(video_path))
+            video.delete()
+        return written
+
+
+class SeleniumFlightRecorder(AbstractEventListener):
+    """Ring buffer of the last actions' screenshots and DOM snapshots.
+
+    Attach with ``EventFiringWebDriver(driver, recorder)``. Frames stay in
+    memory (as the base64 the driver returns) until dump() is called.
+    """
+
+    def __init__(self, size: int = None):
+        self.frames = deque(maxlen=size if size is not None else config.SELENIUM_RING_BUFFER)
+
+    def after_navigate_to(self, url, driver):
+        self._record(driver, "navigate")
+
+    def after_click(self, element, driver):
+        self._record(driver, "click")
+
+    def after_change_value_of(self, element, driver):
+        self._record(driver, "type")
+
+    def after_navigate_back(self, driver):
+        self._record(driver, "back")
+
+    def _record(self, driver, action: str):
+        """Snapshot the current page; never let recording break the test."""
+        if self.frames.maxlen == 0:
+            return
+        try:
+            frame = (time.time(), action, driver.current_url,
+                     driver.get_screenshot_as_base64(), driver.page_source)
+        except WebDriverException:
+            return
+        self.frames.append(frame)
+
+    def dump(self, test_name: str) -> List[str]:
+        """Write buffered frames oldest first and return their paths."""
+        if not self.frames:
+            return []
+        directory = artifact_dir(test_name)
+        directory.mkdir(parents=True, exist_ok=True)
+        written = []
+        for index, (timestamp, action, url, screenshot, source) in enumerate(self.frames):
+            stem = directory / f"{index:02d}-{action}"
+            Path(f"{stem}.png").write_bytes(base64.b64decode(screenshot))
+            Path(f"{stem}.html").write_text(
+                f"<!-- {url} at {time.strftime('%H:%M:%S', time.localtime(timestamp))} -->\n{source}"
+            )
+            written.extend([f"{stem}.png", f"{stem}.html"])
+        self.frames.clear()
+        return written
+
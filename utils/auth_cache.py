@@ -0,0 +1,201 @@
+"""Cached authenticated sessions shared by the Selenium and Playwright fixtures.
+
+Each user logs in through the UI once; the resulting cookies and localStorage
+are stored on disk in Playwright's ``storage_state`` format, one file per
+origin and user. Playwright contexts are created straight from that file and
+Selenium drivers get the same cookies and storage injected, so tests start on
+``/inventory.html`` without replaying the login form. Files are replaced
+atomically, which lets xdist workers share them.
+"""
+import json
+import os
+import re
+import tempfile
+import time
+from pathlib import Path
+from typing import Dict, Optional
+from urllib.parse import urlsplit
+
+from utils.config import config
+
+_READ_LOCAL_STORAGE_SCRIPT = """
+var items = [];
+for (var i = 0; i < window.localStorage.length; i++) {
+    var key = window.localStorage.key(i);
+    items.push({name: key, value: window.localStorage.getItem(key)});
+}
+return items;
+"""
+
+_WRITE_LOCAL_STORAGE_SCRIPT = """
+var items = arguments[0];
+for (var i = 0; i < items.length; i++) {
+    window.localStorage.setItem(items[i].name, items[i].value);
+}
+"""
+
+
+class AuthCache:
+    """Per-user login state cached on disk in storage_state format."""
+
+    def __init__(self, state_dir: str = None, max_age: int = None):
+        self.state_dir = Path(state_dir or config.AUTH_STATE_DIR)
+        self.max_age = max_age if max_age is not None else config.AUTH_STATE_MAX_AGE
+        self._memory: Dict[str, dict] = {}
+        self.hits = 0
+        self.misses = 0
+
+    # ---------- storage ----------
+
+    def state_path(self, user: str) -> Path:
+        """File holding the cached state for user on the current origin."""
+        origin = urlsplit(config.BASE_URL).netloc or "default"
+        safe_origin = re.sub(r"[^A-Za-z0-9_.-]", "_", origin)
+        return self.state_dir / f"{safe_origin}__{user}.json"
+
+    def load(self, user: str) -> Optional[dict]:
+        """Return the cached state for user if it is still fresh."""
+        path = self.state_path(user)
+        state = self._memory.get(str(path))
+        if state is None:
+            try:
+                if time.time() - path.stat().st_mtime > self.max_age:
+                    return None
+                state = json.loads(path.read_text())
+            except (OSError, ValueError):
+                return None
+        if not self._is_fresh(state):
+            return None
+        self._memory[str(path)] = state
+        return state
+
+    def save(self, user: str, state: dict):
+        """Persist state for user atomically."""
+        path = self.state_path(user)
+        self.state_dir.mkdir(parents=True, exist_ok=True)
+        fd, tmp_path = tempfile.mkstemp(dir=self.state_dir, suffix=".tmp")
+        with os.fdopen(fd, "w") as handle:
+            json.dump(state, handle)
+        os.replace(tmp_path, path)
+        self._memory[str(path)] = state
+
+    def invalidate(self, user: str):
+        """Forget the cached state for user (e.g. the server rejected it)."""
+        path = self.state_path(user)
+        self._memory.pop(str(path), None)
+        try:
+            path.unlink()
+        except OSError:
+            pass
+
+    def _is_fresh(self, state: dict) -> bool:
+        """Check that no cookie in state has expired or is about to."""
+        horizon = time.time() + 30
+        for cookie in state.get("cookies", []):
+            expires = cookie.get("expires", -1)
+            if expires is not None and 0 < expires < horizon:
+                return False
+        return bool(state.get("cookies"))
+
+    # ---------- Playwright ----------
+
+    def playwright_state(self, browser, user: str, password: str = None) -> str:
+        """Return a storage_state file for user, logging in once if needed.
+
+        Args:
+            browser: Playwright Browser used for the one-off login
+            user: Username to authenticate
+            password: Password, defaults to config.PASSWORD
+
+        Returns:
+            Path to pass as ``storage_state`` to ``browser.new_context``
+        """
+        if self.load(user) is not None:
+            self.hits += 1
+            return str(self.state_path(user))
+
+        from pages.playwright.login_page import LoginPage
+
+        self.misses += 1
+        context = browser.new_context(viewport=config.VIEWPORT)
+        try:
+            page = context.new_page()
+            login_page = LoginPage(page)
+            login_page.navigate()
+            login_page.login(user, password or config.PASSWORD)
+            login_page.wait_for_url("inventory.html")
+            self.save(user, context.storage_state())
+        finally:
+            context.close()
+        return str(self.state_path(user))
+
+    # ---------- Selenium ----------
+
+    def selenium_login(self, driver, user: str, password: str = None):
+        """Authenticate driver as user and leave it on /inventory.html.
+
+        Replays cached cookies and localStorage when available and falls
+        back to (and re-caches) a UI login when there is no usable state.
+        """
+        state = self.load(user)
+        if state is not None:
+            self.hits += 1
+            if self._inject_selenium_state(driver, state):
+                return
+            self.invalidate(user)
+
+        from pages.selenium.login_page import LoginPage
+
+        self.misses += 1
+        login_page = LoginPage(driver)
+        login_page.navigate()
+        login_page.login(user, password or config.PASSWORD)
+        login_page.wait_for_url_contains("inventory.html")
+        self.save(user, self._capture_selenium_state(driver))
+
+    def _inject_selenium_state(self, driver, state: dict) -> bool:
+        """Load state into driver; return False if the app rejected it."""
+        # Cookies and storage can only be written for the loaded origin, so
+        # open a cheap same-origin resource first
+        driver.get(f"{config.BASE_URL}{config.AUTH_BOOTSTRAP_PATH}")
+        for cookie in state.get("cookies", []):
+            selenium_cookie = {
+                "name": cookie["name"],
+                "value": cookie["value"],
+                "path": cookie.get("path", "/"),
+                "secure": cookie.get("secure", False),
+                "httpOnly": cookie.get("httpOnly", False),
+            }
+            if cookie.get("expires", -1) > 0:
+                selenium_cookie["expiry"] = int(cookie["expires"])
+            driver.add_cookie(selenium_cookie)
+
+        origin = "{0.scheme}://{0.netloc}".format(urlsplit(config.BASE_URL))
+        for entry in state.get("origins", []):
+            if entry.get("origin") == origin and entry.get("localStorage"):
+                driver.execute_script(_WRITE_LOCAL_STORAGE_SCRIPT, entry["localStorage"])
+
+        driver.get(f"{config.BASE_URL}/inventory.html")
+        return "inventory.html" in driver.current_url
+
+    @staticmethod
+    def _capture_selenium_state(driver) -> dict:
+        """Convert the driver's cookies and localStorage to storage_state format."""
+        cookies = []
+        for cookie in driver.get_cookies():
+            cookies.append({
+                "name": cookie["name"],
+                "value": cookie["value"],
+                "domain": cookie.get("domain", urlsplit(config.BASE_URL).hostname),
+                "path": cookie.get("path", "/"),
+                "expires": cookie.get("expiry", -1),
+                "httpOnly": cookie.get("httpOnly", False),
+                "secure": cookie.get("secure", False),
+                "sameSite": cookie.get("sameSite", "Lax"),
+            })
+        origin = "{0.scheme}://{0.netloc}".format(urlsplit(config.BASE_URL))
+        local_storage = driver.execute_script(_READ_LOCAL_STORAGE_SCRIPT) or []
+        return {
+            "cookies": cookies,
+            "origins": [{"origin": origin, "localStorage": local_storage}],
+        }
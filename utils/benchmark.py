@@ -0,0 +1,215 @@
+"""Benchmark harness with warmup, repeated measurements and baseline comparison.
+
+Each measurement runs ``warmup`` unrecorded iterations followed by ``rounds``
+recorded ones timed with ``time.perf_counter_ns``. Per-round setup and
+teardown run outside the timed region so every engine is measured between the
+same boundaries. Results are written as JSON and can be compared against a
+stored baseline:
+
+    python -m utils.benchmark compare reports/benchmark.json baseline.json --threshold 0.2
+"""
+import argparse
+import json
+import math
+import platform
+import statistics
+import sys
+import time
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Callable, Dict, List, Optional
+
+from utils.config import config
+
+COMPARED_METRICS = ("median_ms", "p95_ms")
+
+
+def percentile(values: List[float], pct: float) -> float:
+    """Linear-interpolated percentile of values (pct in 0-100)."""
+    if not values:
+        return math.nan
+    ordered = sorted(values)
+    rank = (len(ordered) - 1) * pct / 100.0
+    lower = math.floor(rank)
+    upper = math.ceil(rank)
+    if lower == upper:
+        return ordered[int(rank)]
+    return ordered[lower] + (ordered[upper] - ordered[lower]) * (rank - lower)
+
+
+class BenchmarkStats:
+    """Summary statistics for one measured operation."""
+
+    __slots__ = ("name", "samples_ns", "warmup")
+
+    def __init__(self, name: str, samples_ns: List[int], warmup: int = 0):
+        self.name = name
+        self.samples_ns = list(samples_ns)
+        self.warmup = warmup
+
+    @property
+    def samples_ms(self) -> List[float]:
+        return [sample / 1e6 for sample in self.samples_ns]
+
+    @property
+    def median_ms(self) -> float:
+        return statistics.median(self.samples_ms)
+
+    @property
+    def mean_ms(self) -> float:
+        return statistics.fmean(self.samples_ms)
+
+    @property
+    def p95_ms(self) -> float:
+        return percentile(self.samples_ms, 95)
+
+    @property
+    def stddev_ms(self) -> float:
+        samples = self.samples_ms
+        return statistics.stdev(samples) if len(samples) > 1 else 0.0
+
+    def to_dict(self) -> Dict:
+        """Return the statistics as a JSON-serializable dict."""
+        samples = self.samples_ms
+        return {
+            "rounds": len(samples),
+            "warmup": self.warmup,
+            "median_ms": round(self.median_ms, 3),
+            "mean_ms": round(self.mean_ms, 3),
+            "p95_ms": round(self.p95_ms, 3),
+            "stddev_ms": round(self.stddev_ms, 3),
+            "min_ms": round(min(samples), 3),
+            "max_ms": round(max(samples), 3),
+            "samples_ms": [round(sample, 3) for sample in samples],
+        }
+
+    def __repr__(self) -> str:
+        return (f"{self.name}: median {self.median_ms:.1f}ms, p95 {self.p95_ms:.1f}ms, "
+                f"stddev {self.stddev_ms:.1f}ms over {len(self.samples_ns)} rounds")
+
+
+class Benchmark:
+    """Runs and records repeated measurements."""
+
+    def __init__(self, rounds: int = None, warmup: int = None):
+        self.rounds = rounds if rounds is not None else config.BENCHMARK_ROUNDS
+        self.warmup = warmup if warmup is not None else config.BENCHMARK_WARMUP
+        self.results: Dict[str, BenchmarkStats] = {}
+
+    def measure(self, name: str, func: Callable, setup: Optional[Callable] = None,
+                teardown: Optional[Callable] = None) -> BenchmarkStats:
+        """Time func over warmup + rounds iterations.
+
+        Args:
+            name: Metric name, e.g. "selenium.login"
+            func: Operation to time; receives setup()'s return value if setup is given
+            setup: Untimed per-iteration preparation
+            teardown: Untimed per-iteration cleanup; receives setup()'s return value
+
+        Returns:
+            BenchmarkStats for the recorded rounds
+        """
+        samples = []
+        for iteration in range(self.warmup + self.rounds):
+            state = setup() if setup else None
+            try:
+                start = time.perf_counter_ns()
+                if setup:
+                    func(state)
+                else:
+                    func()
+                elapsed = time.perf_counter_ns() - start
+            finally:
+                if teardown:
+                    teardown(state)
+            if iteration >= self.warmup:
+                samples.append(elapsed)
+
+        stats = BenchmarkStats(name, samples, self.warmup)
+        self.results[name] = stats
+        return stats
+
+
+def environment() -> Dict:
+    """Describe where the benchmark ran."""
+    return {
+        "timestamp": datetime.now(timezone.utc).isoformat(),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "base_url": config.BASE_URL,
+        "headless": config.HEADLESS,
+    }
+
+
+def write_results(results: Dict[str, BenchmarkStats], path: str) -> Dict:
+    """Write results plus environment metadata as JSON and return the document."""
+    document = {
+        "environment": environment(),
+        "metrics": {name: stats.to_dict() for name, stats in sorted(results.items())},
+    }
+    target = Path(path)
+    target.parent.mkdir(parents=True, exist_ok=True)
+    target.write_text(json.dumps(document, indent=2))
+    return document
+
+
+def compare(current: Dict, baseline: Dict, threshold: float) -> List[str]:
+    """Return a description of every metric that regressed beyond threshold.
+
+    Args:
+        current: Document produced by write_results
+        baseline: Stored document to compare against
+        threshold: Allowed relative slowdown, e.g. 0.2 for 20%
+    """
+    regressions = []
+    baseline_metrics = baseline.get("metrics", {})
+    for name, metric in sorted(current.get("metrics", {}).items()):
+        reference = baseline_metrics.get(name)
+        if reference is None:
+            continue
+        for field in COMPARED_METRICS:
+            before, after = reference.get(field), metric.get(field)
+            if not before or after is None:
+                continue
+            change = (after - before) / before
+            if change > threshold:
+                regressions.append(
+                    f"{name} {field}: {before:.1f}ms -> {after:.1f}ms "
+                    f"(+{change:.0%}, limit +{threshold:.0%})"
+                )
+    return regressions
+
+
+def format_table(results: Dict[str, BenchmarkStats]) -> List[str]:
+    """Render results as aligned text lines."""
+    lines = [f"{'metric':<32}{'median':>10}{'p95':>10}{'stddev':>10}{'rounds':>8}"]
+    for name, stats in sorted(results.items()):
+        lines.append(
+            f"{name:<32}{stats.median_ms:>8.1f}ms{stats.p95_ms:>8.1f}ms"
+            f"{stats.stddev_ms:>8.1f}ms{len(stats.samples_ns):>8}"
+        )
+    return lines
+
+
+def main(argv: List[str] = None) -> int:
+    """Command line entry point for comparing benchmark files."""
+    parser = argparse.ArgumentParser(description="Benchmark result tools")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+    compare_parser = subparsers.add_parser("compare", help="Fail on regressions against a baseline")
+    compare_parser.add_argument("current")
+    compare_parser.add_argument("baseline")
+    compare_parser.add_argument("--threshold", type=float, default=config.BENCHMARK_THRESHOLD)
+    args = parser.parse_args(argv)
+
+    current = json.loads(Path(args.current).read_text())
+    baseline = json.loads(Path(args.baseline).read_text())
+    regressions = compare(current, baseline, args.threshold)
+    for regression in regressions:
+        print(f"REGRESSION {regression}")
+    if not regressions:
+        print("No regressions beyond threshold")
+    return 1 if regressions else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
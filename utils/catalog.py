@@ -0,0 +1,78 @@
+"""SauceDemo product catalog shared by the local storefront and page helpers."""
+from typing import Dict, List
+
+
+class Product:
+    """A single storefront product."""
+
+    __slots__ = ("item_id", "slug", "name", "description", "price")
+
+    def __init__(self, item_id: int, slug: str, name: str, description: str, price: float):
+        self.item_id = item_id
+        self.slug = slug
+        self.name = name
+        self.description = description
+        self.price = price
+
+    def to_dict(self) -> Dict:
+        """Return the product as a JSON-serializable dict."""
+        return {
+            "id": self.item_id,
+            "slug": self.slug,
+            "name": self.name,
+            "description": self.description,
+            "price": self.price,
+        }
+
+
+# Same ids, slugs and prices as https://www.saucedemo.com so button ids
+# ("add-to-cart-<slug>") and the "cart-contents" localStorage format match.
+PRODUCTS: List[Product] = [
+    Product(4, "sauce-labs-backpack", "Sauce Labs Backpack",
+            "carry.allTheThings() with the sleek, streamlined Sly Pack that melds "
+            "uncompromising style with unequaled laptop and tablet protection.", 29.99),
+    Product(0, "sauce-labs-bike-light", "Sauce Labs Bike Light",
+            "A red light isn't the desired state in testing but it sure helps when "
+            "riding your bike at night. Water-resistant with 3 lighting modes, "
+            "1 AAA battery included.", 9.99),
+    Product(1, "sauce-labs-bolt-t-shirt", "Sauce Labs Bolt T-Shirt",
+            "Get your testing superhero on with the Sauce Labs bolt T-shirt. "
+            "From American Apparel, 100% ringspun combed cotton, heather gray "
+            "with red bolt.", 15.99),
+    Product(5, "sauce-labs-fleece-jacket", "Sauce Labs Fleece Jacket",
+            "It's not every day that you come across a midweight quarter-zip "
+            "fleece jacket capable of handling everything from a relaxing day "
+            "outdoors to a busy day at the office.", 49.99),
+    Product(2, "sauce-labs-onesie", "Sauce Labs Onesie",
+            "Rib snap infant onesie for the junior automation engineer in your "
+            "life. Reinforced 3-snap bottom closure, two-needle hemmed sleeved "
+            "and bottom won't unravel.", 7.99),
+    Product(3, "test.allthethings()-t-shirt-(red)", "Test.allTheThings() T-Shirt (Red)",
+            "This classic Sauce Labs t-shirt is perfect to wear when cozying up "
+            "to your keyboard to automate a few tests. Super-soft and comfy "
+            "ringspun combed cotton.", 15.99),
+]
+
+PRODUCTS_BY_SLUG: Dict[str, Product] = {product.slug: product for product in PRODUCTS}
+
+# Users accepted by the storefront login form
+USERS = (
+    "standard_user",
+    "locked_out_user",
+    "problem_user",
+    "performance_glitch_user",
+    "error_user",
+    "visual_user",
+)
+
+# Storage keys used by the storefront for client-side state
+SESSION_COOKIE = "session-username"
+CART_STORAGE_KEY = "cart-contents"
+
+
+def product_ids(slugs) -> List[int]:
+    """Translate product slugs (as used in button ids) to numeric item ids."""
+    try:
+        return [PRODUCTS_BY_SLUG[slug].item_id for slug in slugs]
+    except KeyError as exc:
+        raise ValueError(f"Unknown product: {exc.args[0]}") from None
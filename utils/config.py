@@ -8,14 +8,36 @@ class Config:
     BASE_URL = os.getenv("BASE_URL", "https://www.saucedemo.com")
     HEADLESS = os.getenv("HEADLESS", "true").lower() == "true"
     
+    # Serve the bundled SauceDemo stand-in and point BASE_URL at it
+    USE_LOCAL_SERVER = os.getenv("LOCAL_SERVER", "false").lower() == "true"
+    
     # Selenium configuration
     SELENIUM_BROWSER = os.getenv("SELENIUM_BROWSER", "firefox")  # Changed from "chrome"
     SELENIUM_IMPLICIT_WAIT = int(os.getenv("SELENIUM_IMPLICIT_WAIT", "10"))
     SELENIUM_PAGE_LOAD_TIMEOUT = int(os.getenv("SELENIUM_PAGE_LOAD_TIMEOUT", "30"))
+    # Explicit wait policy: max seconds per condition and seconds between polls
+    SELENIUM_WAIT_TIMEOUT = float(os.getenv("SELENIUM_WAIT_TIMEOUT", "10"))
+    SELENIUM_POLL_INTERVAL = float(os.getenv("SELENIUM_POLL_INTERVAL", "0.1"))
+    # Reuse located WebElements per page object (re-located when stale)
+    SELENIUM_ELEMENT_CACHE = os.getenv("SELENIUM_ELEMENT_CACHE", "true").lower() == "true"
+    # Reuse warm drivers across tests instead of relaunching per test
+    SELENIUM_POOL = os.getenv("SELENIUM_POOL", "false").lower() == "true"
+    SELENIUM_POOL_SIZE = int(os.getenv("SELENIUM_POOL_SIZE", "2"))
+    SELENIUM_POOL_MAX_USES = int(os.getenv("SELENIUM_POOL_MAX_USES", "25"))
+    # Named launch profile: default, fastest-headless, ci-stable or debug
+    # (see utils/launch_profiles.py)
+    LAUNCH_PROFILE = os.getenv("LAUNCH_PROFILE", "default")
+    
+    # Engines to launch while tests are collected ("selenium,playwright") and
+    # how long the first fixture waits for them before launching itself
+    PRELAUNCH = os.getenv("PRELAUNCH", "")
+    PRELAUNCH_TIMEOUT = float(os.getenv("PRELAUNCH_TIMEOUT", "30"))
     
     # Playwright configuration
     PLAYWRIGHT_BROWSER = os.getenv("PLAYWRIGHT_BROWSER", "chromium")  # chromium, firefox, webkit
     PLAYWRIGHT_TIMEOUT = int(os.getenv("PLAYWRIGHT_TIMEOUT", "30000"))
+    # Max BrowserContexts the async scenario runner keeps open at once
+    ASYNC_CONCURRENCY = int(os.getenv("ASYNC_CONCURRENCY", "8"))
     
     VIEWPORT: Dict[str, int] = {
         "width": 1920,
@@ -28,8 +50,84 @@ class Config:
     PROBLEM_USER = "problem_user"
     PASSWORD = "secret_sauce"
     
+    # Reuse one UI login per user and session instead of logging in per test
+    AUTH_CACHE = os.getenv("AUTH_CACHE", "true").lower() == "true"
+    AUTH_STATE_DIR = os.getenv("AUTH_STATE_DIR", ".auth")
+    AUTH_STATE_MAX_AGE = int(os.getenv("AUTH_STATE_MAX_AGE", "300"))  # seconds
+    # Cheap same-origin URL Selenium loads before injecting cookies/storage
+    AUTH_BOOTSTRAP_PATH = os.getenv("AUTH_BOOTSTRAP_PATH", "/favicon.ico")
+    
+    # Benchmarks: unrecorded warmup iterations, recorded rounds and the
+    # relative slowdown against a baseline that counts as a regression
+    BENCHMARK_WARMUP = int(os.getenv("BENCHMARK_WARMUP", "1"))
+    BENCHMARK_ROUNDS = int(os.getenv("BENCHMARK_ROUNDS", "5"))
+    BENCHMARK_THRESHOLD = float(os.getenv("BENCHMARK_THRESHOLD", "0.2"))
+    
+    # Record every page-object action as a Chrome trace per test
+    TRACE_ACTIONS = os.getenv("TRACE_ACTIONS", "false").lower() == "true"
+    
+    # Resource blocking preset (none, media, third-party, lean) plus extra
+    # comma-separated URL globs to block, e.g. "*analytics*,*.gif"
+    BLOCK_RESOURCES = os.getenv("BLOCK_RESOURCES", "none")
+    BLOCK_PATTERNS = os.getenv("BLOCK_PATTERNS", "")
+    
+    # Failure screenshots: png, jpeg or webp; quality for lossy formats;
+    # scale < 1 downscales; encoding/writing runs on this many threads
+    SCREENSHOT_FORMAT = os.getenv("SCREENSHOT_FORMAT", "png")
+    SCREENSHOT_QUALITY = int(os.getenv("SCREENSHOT_QUALITY", "80"))
+    SCREENSHOT_SCALE = float(os.getenv("SCREENSHOT_SCALE", "1.0"))
+    SCREENSHOT_WORKERS = int(os.getenv("SCREENSHOT_WORKERS", "2"))
+    
+    # Flake tracking: outcome history database, reruns per failed test (off
+    # by default; CI reruns once) and per process, and quarantine (non-strict xfail) for tests whose flake
+    # rate over their last FLAKE_WINDOW sessions reaches FLAKE_QUARANTINE_RATE
+    FLAKE_TRACKING = os.getenv("FLAKE_TRACKING", "true").lower() == "true"
+    FLAKE_DB = os.getenv("FLAKE_DB", "reports/flakes.sqlite")
+    FLAKE_RERUNS = int(os.getenv("FLAKE_RERUNS", "0"))
+    FLAKE_RERUN_BUDGET = int(os.getenv("FLAKE_RERUN_BUDGET", "5"))
+    FLAKE_WINDOW = int(os.getenv("FLAKE_WINDOW", "30"))
+    FLAKE_QUARANTINE_RATE = float(os.getenv("FLAKE_QUARANTINE_RATE", "0.2"))
+    FLAKE_MIN_RUNS = int(os.getenv("FLAKE_MIN_RUNS", "5"))
+    
+    # Timing history: per-phase durations per commit/browser/Python; a phase
+    # is slower when its median on the newest commit exceeds the median of
+    # the TIMING_WINDOW runs before it by TIMING_THRESHOLD and TIMING_MIN_SECONDS
+    TIMING_HISTORY = os.getenv("TIMING_HISTORY", "true").lower() == "true"
+    TIMING_DB = os.getenv("TIMING_DB", "reports/timings.sqlite")
+    TIMING_REPORT = os.getenv("TIMING_REPORT", "reports/timing_trends.html")
+    TIMING_WINDOW = int(os.getenv("TIMING_WINDOW", "10"))
+    TIMING_MIN_RUNS = int(os.getenv("TIMING_MIN_RUNS", "3"))
+    TIMING_THRESHOLD = float(os.getenv("TIMING_THRESHOLD", "0.2"))
+    TIMING_MIN_SECONDS = float(os.getenv("TIMING_MIN_SECONDS", "0.05"))
+    
+    # Visual regression: a pixel counts as changed above VISUAL_TOLERANCE
+    # (0-255 per channel) and a frame fails above VISUAL_MAX_DIFF_RATIO
+    # changed pixels (by default any, so the tolerance alone absorbs
+    # rendering noise); a dHash distance above VISUAL_HASH_DISTANCE is
+    # reported as a layout change; 0 workers = one process per CPU
+    VISUAL_BASELINE_DIR = os.getenv("VISUAL_BASELINE_DIR", "visual/baselines")
+    VISUAL_DIFF_DIR = os.getenv("VISUAL_DIFF_DIR", "reports/visual")
+    VISUAL_IGNORE_FILE = os.getenv("VISUAL_IGNORE_FILE", "visual/ignore.json")
+    VISUAL_TOLERANCE = int(os.getenv("VISUAL_TOLERANCE", "16"))
+    VISUAL_MAX_DIFF_RATIO = float(os.getenv("VISUAL_MAX_DIFF_RATIO", "0"))
+    VISUAL_HASH_DISTANCE = int(os.getenv("VISUAL_HASH_DISTANCE", "10"))
+    VISUAL_WORKERS = int(os.getenv("VISUAL_WORKERS", "0"))
+    
+    # Debug artifacts: off, retain-on-failure (record always, keep only
+    # failures) or on; recording costs every test, so CI opts in with
+    # --artifacts. Selenium keeps this many action frames in memory
+    ARTIFACT_MODE = os.getenv("ARTIFACT_MODE", "off")
+    SELENIUM_RING_BUFFER = int(os.getenv("SELENIUM_RING_BUFFER", "10"))
+    
     # Paths
     SCREENSHOTS_DIR = "screenshots"
     REPORTS_DIR = "reports"
+    BENCHMARK_JSON = os.getenv("BENCHMARK_JSON", "reports/benchmark.json")
+    TRACES_DIR = os.getenv("TRACES_DIR", "reports/traces")
+    ARTIFACTS_DIR = os.getenv("ARTIFACTS_DIR", "reports/artifacts")
+    # Data files for get_test_data()/parametrize_data()
+    TEST_DATA_DIR = os.getenv("TEST_DATA_DIR", "tests/data")
+    # Test -> page-object symbols map written by --impact-record
+    IMPACT_MAP = os.getenv("IMPACT_MAP", "reports/impact_map.json")
 
 config = Config()
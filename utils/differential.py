@@ -0,0 +1,298 @@
+"""Run one scenario on Selenium and Playwright side by side.
+
+Each engine gets its own process, and both processes run at the same time,
+so the two engines see the same machine load. Both drive the same
+engine-agnostic page objects (``pages/common``) through their Driver
+adapter. Every step of every round is timed, and the steps are reported
+next to each other per engine. Each step also returns an observed value
+(e.g. the cart count). A step whose values differ between the engines is
+reported as a mismatch, since the same page objects should see the same app:
+
+    python -m utils.differential --local-server --rounds 5 --json reports/differential.json
+
+Results use the benchmark JSON format (metrics ``selenium.<step>`` and
+``playwright.<step>``), so ``python -m utils.benchmark compare`` works on them.
+"""
+import argparse
+import multiprocessing
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+from typing import Any, Callable, Dict, List, Sequence, Tuple
+
+from pages.common.cart_page import CartPage
+from pages.common.driver import Driver
+from pages.common.login_page import LoginPage
+from pages.common.products_page import ProductsPage
+from utils.benchmark import BenchmarkStats, write_results
+from utils.config import config
+from utils.prelaunch import ENGINES, parse_engines
+
+# Steps must be module-level functions so they can be sent to the engine processes
+Step = Tuple[str, Callable[[Driver], Any]]
+PRODUCTS = ("sauce-labs-backpack", "sauce-labs-bike-light")
+
+
+# ---------- shopper scenario ----------
+
+def _login(driver: Driver):
+    login_page = LoginPage(driver)
+    login_page.navigate()
+    login_page.login(config.VALID_USER, config.PASSWORD)
+    products_page = ProductsPage(driver)
+    products_page.wait_for_url("inventory.html")
+    return products_page.get_product_count()
+
+
+def _add_to_cart(driver: Driver):
+    products_page = ProductsPage(driver)
+    for product in PRODUCTS:
+        products_page.add_item_to_cart(product)
+    return products_page.get_cart_count()
+
+
+def _open_cart(driver: Driver):
+    ProductsPage(driver).go_to_cart()
+    return CartPage(driver).get_cart_item_count()
+
+
+def _remove_from_cart(driver: Driver):
+    cart_page = CartPage(driver)
+    cart_page.remove_item(PRODUCTS[0])
+    return cart_page.get_cart_item_count()
+
+
+def _checkout(driver: Driver):
+    CartPage(driver).proceed_to_checkout()
+    return driver.url.rsplit("/", 1)[-1]
+
+
+SHOPPER_SCENARIO: List[Step] = [
+    ("login", _login),
+    ("add_to_cart", _add_to_cart),
+    ("open_cart", _open_cart),
+    ("remove_from_cart", _remove_from_cart),
+    ("checkout", _checkout),
+]
+
+
+# ---------- engine processes ----------
+
+def _describe(exc: BaseException) -> str:
+    """Exception type and the first line of its message."""
+    lines = str(exc).strip().splitlines()
+    return type(exc).__name__ + (f": {lines[0]}" if lines else "")
+
+
+class _SeleniumSession:
+    """One WebDriver, reset between rounds."""
+
+    def __init__(self, browser: str):
+        from utils.driver_factory import DriverFactory
+        self.webdriver = DriverFactory.get_driver(browser=browser)
+
+    def fresh(self) -> Driver:
+        from pages.common.selenium_driver import SeleniumDriver
+        from utils.driver_factory import DriverPool
+        DriverPool.reset(self.webdriver)
+        return SeleniumDriver(self.webdriver)
+
+    def close(self):
+        self.webdriver.quit()
+
+
+class _PlaywrightSession:
+    """One browser with a new context per round."""
+
+    def __init__(self, browser: str):
+        from playwright.sync_api import sync_playwright
+        self._playwright = sync_playwright().start()
+        self.browser = getattr(self._playwright, browser).launch(headless=config.HEADLESS)
+        self._context = None
+
+    def fresh(self) -> Driver:
+        from pages.common.playwright_driver import PlaywrightDriver
+        if self._context is not None:
+            self._context.close()
+        self._context = self.browser.new_context(viewport=config.VIEWPORT)
+        return PlaywrightDriver(self._context.new_page())
+
+    def close(self):
+        self.browser.close()
+        self._playwright.stop()
+
+
+def _run_engine(engine: str, browser: str, steps: Sequence[Step], rounds: int, warmup: int,
+                base_url: str, headless: bool) -> Dict:
+    """Run every round of steps on one engine (in its own process)."""
+    config.BASE_URL = base_url
+    config.HEADLESS = headless
+    samples: Dict[str, List[int]] = {name: [] for name, _ in steps}
+    errors: List[str] = []
+    values: Dict[str, str] = {}
+
+    started = time.perf_counter_ns()
+    session = (_SeleniumSession if engine == "selenium" else _PlaywrightSession)(browser)
+    startup_ns = time.perf_counter_ns() - started
+    try:
+        for round_index in range(warmup + rounds):
+            recorded = round_index >= warmup
+            driver = session.fresh()
+            for name, step in steps:
+                started = time.perf_counter_ns()
+                try:
+                    value = step(driver)
+                except Exception as exc:
+                    errors.append(f"round {round_index + 1 - warmup}, {name}: {_describe(exc)}")
+                    break
+                if recorded:
+                    samples[name].append(time.perf_counter_ns() - started)
+                    values[name] = repr(value)
+    finally:
+        session.close()
+    return {"samples": samples, "startup_ns": startup_ns, "errors": errors, "values": values}
+
+
+# ---------- runner ----------
+
+class DifferentialResult:
+    """Per-engine step timings, errors and value mismatches."""
+
+    def __init__(self, steps: List[str], engines: List[str]):
+        self.steps = steps
+        self.engines = engines
+        self.stats: Dict[str, BenchmarkStats] = {}  # "<engine>.<step>" -> stats
+        self.errors: Dict[str, List[str]] = {engine: [] for engine in engines}
+        self.values: Dict[str, Dict[str, str]] = {engine: {} for engine in engines}
+
+    @property
+    def mismatches(self) -> List[str]:
+        """Steps whose observed value differs between engines."""
+        mismatched = []
+        for step in self.steps:
+            seen = {self.values[engine][step] for engine in self.engines if step in self.values[engine]}
+            if len(seen) > 1:
+                mismatched.append(step)
+        return mismatched
+
+    @property
+    def ok(self) -> bool:
+        return not any(self.errors.values()) and not self.mismatches
+
+
+class DifferentialRunner:
+    """Runs steps on several engines concurrently, one process per engine."""
+
+    def __init__(self, steps: List[Step] = None, rounds: int = None, warmup: int = None,
+                 engines: Sequence[str] = ENGINES, selenium_browser: str = None,
+                 playwright_browser: str = None):
+        self.steps = steps or SHOPPER_SCENARIO
+        self.rounds = rounds if rounds is not None else config.BENCHMARK_ROUNDS
+        self.warmup = warmup if warmup is not None else config.BENCHMARK_WARMUP
+        self.engines = list(engines)
+        self.browsers = {
+            "selenium": selenium_browser or config.SELENIUM_BROWSER,
+            "playwright": playwright_browser or config.PLAYWRIGHT_BROWSER,
+        }
+
+    def run(self) -> DifferentialResult:
+        result = DifferentialResult([name for name, _ in self.steps], self.engines)
+        # spawn: a forked child would inherit the parent's browser threads and sockets
+        context = multiprocessing.get_context("spawn")
+        with ProcessPoolExecutor(max_workers=len(self.engines), mp_context=context) as pool:
+            futures = {
+                engine: pool.submit(_run_engine, engine, self.browsers[engine], self.steps,
+                                    self.rounds, self.warmup, config.BASE_URL, config.HEADLESS)
+                for engine in self.engines
+            }
+            for engine, future in futures.items():
+                try:
+                    output = future.result()
+                except Exception as exc:
+                    result.errors[engine].append(_describe(exc))
+                    continue
+                result.stats[f"{engine}.startup"] = BenchmarkStats(f"{engine}.startup",
+                                                                   [output["startup_ns"]])
+                for step, samples in output["samples"].items():
+                    if samples:
+                        result.stats[f"{engine}.{step}"] = BenchmarkStats(
+                            f"{engine}.{step}", samples, self.warmup
+                        )
+                result.errors[engine] = output["errors"]
+                result.values[engine] = output["values"]
+        return result
+
+
+def format_side_by_side(result: DifferentialResult) -> List[str]:
+    """One row per step with each engine's median and p95.
+
+    With two engines, the ratio column is the second engine's median over
+    the first's (below 1.0: the second engine is faster).
+    """
+    header = f"{'step':<18}" + "".join(f"{engine + ' p50/p95':>24}" for engine in result.engines)
+    if len(result.engines) == 2:
+        header += f"{'ratio':>8}"
+    lines = [header]
+    for step in ["startup"] + result.steps:
+        row = f"{step:<18}"
+        medians = []
+        for engine in result.engines:
+            stats = result.stats.get(f"{engine}.{step}")
+            medians.append(stats.median_ms if stats else None)
+            cell = f"{stats.median_ms:.0f} / {stats.p95_ms:.0f} ms" if stats else "-"
+            row += f"{cell:>24}"
+        if len(medians) == 2:
+            ratio = f"{medians[1] / medians[0]:.2f}x" if all(medians) else "-"
+            row += f"{ratio:>8}"
+        lines.append(row)
+    for step in result.mismatches:
+        observed = ", ".join(f"{engine}={result.values[engine].get(step)}" for engine in result.engines)
+        lines.append(f"MISMATCH {step}: {observed}")
+    for engine, errors in result.errors.items():
+        lines.extend(f"ERROR {engine} {error}" for error in errors)
+    return lines
+
+
+def main(argv: List[str] = None) -> int:
+    """Run the shopper scenario on both engines and print the steps side by side."""
+    parser = argparse.ArgumentParser(description="Compare engines on the same page objects")
+    parser.add_argument("--engines", default=",".join(ENGINES),
+                        help="Comma-separated engines to run (default: selenium,playwright)")
+    parser.add_argument("--rounds", type=int, default=config.BENCHMARK_ROUNDS)
+    parser.add_argument("--warmup", type=int, default=config.BENCHMARK_WARMUP)
+    parser.add_argument("--selenium-browser", default=config.SELENIUM_BROWSER)
+    parser.add_argument("--playwright-browser", default=config.PLAYWRIGHT_BROWSER)
+    parser.add_argument("--json", default=None, help="Write results in the benchmark JSON format")
+    parser.add_argument("--local-server", action="store_true",
+                        help="Run against the bundled local storefront instead of BASE_URL")
+    args = parser.parse_args(argv)
+    try:
+        engines = parse_engines(args.engines)
+    except ValueError as error:
+        parser.error(str(error))
+    if not engines:
+        parser.error("--engines needs at least one engine")
+
+    server = None
+    if args.local_server:
+        from utils.local_server import LocalStorefront
+        server = LocalStorefront().start()
+        config.BASE_URL = server.url
+    runner = DifferentialRunner(rounds=args.rounds, warmup=args.warmup, engines=engines,
+                                selenium_browser=args.selenium_browser,
+                                playwright_browser=args.playwright_browser)
+    try:
+        result = runner.run()
+    finally:
+        if server is not None:
+            server.stop()
+
+    for line in format_side_by_side(result):
+        print(line)
+    if args.json and result.stats:
+        write_results(result.stats, args.json)
+    return 0 if result.ok else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
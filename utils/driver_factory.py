@@ -1,35 +1,184 @@
 """Selenium WebDriver factory for browser initialization."""
+import shutil
+import threading
+from typing import Dict, List, Optional, Tuple
 from selenium import webdriver
+from selenium.common.exceptions import WebDriverException
+from selenium.webdriver.remote.webdriver import WebDriver
 from utils.config import config
+from utils.launch_profiles import LaunchProfile, remove_on_quit
+from utils.resource_blocking import BlockingPolicy, apply_chromium_blocking
+
+# Clears client-side state for the origin currently loaded in the driver
+_CLEAR_STORAGE_SCRIPT = """
+try { window.localStorage.clear(); } catch (e) {}
+try { window.sessionStorage.clear(); } catch (e) {}
+"""
+
+class DriverPool:
+    """Pool of warm WebDriver instances reused across tests in one process.
+    
+    Drivers are reset between tests (cookies, localStorage, sessionStorage,
+    extra windows, about:blank) instead of being relaunched, and recycled
+    after max_uses tests or whenever a reset or health check fails.
+    """
+    
+    def __init__(self, browser: str = None, headless: bool = None,
+                 size: int = None, max_uses: int = None, profile: str = None):
+        self.browser = browser or config.SELENIUM_BROWSER
+        self.headless = headless
+        self.profile = profile
+        self.size = size if size is not None else config.SELENIUM_POOL_SIZE
+        self.max_uses = max_uses if max_uses is not None else config.SELENIUM_POOL_MAX_USES
+        self._idle: List[WebDriver] = []
+        self._uses: Dict[WebDriver, int] = {}
+        self._lock = threading.Lock()
+        self.launched = 0
+        self.recycled = 0
+        
+    def acquire(self) -> WebDriver:
+        """Return a healthy idle driver, launching a new one if none is left."""
+        while True:
+            with self._lock:
+                driver = self._idle.pop() if self._idle else None
+            if driver is None:
+                break
+            if self._is_healthy(driver):
+                return driver
+            self._discard(driver)
+            
+        driver = DriverFactory.get_driver(browser=self.browser, headless=self.headless,
+                                          profile=self.profile)
+        with self._lock:
+            self._uses[driver] = 0
+            self.launched += 1
+        return driver
+        
+    def add(self, driver: WebDriver):
+        """Hand an already launched driver to the pool as idle."""
+        with self._lock:
+            self._uses.setdefault(driver, 0)
+            self._idle.append(driver)
+            self.launched += 1
+            
+    def release(self, driver: WebDriver, discard: bool = False):
+        """Return a driver after a test, resetting or recycling it."""
+        with self._lock:
+            uses = self._uses.get(driver, 0) + 1
+            self._uses[driver] = uses
+            keep = (not discard and uses < self.max_uses
+                    and len(self._idle) < self.size)
+            
+        if keep and self.reset(driver):
+            with self._lock:
+                self._idle.append(driver)
+        else:
+            self._discard(driver)
+            
+    def close(self):
+        """Quit every driver the pool still knows about."""
+        with self._lock:
+            drivers = list(self._uses)
+            self._idle.clear()
+            self._uses.clear()
+        for driver in drivers:
+            try:
+                driver.quit()
+            except WebDriverException:
+                pass
+                
+    @staticmethod
+    def reset(driver: WebDriver) -> bool:
+        """Clear per-test browser state; return False if the driver is unusable."""
+        try:
+            handles = driver.window_handles
+            for handle in handles[1:]:
+                driver.switch_to.window(handle)
+                driver.close()
+            driver.switch_to.window(handles[0])
+            
+            # Storage and cookies are scoped to the loaded origin, so clear
+            # them before leaving it
+            if driver.current_url.startswith("http"):
+                driver.execute_script(_CLEAR_STORAGE_SCRIPT)
+                driver.delete_all_cookies()
+            driver.implicitly_wait(config.SELENIUM_IMPLICIT_WAIT)
+            driver.get("about:blank")
+            return True
+        except WebDriverException:
+            return False
+            
+    @staticmethod
+    def _is_healthy(driver: WebDriver) -> bool:
+        """Check the browser session still answers commands."""
+        try:
+            driver.current_url
+            return True
+        except WebDriverException:
+            return False
+            
+    def _discard(self, driver: WebDriver):
+        """Quit a driver and forget it."""
+        with self._lock:
+            self._uses.pop(driver, None)
+            self.recycled += 1
+        try:
+            driver.quit()
+        except WebDriverException:
+            pass
+
 
 class DriverFactory:
     """Factory class for creating WebDriver instances."""
     
+    _pools: Dict[Tuple[str, bool, str], DriverPool] = {}
+    
     @staticmethod
-    def get_driver(browser: str = None, headless: bool = None):
+    def get_driver(browser: str = None, headless: bool = None, profile: str = None):
         """Create and return a WebDriver instance.
         
         Args:
             browser: Browser name (chrome, firefox, edge)
-            headless: Run in headless mode
+            headless: Run in headless mode (overrides the profile's choice)
+            profile: Launch profile name (default: config.LAUNCH_PROFILE)
             
         Returns:
             WebDriver instance
         """
         browser = browser or config.SELENIUM_BROWSER
-        headless = headless if headless is not None else config.HEADLESS
+        launch_profile = LaunchProfile.from_config(profile)
+        headless = headless if headless is not None else launch_profile.headless(config.HEADLESS)
         
         if browser.lower() == "chrome":
-            return DriverFactory._get_chrome_driver(headless)
+            return DriverFactory._get_chrome_driver(headless, launch_profile)
         elif browser.lower() == "firefox":
-            return DriverFactory._get_firefox_driver(headless)
+            return DriverFactory._get_firefox_driver(headless, launch_profile)
         elif browser.lower() == "edge":
-            return DriverFactory._get_edge_driver(headless)
+            return DriverFactory._get_edge_driver(headless, launch_profile)
         else:
             raise ValueError(f"Unsupported browser: {browser}")
     
     @staticmethod
-    def _get_chrome_driver(headless: bool):
+    def get_pool(browser: str = None, headless: bool = None, profile: str = None) -> DriverPool:
+        """Return this process's driver pool for a browser, creating it once.
+        
+        Args:
+            browser: Browser name (chrome, firefox, edge)
+            headless: Run in headless mode
+            profile: Launch profile name (default: config.LAUNCH_PROFILE)
+            
+        Returns:
+            DriverPool shared by every caller in this process (xdist worker)
+        """
+        browser = (browser or config.SELENIUM_BROWSER).lower()
+        profile = profile or config.LAUNCH_PROFILE
+        key = (browser, headless, profile)
+        if key not in DriverFactory._pools:
+            DriverFactory._pools[key] = DriverPool(browser, headless, profile=profile)
+        return DriverFactory._pools[key]
+        
+    @staticmethod
+    def _get_chrome_driver(headless: bool, profile: LaunchProfile):
         """Create Chrome WebDriver."""
         options = webdriver.ChromeOptions()
         if headless:
@@ -38,30 +187,45 @@ class DriverFactory:
         options.add_argument("--disable-dev-shm-usage")
         options.add_argument("--disable-gpu")
         options.add_argument(f"--window-size={config.VIEWPORT['width']},{config.VIEWPORT['height']}")
+        profile_dir = DriverFactory._apply_chromium_profile(options, profile)
+        policy = BlockingPolicy.from_config()
+        DriverFactory._apply_chromium_policy(options, policy)
         
         # Selenium 4.6+ has built-in driver management
-        driver = webdriver.Chrome(options=options)
+        driver = DriverFactory._start(webdriver.Chrome, options, profile_dir)
+        apply_chromium_blocking(driver, policy)
         driver.implicitly_wait(config.SELENIUM_IMPLICIT_WAIT)
         driver.set_page_load_timeout(config.SELENIUM_PAGE_LOAD_TIMEOUT)
         return driver
     
     @staticmethod
-    def _get_firefox_driver(headless: bool):
+    def _get_firefox_driver(headless: bool, profile: LaunchProfile):
         """Create Firefox WebDriver."""
         options = webdriver.FirefoxOptions()
         if headless:
             options.add_argument("--headless")
         options.add_argument(f"--width={config.VIEWPORT['width']}")
         options.add_argument(f"--height={config.VIEWPORT['height']}")
+        options.page_load_strategy = profile.page_load_strategy
+        for argument in profile.firefox_arguments():
+            options.add_argument(argument)
+        profile_dir = profile.make_profile_dir()
+        if profile_dir:
+            options.add_argument("-profile")
+            options.add_argument(profile_dir)
+        preferences = profile.firefox_preferences()
+        preferences.update(BlockingPolicy.from_config().firefox_preferences())
+        for name, value in preferences.items():
+            options.set_preference(name, value)
         
         # Selenium 4.6+ has built-in driver management
-        driver = webdriver.Firefox(options=options)
+        driver = DriverFactory._start(webdriver.Firefox, options, profile_dir)
         driver.implicitly_wait(config.SELENIUM_IMPLICIT_WAIT)
         driver.set_page_load_timeout(config.SELENIUM_PAGE_LOAD_TIMEOUT)
         return driver
     
     @staticmethod
-    def _get_edge_driver(headless: bool):
+    def _get_edge_driver(headless: bool, profile: LaunchProfile):
         """Create Edge WebDriver."""
         options = webdriver.EdgeOptions()
         if headless:
@@ -69,9 +233,54 @@ class DriverFactory:
         options.add_argument("--no-sandbox")
         options.add_argument("--disable-dev-shm-usage")
         options.add_argument(f"--window-size={config.VIEWPORT['width']},{config.VIEWPORT['height']}")
+        profile_dir = DriverFactory._apply_chromium_profile(options, profile)
+        policy = BlockingPolicy.from_config()
+        DriverFactory._apply_chromium_policy(options, policy)
         
         # Selenium 4.6+ has built-in driver management
-        driver = webdriver.Edge(options=options)
+        driver = DriverFactory._start(webdriver.Edge, options, profile_dir)
+        apply_chromium_blocking(driver, policy)
         driver.implicitly_wait(config.SELENIUM_IMPLICIT_WAIT)
         driver.set_page_load_timeout(config.SELENIUM_PAGE_LOAD_TIMEOUT)
         return driver
+    
+    @staticmethod
+    def _start(driver_class, options, profile_dir: Optional[str]) -> WebDriver:
+        """Launch a driver that deletes its throwaway profile dir when it quits."""
+        try:
+            driver = driver_class(options=options)
+        except Exception:
+            if profile_dir:
+                shutil.rmtree(profile_dir, ignore_errors=True)
+            raise
+        return remove_on_quit(driver, profile_dir) if profile_dir else driver
+        
+    @staticmethod
+    def _apply_chromium_profile(options, profile: LaunchProfile) -> Optional[str]:
+        """Add the launch profile's strategy, switches and profile dir to Chrome/Edge options.
+        
+        Returns:
+            The throwaway profile directory, if the profile uses one
+        """
+        options.page_load_strategy = profile.page_load_strategy
+        for argument in profile.chromium_arguments():
+            options.add_argument(argument)
+        profile_dir = profile.make_profile_dir()
+        if profile_dir:
+            options.add_argument(f"--user-data-dir={profile_dir}")
+        prefs = profile.chromium_prefs()
+        if prefs:
+            options.add_experimental_option("prefs", prefs)
+        return profile_dir
+        
+    @staticmethod
+    def _apply_chromium_policy(options, policy: BlockingPolicy):
+        """Add resource blocking switches and prefs to Chrome/Edge options."""
+        for argument in policy.chromium_arguments():
+            options.add_argument(argument)
+        prefs = policy.chromium_prefs()
+        if prefs:
+            # Merge with any prefs the launch profile already set
+            merged = dict(options.experimental_options.get("prefs", {}))
+            merged.update(prefs)
+            options.add_experimental_option("prefs", merged)
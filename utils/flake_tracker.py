@@ -0,0 +1,245 @@
+"""Test outcome history in SQLite, flake rates, reruns and quarantine.
+
+Every attempt of every test is stored in ``FLAKE_DB``, one row per session,
+test and attempt, with its outcome and duration. With ``--reruns`` (off by
+default) a failed test is rerun right away with fresh function-scoped
+fixtures (a new Playwright context, a new or recycled Selenium driver), at
+most ``--reruns`` times per test and ``--rerun-budget`` times per process. A session in which a test failed and
+then passed on a rerun counts as flaky for that test, and its flake rate is
+the share of its last ``FLAKE_WINDOW`` sessions that were flaky. Tests at or
+above ``FLAKE_QUARANTINE_RATE`` over at least ``FLAKE_MIN_RUNS`` sessions are
+quarantined: they still run and are recorded, but as non-strict xfail.
+
+    python -m utils.flake_tracker            # flake rates, worst first
+"""
+import argparse
+import sqlite3
+import sys
+import time
+import uuid
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from utils.config import config
+
+# Attempt outcomes that count as the test working / not working; a declared
+# xfail is neither
+PASSING = ("passed", "xpassed")
+FAILING = ("failed", "rerun")
+
+# Start of the xfail reason given to quarantined tests
+QUARANTINE_REASON = "quarantined:"
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS results (
+    run_id TEXT NOT NULL,
+    started REAL NOT NULL,
+    nodeid TEXT NOT NULL,
+    attempt INTEGER NOT NULL,
+    outcome TEXT NOT NULL,
+    duration REAL NOT NULL,
+    PRIMARY KEY (run_id, nodeid, attempt)
+);
+CREATE INDEX IF NOT EXISTS results_by_test ON results (nodeid, started);
+"""
+
+
+def attempt_outcome(reports: Iterable) -> str:
+    """Outcome of one attempt from its setup/call/teardown reports."""
+    reports = list(reports)
+    if any(report.outcome == "rerun" for report in reports):
+        return "rerun"
+    if any(report.failed for report in reports):
+        return "failed"
+    for report in reports:
+        if hasattr(report, "wasxfail"):
+            if report.skipped and report.wasxfail.startswith(QUARANTINE_REASON):
+                # Quarantine only hides the failure from the build
+                return "failed"
+            return "xfailed" if report.skipped else "xpassed"
+    if any(report.skipped for report in reports):
+        return "skipped"
+    return "passed"
+
+
+class FlakeStats:
+    """Outcome counts for one test over its recent sessions."""
+
+    def __init__(self, nodeid: str):
+        self.nodeid = nodeid
+        self.runs = 0
+        self.flaky = 0  # failed, then passed on a rerun
+        self.failed = 0  # still failing after the last attempt
+        self.durations: List[float] = []
+
+    @property
+    def flake_rate(self) -> float:
+        return self.flaky / self.runs if self.runs else 0.0
+
+    @property
+    def fail_rate(self) -> float:
+        return self.failed / self.runs if self.runs else 0.0
+
+    @property
+    def mean_duration(self) -> float:
+        return sum(self.durations) / len(self.durations) if self.durations else 0.0
+
+    def add_session(self, attempts: List[Tuple[str, float]]):
+        """Fold in one session's attempts, ordered by attempt number."""
+        outcomes = [outcome for outcome, _ in attempts]
+        if outcomes[-1] == "skipped":
+            return
+        self.runs += 1
+        self.durations.append(sum(duration for _, duration in attempts))
+        if outcomes[0] in FAILING and outcomes[-1] in PASSING:
+            self.flaky += 1
+        elif outcomes[-1] in FAILING:
+            self.failed += 1
+
+
+class FlakeStore:
+    """SQLite history of test attempts."""
+
+    def __init__(self, path: str = None):
+        self.path = Path(path or config.FLAKE_DB)
+
+    def _connect(self) -> sqlite3.Connection:
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        connection = sqlite3.connect(str(self.path), timeout=30)
+        connection.executescript(_SCHEMA)
+        return connection
+
+    def record(self, results: List[Tuple[str, int, str, float]], run_id: str = None,
+               started: float = None) -> str:
+        """Store one session's (nodeid, attempt, outcome, seconds) rows; return its run id."""
+        run_id = run_id or uuid.uuid4().hex
+        started = time.time() if started is None else started
+        connection = self._connect()
+        try:
+            with connection:
+                connection.executemany(
+                    "INSERT OR REPLACE INTO results VALUES (?, ?, ?, ?, ?, ?)",
+                    [(run_id, started, nodeid, attempt, outcome, round(duration, 4))
+                     for nodeid, attempt, outcome, duration in results],
+                )
+        finally:
+            connection.close()
+        return run_id
+
+    def stats(self, window: int = None) -> Dict[str, FlakeStats]:
+        """Per-test stats over each test's last `window` sessions (empty if no history)."""
+        window = window or config.FLAKE_WINDOW
+        if not self.path.exists():
+            return {}
+        connection = self._connect()
+        try:
+            rows = connection.execute(
+                "SELECT nodeid, run_id, attempt, outcome, duration FROM results "
+                "ORDER BY nodeid, started DESC, run_id, attempt"
+            ).fetchall()
+        finally:
+            connection.close()
+
+        sessions: Dict[str, Dict[str, List[Tuple[str, float]]]] = {}
+        for nodeid, run_id, attempt, outcome, duration in rows:
+            runs = sessions.setdefault(nodeid, {})
+            if run_id in runs or len(runs) < window:
+                runs.setdefault(run_id, []).append((outcome, duration))
+        stats = {}
+        for nodeid, runs in sessions.items():
+            entry = stats[nodeid] = FlakeStats(nodeid)
+            for attempts in runs.values():
+                entry.add_session(attempts)
+        return stats
+
+    def quarantined(self, rate: float = None, min_runs: int = None,
+                    window: int = None) -> Dict[str, FlakeStats]:
+        """Tests whose flake rate is at or above rate over at least min_runs sessions."""
+        rate = config.FLAKE_QUARANTINE_RATE if rate is None else rate
+        min_runs = config.FLAKE_MIN_RUNS if min_runs is None else min_runs
+        return {nodeid: entry for nodeid, entry in self.stats(window).items()
+                if entry.runs >= min_runs and entry.flaky and entry.flake_rate >= rate}
+
+
+class RerunBudget:
+    """Reruns allowed per test and in total for one process."""
+
+    def __init__(self, per_test: int = None, total: int = None):
+        self.per_test = config.FLAKE_RERUNS if per_test is None else per_test
+        self.total = config.FLAKE_RERUN_BUDGET if total is None else total
+        self.spent = 0
+
+    @property
+    def enabled(self) -> bool:
+        return self.per_test > 0 and self.total > 0
+
+    def allow(self, attempt: int) -> bool:
+        """Whether a test whose attempt number `attempt` failed may run again."""
+        return attempt < self.per_test and self.spent < self.total
+
+    def spend(self):
+        self.spent += 1
+
+
+class AttemptRecorder:
+    """Turns phase reports into (nodeid, attempt, outcome, seconds) rows."""
+
+    def __init__(self):
+        self.results: List[Tuple[str, int, str, float]] = []
+        self._pending: Dict[Tuple[str, int], List] = {}
+
+    def observe(self, report):
+        key = (report.nodeid, getattr(report, "rerun", 0))
+        reports = self._pending.setdefault(key, [])
+        reports.append(report)
+        if report.when == "teardown":
+            del self._pending[key]
+            self.results.append((key[0], key[1], attempt_outcome(reports),
+                                 sum(phase.duration for phase in reports)))
+
+    def flaky(self) -> List[str]:
+        """Tests that failed and then passed on a rerun in this session."""
+        attempts: Dict[str, List[str]] = {}
+        for nodeid, attempt, outcome, _ in sorted(self.results):
+            attempts.setdefault(nodeid, []).append(outcome)
+        return [nodeid for nodeid, outcomes in attempts.items()
+                if len(outcomes) > 1 and outcomes[-1] in PASSING]
+
+
+def format_rates(stats: Dict[str, FlakeStats], quarantined: Iterable[str] = (),
+                 limit: Optional[int] = None) -> List[str]:
+    """Render tests with any flaky or failed session, worst flake rate first."""
+    quarantined = set(quarantined)
+    rows = sorted((entry for entry in stats.values() if entry.flaky or entry.failed),
+                  key=lambda entry: (-entry.flake_rate, -entry.fail_rate, entry.nodeid))
+    lines = [f"{'flaky':>7}{'failed':>8}{'runs':>6}{'mean':>9}  test"]
+    for entry in rows[:limit]:
+        mark = "  [quarantined]" if entry.nodeid in quarantined else ""
+        lines.append(f"{entry.flake_rate:>7.0%}{entry.fail_rate:>8.0%}{entry.runs:>6}"
+                     f"{entry.mean_duration:>8.1f}s  {entry.nodeid}{mark}")
+    if len(lines) == 1:
+        lines.append("no flaky or failing tests recorded")
+    return lines
+
+
+def main(argv: List[str] = None) -> int:
+    """Print flake and failure rates from the history database."""
+    parser = argparse.ArgumentParser(description="Report per-test flake rates")
+    parser.add_argument("--db", default=config.FLAKE_DB)
+    parser.add_argument("--window", type=int, default=config.FLAKE_WINDOW,
+                        help="Most recent sessions per test to consider")
+    parser.add_argument("--limit", type=int, default=None, help="Show at most this many tests")
+    args = parser.parse_args(argv)
+
+    store = FlakeStore(args.db)
+    stats = store.stats(args.window)
+    if not stats:
+        print(f"No test history in {args.db}")
+        return 0
+    for line in format_rates(stats, store.quarantined(window=args.window), args.limit):
+        print(line)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,7 +1,24 @@
 """Helper utilities for tests."""
+import copy
+import csv
+import hashlib
+import json
 import os
 from datetime import datetime
 from pathlib import Path
+from typing import Dict, Iterator, Tuple
+import pytest
+from utils.config import config
+
+ROOT = Path(__file__).resolve().parent.parent
+
+# Parsed data files shared by xdist workers and later runs, keyed by path,
+# mtime and size; kept in the repo's own (git-ignored) pytest cache
+DATA_CACHE_DIR = ROOT / ".pytest_cache" / "test-data"
+DATA_FORMATS = {".json": "json", ".jsonl": "jsonl", ".ndjson": "jsonl", ".csv": "csv"}
+
+# In-process memo: resolved path -> ((mtime_ns, size), parsed document)
+_data_cache: Dict[str, Tuple[Tuple[int, int], object]] = {}
 
 def take_screenshot(driver_or_page, test_name: str, framework: str = "selenium"):
     """Take screenshot and save with timestamp.
@@ -25,7 +42,142 @@ def take_screenshot(driver_or_page, test_name: str, framework: str = "selenium")
     
     return str(filepath)
 
-def get_test_data(filename: str):
-    """Load test data from file."""
-    # Placeholder for loading test data from JSON/CSV
-    pass
+def _data_path(filename: str) -> Path:
+    """Resolve filename as given, else relative to TEST_DATA_DIR."""
+    path = Path(filename)
+    if not path.is_absolute() and not path.exists():
+        # Relative data dirs are anchored at the repo root, not the cwd
+        path = ROOT / config.TEST_DATA_DIR / path
+    if not path.exists():
+        raise FileNotFoundError(f"Test data file not found: {filename}")
+    return path.resolve()
+
+def _data_format(path: Path) -> str:
+    try:
+        return DATA_FORMATS[path.suffix.lower()]
+    except KeyError:
+        raise ValueError(f"Unsupported test data format: {path.name} "
+                         f"(use {', '.join(DATA_FORMATS)})") from None
+
+def _stamp(path: Path) -> Tuple[int, int]:
+    stat = path.stat()
+    return stat.st_mtime_ns, stat.st_size
+
+def _select(document, key: str, path: Path):
+    """document[key] when a key is given."""
+    if key is None:
+        return document
+    if not isinstance(document, dict) or key not in document:
+        raise KeyError(f"{path.name} has no top-level key {key!r}")
+    return document[key]
+
+def _stream_records(path: Path) -> Iterator:
+    """Yield CSV rows / JSONL lines one at a time; a JSON file is read whole."""
+    data_format = _data_format(path)
+    with open(path, newline="", encoding="utf-8") as handle:
+        if data_format == "csv":
+            yield from csv.DictReader(handle)
+        elif data_format == "jsonl":
+            for line_number, line in enumerate(handle, 1):
+                if not line.strip():
+                    continue
+                try:
+                    yield json.loads(line)
+                except ValueError as error:
+                    raise ValueError(f"{path}:{line_number}: {error}") from None
+        else:
+            yield json.load(handle)
+
+def _parse(path: Path):
+    """Whole document: the JSON value, or the list of CSV/JSONL records."""
+    records = _stream_records(path)
+    return next(records) if _data_format(path) == "json" else list(records)
+
+def get_test_data(filename: str, key: str = None):
+    """Load test data from a JSON, JSONL or CSV file.
+    
+    Parsed files are memoized by path, mtime and size, in memory and as
+    JSON under DATA_CACHE_DIR that other xdist workers reuse; editing the
+    file invalidates both. Callers get their own copy, so mutating it does
+    not leak into later tests.
+    
+    Args:
+        filename: Path, or name relative to TEST_DATA_DIR
+        key: Top-level key to return from a JSON object
+        
+    Returns:
+        The JSON value, or a list of dicts for CSV (values are strings) and JSONL
+    """
+    path = _data_path(filename)
+    stamp = _stamp(path)
+    cached = _data_cache.get(str(path))
+    if cached is None or cached[0] != stamp:
+        digest = hashlib.sha1(f"{path}|{stamp[0]}|{stamp[1]}".encode()).hexdigest()
+        cache_path = DATA_CACHE_DIR / f"{path.stem}-{digest[:16]}.json"
+        try:
+            document = json.loads(cache_path.read_text(encoding="utf-8"))
+        except (OSError, ValueError):
+            document = _parse(path)
+            DATA_CACHE_DIR.mkdir(parents=True, exist_ok=True)
+            # Write then rename so a concurrent worker never reads half a file
+            partial = cache_path.with_suffix(f".{os.getpid()}.tmp")
+            partial.write_text(json.dumps(document), encoding="utf-8")
+            os.replace(partial, cache_path)
+        cached = _data_cache[str(path)] = (stamp, document)
+    return copy.deepcopy(_select(cached[1], key, path))
+
+def iter_test_data(filename: str, key: str = None) -> Iterator:
+    """Yield the records of a data file without loading it whole.
+    
+    CSV and JSONL files are streamed row by row unless get_test_data()
+    already parsed them; a JSON file must hold a list (or key must name one).
+    """
+    path = _data_path(filename)
+    cached = _data_cache.get(str(path))
+    shared = cached is not None and cached[0] == _stamp(path)
+    if shared:
+        records = _select(cached[1], key, path)
+    elif _data_format(path) == "json":
+        records = _select(next(_stream_records(path)), key, path)
+    else:
+        records = _stream_records(path)
+    if isinstance(records, dict):
+        raise TypeError(f"{path.name} holds an object; pass key= to pick a list of records")
+    # Memoized records are copied so callers cannot mutate the cache
+    yield from (map(copy.deepcopy, records) if shared else records)
+
+class _DataParams:
+    """Re-iterable parameter sets for pytest.mark.parametrize."""
+    
+    def __init__(self, names, filename: str, key: str, id_field: str):
+        self.names = names
+        self.filename = filename
+        self.key = key
+        self.id_field = id_field
+        
+    def __iter__(self):
+        for index, record in enumerate(iter_test_data(self.filename, self.key)):
+            try:
+                values = [record[name] for name in self.names]
+            except KeyError as error:
+                raise KeyError(f"Record {index} of {self.filename} has no field {error}") from None
+            # Only the selected fields are kept, never the whole record
+            case_id = str(record[self.id_field]) if self.id_field else None
+            yield pytest.param(*values, id=case_id)
+
+def parametrize_data(argnames: str, filename: str, key: str = None, id_field: str = None, **kwargs):
+    """pytest.mark.parametrize over the records of a data file.
+    
+    Example:
+        @parametrize_data("username,password,error", "login_cases.csv", id_field="case")
+        def test_login(username, password, error): ...
+        
+    Args:
+        argnames: Comma-separated record fields passed to the test
+        filename: Data file, as for get_test_data()
+        key: Top-level key of a JSON object holding the records
+        id_field: Record field used as the test id (pytest generates ids otherwise)
+        kwargs: Passed on to pytest.mark.parametrize (e.g. indirect, scope)
+    """
+    names = [name.strip() for name in argnames.split(",")]
+    return pytest.mark.parametrize(names, _DataParams(names, filename, key, id_field), **kwargs)
@@ -0,0 +1,283 @@
+"""Change-aware test selection based on page-object coverage.
+
+Recording (``--impact-record``) profiles each test from setup to teardown and
+notes every function under ``pages/`` it calls, as
+``pages/common/cart_page.py::CartPage.remove_item``. For methods it also
+notes each page-object class in the instance's MRO, as
+``pages/selenium/cart_page.py::CartPage``, so an edit to a per-engine
+subclass that only inherits its methods still selects the tests using it.
+The mapping from test to symbols is merged into ``IMPACT_MAP``.
+
+Selection (``--impact-since <git ref>``) diffs the working tree against the
+ref and keeps only the tests that exercised a changed function, or whose
+class or module changed at class/module level, plus tests in changed test
+files and tests that are not in the map yet. Changes to ``utils/``, any
+``conftest.py``, the data files under ``tests/data/``, the pytest/requirements
+files or a deleted page module fall back to the full suite.
+
+    python -m utils.impact origin/main    # print the selected node ids
+"""
+import argparse
+import ast
+import json
+import os
+import re
+import subprocess
+import sys
+import threading
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+
+from utils.config import config
+
+ROOT = Path(__file__).resolve().parent.parent
+PAGES_DIR = ROOT / "pages"
+# Changes here can affect any test
+FULL_SUITE_PATTERNS = (
+    re.compile(r"^utils/"),
+    re.compile(r"(^|/)conftest\.py$"),
+    # Data-driven tests are not profiled per file they read
+    re.compile(r"^tests/data/"),
+    re.compile(r"^(pytest\.ini|setup\.cfg|pyproject\.toml|tox\.ini|requirements.*\.txt)$"),
+)
+
+
+# ---------- source indexing ----------
+
+class ModuleIndex:
+    """Qualified names of the functions and classes in one source file."""
+
+    def __init__(self, path: Path):
+        tree = ast.parse(path.read_text(), filename=str(path))
+        self.by_line: Dict[int, str] = {}  # first line (def or decorator) -> qualname
+        self.spans: List[Tuple[int, int, str]] = []  # start line, end line, qualname
+        self._walk(tree.body, "")
+
+    def _walk(self, body, prefix: str):
+        for node in body:
+            if isinstance(node, (ast.FunctionDef, ast.AsyncFunctionDef, ast.ClassDef)):
+                qualname = f"{prefix}{node.name}"
+                start = min([node.lineno] + [decorator.lineno for decorator in node.decorator_list])
+                self.by_line[node.lineno] = qualname
+                self.by_line[start] = qualname
+                is_class = isinstance(node, ast.ClassDef)
+                self.spans.append((start, node.end_lineno, qualname))
+                self._walk(node.body, f"{qualname}." if is_class else f"{qualname}.<locals>.")
+
+    def symbols_for_lines(self, lines: Iterable[int]) -> Optional[Set[str]]:
+        """Symbols touched by changed lines; None if module-level code changed.
+
+        A changed line inside a function selects that function. A changed
+        line in a class body outside any method (e.g. a locator constant)
+        selects the class, which matches every method recorded for it.
+        """
+        symbols = set()
+        for line in lines:
+            enclosing = [span for span in self.spans if span[0] <= line <= span[1]]
+            if not enclosing:
+                return None
+            innermost = max(enclosing, key=lambda span: span[0])
+            symbols.add(innermost[2])
+        return symbols
+
+
+_indexes: Dict[str, Optional[ModuleIndex]] = {}
+
+
+def _index(filename: str) -> Optional[ModuleIndex]:
+    if filename not in _indexes:
+        try:
+            _indexes[filename] = ModuleIndex(Path(filename))
+        except (OSError, SyntaxError):
+            _indexes[filename] = None
+    return _indexes[filename]
+
+
+def _relative(filename: str) -> str:
+    return Path(filename).resolve().relative_to(ROOT).as_posix()
+
+
+# ---------- recording ----------
+
+class CoverageRecorder:
+    """Collects the page-object functions called while active."""
+
+    def __init__(self, pages_dir: Path = PAGES_DIR):
+        self.prefix = str(pages_dir.resolve()) + os.sep
+        self.symbols: Set[str] = set()
+        self._codes: Dict[object, Optional[str]] = {}
+        self._classes: Dict[type, Tuple[str, ...]] = {}
+
+    def start(self):
+        self.symbols = set()
+        sys.setprofile(self._profile)
+        threading.setprofile(self._profile)
+
+    def stop(self) -> List[str]:
+        sys.setprofile(None)
+        threading.setprofile(None)
+        return sorted(self.symbols)
+
+    def _profile(self, frame, event, arg):
+        if event != "call":
+            return
+        code = frame.f_code
+        symbol = self._codes.get(code, False)
+        if symbol is False:
+            symbol = self._codes[code] = self._symbol(code)
+        if symbol:
+            self.symbols.add(symbol)
+            instance = frame.f_locals.get("self")
+            if instance is not None:
+                self.symbols.update(self._class_symbols(type(instance)))
+
+    def _symbol(self, code) -> Optional[str]:
+        """Map a code object under pages/ to "path::Qual.name"."""
+        filename = code.co_filename
+        if not filename.startswith(self.prefix):
+            return None
+        index = _index(filename)
+        qualname = index.by_line.get(code.co_firstlineno) if index else None
+        if qualname is None:
+            return None
+        return f"{_relative(filename)}::{qualname}"
+
+    def _class_symbols(self, cls: type) -> Tuple[str, ...]:
+        """Map every class under pages/ in cls.__mro__ to "path::Qualname"."""
+        symbols = self._classes.get(cls)
+        if symbols is None:
+            symbols = []
+            for klass in cls.__mro__:
+                filename = getattr(sys.modules.get(klass.__module__), "__file__", None)
+                if filename and str(Path(filename).resolve()).startswith(self.prefix):
+                    symbols.append(f"{_relative(filename)}::{klass.__qualname__}")
+            symbols = self._classes[cls] = tuple(symbols)
+        return symbols
+
+
+def load_map(path: str = None) -> Dict[str, List[str]]:
+    """Read the test -> symbols map (empty if missing)."""
+    try:
+        return json.loads(Path(path or config.IMPACT_MAP).read_text()).get("tests", {})
+    except (OSError, ValueError):
+        return {}
+
+
+def save_map(tests: Dict[str, List[str]], path: str = None):
+    """Merge tests into the stored map and write it."""
+    target = Path(path or config.IMPACT_MAP)
+    merged = load_map(str(target))
+    merged.update(tests)
+    target.parent.mkdir(parents=True, exist_ok=True)
+    target.write_text(json.dumps({"version": 1, "tests": dict(sorted(merged.items()))}, indent=1))
+
+
+# ---------- selection ----------
+
+class ChangeSet:
+    """Changed files and line numbers relative to a git ref."""
+
+    def __init__(self, files: Dict[str, Set[int]], deleted: Set[str]):
+        self.files = files
+        self.deleted = deleted
+
+    @classmethod
+    def from_git(cls, ref: str, cwd: Path = ROOT) -> "ChangeSet":
+        """Diff the working tree against ref."""
+        diff = subprocess.run(
+            ["git", "diff", "--unified=0", "--no-color", "--no-renames", ref, "--"],
+            cwd=cwd, capture_output=True, text=True, check=True,
+        ).stdout
+        untracked = subprocess.run(
+            ["git", "ls-files", "--others", "--exclude-standard"],
+            cwd=cwd, capture_output=True, text=True, check=True,
+        ).stdout.split()
+        return cls.parse(diff, untracked)
+
+    @classmethod
+    def parse(cls, diff: str, untracked: Iterable[str] = ()) -> "ChangeSet":
+        """Parse `git diff --unified=0` output."""
+        files: Dict[str, Set[int]] = {}
+        deleted: Set[str] = set()
+        current = None
+        old_path = None
+        for line in diff.splitlines():
+            if line.startswith("--- "):
+                old_path = line[6:] if line.startswith("--- a/") else None
+            elif line.startswith("+++ "):
+                if line == "+++ /dev/null":
+                    deleted.add(old_path)
+                    current = None
+                else:
+                    current = line[6:]
+                    files.setdefault(current, set())
+            elif line.startswith("@@") and current is not None:
+                match = re.match(r"@@ -\d+(?:,\d+)? \+(\d+)(?:,(\d+))? @@", line)
+                start, count = int(match.group(1)), int(match.group(2) or 1)
+                # Pure deletions (count 0) touch the line they were removed after
+                files[current].update(range(start, start + count) if count else [max(start, 1)])
+        for path in untracked:
+            files.setdefault(path, set()).add(0)
+        return cls(files, deleted)
+
+
+def select(nodeids: Iterable[str], changes: ChangeSet,
+           impact_map: Dict[str, List[str]]) -> Tuple[Optional[Set[str]], str]:
+    """Decide which tests to run.
+
+    Returns:
+        (selected node ids or None for the full suite, human readable reason)
+    """
+    changed = set(changes.files) | changes.deleted
+    for path in sorted(changed):
+        if any(pattern.search(path) for pattern in FULL_SUITE_PATTERNS):
+            return None, f"{path} changed"
+        if path.startswith("pages/") and path in changes.deleted:
+            return None, f"{path} deleted"
+
+    changed_symbols: Set[str] = set()
+    changed_modules: Set[str] = set()
+    for path, lines in changes.files.items():
+        if not (path.startswith("pages/") and path.endswith(".py")):
+            continue
+        index = ModuleIndex(ROOT / path) if (ROOT / path).exists() else None
+        symbols = index.symbols_for_lines(lines) if index and 0 not in lines else None
+        if symbols is None:
+            changed_modules.add(path)
+        else:
+            changed_symbols.update(f"{path}::{symbol}" for symbol in symbols)
+
+    def affected(symbol: str) -> bool:
+        if symbol.split("::", 1)[0] in changed_modules:
+            return True
+        return any(symbol == changed or symbol.startswith(changed + ".")
+                   for changed in changed_symbols)
+
+    selected = set()
+    for nodeid in nodeids:
+        test_file = nodeid.split("::", 1)[0]
+        symbols = impact_map.get(nodeid)
+        if symbols is None or test_file in changed or any(affected(symbol) for symbol in symbols):
+            selected.add(nodeid)
+    return selected, f"{len(changed_symbols)} changed symbols, {len(changed_modules)} changed modules"
+
+
+def main(argv: List[str] = None) -> int:
+    """Print the tests affected by changes since a git ref."""
+    parser = argparse.ArgumentParser(description="Select tests affected by a git diff")
+    parser.add_argument("ref", help="Git ref to diff against, e.g. origin/main")
+    parser.add_argument("--map", default=config.IMPACT_MAP)
+    args = parser.parse_args(argv)
+
+    impact_map = load_map(args.map)
+    selected, reason = select(impact_map, ChangeSet.from_git(args.ref), impact_map)
+    if selected is None:
+        print(f"ALL  # {reason}")
+    else:
+        for nodeid in sorted(selected):
+            print(nodeid)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,285 @@
+"""Named Selenium launch profiles and a launch benchmark.
+
+A profile bundles the page load strategy, browser switches and preferences,
+the background services to turn off and whether to use a throwaway profile
+directory:
+
+- ``default``: the factory's plain launch, ``normal`` page loads
+- ``fastest-headless``: always headless, ``eager`` page loads (return at
+  DOMContentLoaded instead of waiting for every image), background
+  networking, extensions, component updates and first-run work off, and a
+  throwaway profile, on /dev/shm when it has room
+- ``ci-stable``: ``normal`` page loads, the same services off, no
+  throttling of background timers or renderers, a throwaway profile
+- ``debug``: headed, DevTools opened, slower but inspectable
+
+Select one with ``LAUNCH_PROFILE`` or ``--launch-profile``. Compare them on
+this machine before choosing:
+
+    python -m utils.launch_profiles --browser chrome --local-server --rounds 5
+"""
+import argparse
+import shutil
+import sys
+import tempfile
+from typing import Dict, List, Optional
+
+from utils.config import config
+
+PROFILES: Dict[str, Dict] = {
+    "default": {"page_load_strategy": "normal", "headless": None, "quiet": False,
+                "stable": False, "throwaway_dir": False, "devtools": False},
+    "fastest-headless": {"page_load_strategy": "eager", "headless": True, "quiet": True,
+                         "stable": False, "throwaway_dir": True, "devtools": False},
+    "ci-stable": {"page_load_strategy": "normal", "headless": None, "quiet": True,
+                  "stable": True, "throwaway_dir": True, "devtools": False},
+    "debug": {"page_load_strategy": "normal", "headless": False, "quiet": False,
+              "stable": False, "throwaway_dir": False, "devtools": True},
+}
+
+# Background services and first-run work a test browser never needs
+CHROMIUM_QUIET_ARGUMENTS = (
+    "--disable-background-networking",
+    "--disable-component-update",
+    "--disable-extensions",
+    "--disable-default-apps",
+    "--disable-sync",
+    "--disable-client-side-phishing-detection",
+    "--disable-domain-reliability",
+    "--disable-features=Translate,OptimizationHints,MediaRouter,InterestFeedContentSuggestions",
+    "--no-first-run",
+    "--no-default-browser-check",
+    "--metrics-recording-only",
+    "--mute-audio",
+    "--password-store=basic",
+    "--use-mock-keychain",
+)
+# Keep timers and rendering running at full speed when the window is not focused
+CHROMIUM_STABLE_ARGUMENTS = (
+    "--disable-background-timer-throttling",
+    "--disable-backgrounding-occluded-windows",
+    "--disable-renderer-backgrounding",
+    "--disable-hang-monitor",
+    "--disable-ipc-flooding-protection",
+)
+CHROMIUM_QUIET_PREFS = {
+    "credentials_enable_service": False,
+    "profile.password_manager_enabled": False,
+    "translate.enabled": False,
+}
+FIREFOX_QUIET_PREFERENCES = {
+    "app.update.auto": False,
+    "browser.shell.checkDefaultBrowser": False,
+    "browser.startup.homepage_override.mstone": "ignore",
+    "browser.aboutwelcome.enabled": False,
+    "browser.newtabpage.enabled": False,
+    "browser.safebrowsing.malware.enabled": False,
+    "browser.safebrowsing.phishing.enabled": False,
+    "datareporting.policy.dataSubmissionEnabled": False,
+    "datareporting.healthreport.uploadEnabled": False,
+    "toolkit.telemetry.enabled": False,
+    "extensions.update.enabled": False,
+    "extensions.getAddons.cache.enabled": False,
+    "media.gmp-manager.updateEnabled": False,
+    "network.captive-portal-service.enabled": False,
+    "network.connectivity-service.enabled": False,
+}
+FIREFOX_STABLE_PREFERENCES = {
+    "dom.min_background_timeout_value": 4,
+    "dom.timeout.enable_budget_timer_throttling": False,
+}
+# Free space /dev/shm needs before a profile goes there; container defaults
+# (64 MiB in Docker) fill up with a single profile's cache
+SHM_MIN_FREE = 512 * 1024 * 1024
+
+
+class LaunchProfile:
+    """Launch settings for one named profile."""
+
+    def __init__(self, name: str = "default"):
+        if name not in PROFILES:
+            raise ValueError(f"Unknown launch profile: {name} (choose from {', '.join(PROFILES)})")
+        self.name = name
+        settings = PROFILES[name]
+        self.page_load_strategy: str = settings["page_load_strategy"]
+        self.forced_headless: Optional[bool] = settings["headless"]
+        self.quiet: bool = settings["quiet"]
+        self.stable: bool = settings["stable"]
+        self.throwaway_dir: bool = settings["throwaway_dir"]
+        self.devtools: bool = settings["devtools"]
+
+    @classmethod
+    def from_config(cls, name: str = None) -> "LaunchProfile":
+        """Build the profile selected by config.LAUNCH_PROFILE."""
+        return cls(name or config.LAUNCH_PROFILE)
+
+    def headless(self, requested: bool) -> bool:
+        """Headless mode: the profile's if it fixes one, else requested."""
+        return requested if self.forced_headless is None else self.forced_headless
+
+    def chromium_arguments(self) -> List[str]:
+        """Command line switches for Chrome/Edge."""
+        arguments = []
+        if self.quiet:
+            arguments.extend(CHROMIUM_QUIET_ARGUMENTS)
+        if self.stable:
+            arguments.extend(CHROMIUM_STABLE_ARGUMENTS)
+        if self.devtools:
+            arguments.append("--auto-open-devtools-for-tabs")
+        return arguments
+
+    def chromium_prefs(self) -> Dict:
+        """Profile preferences for Chrome/Edge."""
+        return dict(CHROMIUM_QUIET_PREFS) if self.quiet else {}
+
+    def firefox_arguments(self) -> List[str]:
+        """Command line switches for Firefox."""
+        return ["-devtools"] if self.devtools else []
+
+    def firefox_preferences(self) -> Dict:
+        """about:config preferences for Firefox."""
+        prefs = {}
+        if self.quiet:
+            prefs.update(FIREFOX_QUIET_PREFERENCES)
+        if self.stable:
+            prefs.update(FIREFOX_STABLE_PREFERENCES)
+        return prefs
+
+    def make_profile_dir(self) -> Optional[str]:
+        """A fresh browser profile directory; None to let the driver choose.
+
+        The caller owns the directory and hands it to remove_on_quit() once
+        the driver is up.
+        """
+        if not self.throwaway_dir:
+            return None
+        # Memory-backed when it has room: profile writes are a large part of startup I/O
+        parent = "/dev/shm" if self.name == "fastest-headless" and _shm_has_room() else None
+        return tempfile.mkdtemp(prefix="selenium-profile-", dir=parent)
+
+    def describe(self) -> str:
+        settings = [self.page_load_strategy + " page loads"]
+        if self.forced_headless is not None:
+            settings.append("headless" if self.forced_headless else "headed")
+        if self.quiet:
+            settings.append("background services off")
+        if self.stable:
+            settings.append("no background throttling")
+        if self.throwaway_dir:
+            settings.append("throwaway profile")
+        if self.devtools:
+            settings.append("devtools")
+        return f"{self.name}: {', '.join(settings)}"
+
+
+def _shm_has_room() -> bool:
+    try:
+        return shutil.disk_usage("/dev/shm").free >= SHM_MIN_FREE
+    except OSError:
+        return False
+
+
+def remove_on_quit(driver, profile_dir: str):
+    """Delete profile_dir when driver quits, even if quitting fails."""
+    quit_driver = driver.quit
+
+    def quit():
+        try:
+            quit_driver()
+        finally:
+            shutil.rmtree(profile_dir, ignore_errors=True)
+
+    driver.quit = quit
+    return driver
+
+
+def benchmark_profiles(profiles: List[str], browser: str, rounds: int = None,
+                       warmup: int = None) -> Dict:
+    """Measure cold launch and first navigation for each profile.
+
+    cold_launch: DriverFactory.get_driver() until it returns.
+    first_navigation: on a just-launched driver, load the login page until
+    the login button is clickable (so eager and normal loads are compared
+    at the same point: the page is usable).
+
+    Returns:
+        metric name ("launch.<browser>.<profile>.<phase>") -> BenchmarkStats
+    """
+    from selenium.webdriver.common.by import By
+    from selenium.webdriver.support import expected_conditions as EC
+    from selenium.webdriver.support.ui import WebDriverWait
+    from utils.benchmark import Benchmark
+    from utils.driver_factory import DriverFactory
+
+    bench = Benchmark(rounds=rounds, warmup=warmup)
+
+    def launch(profile: str):
+        return DriverFactory.get_driver(browser=browser, profile=profile)
+
+    def quit_driver(driver):
+        if driver is not None:
+            driver.quit()
+
+    for profile in profiles:
+        prefix = f"launch.{browser}.{profile}"
+
+        def cold_launch(state, profile=profile):
+            state["driver"] = launch(profile)
+
+        bench.measure(f"{prefix}.cold_launch", cold_launch, setup=dict,
+                      teardown=lambda state: quit_driver(state.get("driver")))
+
+        def first_navigation(driver):
+            driver.get(f"{config.BASE_URL}/")
+            WebDriverWait(driver, config.SELENIUM_WAIT_TIMEOUT).until(
+                EC.element_to_be_clickable((By.ID, "login-button"))
+            )
+
+        bench.measure(f"{prefix}.first_navigation", first_navigation,
+                      setup=lambda profile=profile: launch(profile), teardown=quit_driver)
+    return bench.results
+
+
+def main(argv: List[str] = None) -> int:
+    """Benchmark launch profiles and print (and optionally save) the results."""
+    parser = argparse.ArgumentParser(description="Benchmark Selenium launch profiles")
+    parser.add_argument("--browser", default=config.SELENIUM_BROWSER, choices=["chrome", "firefox", "edge"])
+    parser.add_argument("--profiles", default=",".join(PROFILES),
+                        help="Comma-separated profiles to measure (default: all)")
+    parser.add_argument("--rounds", type=int, default=config.BENCHMARK_ROUNDS)
+    parser.add_argument("--warmup", type=int, default=config.BENCHMARK_WARMUP)
+    parser.add_argument("--json", default=None, help="Write results in the benchmark JSON format")
+    parser.add_argument("--local-server", action="store_true",
+                        help="Navigate to the bundled local storefront instead of BASE_URL")
+    args = parser.parse_args(argv)
+    profiles = [name.strip() for name in args.profiles.split(",") if name.strip()]
+    unknown = [name for name in profiles if name not in PROFILES]
+    if unknown or not profiles:
+        parser.error(f"Unknown launch profile(s): {', '.join(unknown)} (choose from {', '.join(PROFILES)})")
+
+    from utils.benchmark import format_table, write_results
+    server = None
+    if args.local_server:
+        from utils.local_server import LocalStorefront
+        server = LocalStorefront().start()
+        config.BASE_URL = server.url
+    try:
+        results = benchmark_profiles(profiles, args.browser, args.rounds, args.warmup)
+    except Exception as error:
+        print(f"Launch failed: {type(error).__name__}: {str(error).strip().splitlines()[0]}")
+        return 1
+    finally:
+        if server is not None:
+            server.stop()
+
+    for name in profiles:
+        print(LaunchProfile(name).describe())
+    for line in format_table(results):
+        print(line)
+    if args.json:
+        write_results(results, args.json)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,304 @@
+"""Load generation with the async page objects as virtual users.
+
+Each virtual user repeats the shopper flow (login, add to cart, open the
+cart, start checkout) in a fresh BrowserContext of one shared browser, with
+a randomized think time between steps. Users start spread evenly over the
+ramp and stop starting iterations once the duration is up. Every step is
+streamed to a CSV or JSON-lines time series as it completes, and the run
+ends with throughput and p50/p95/p99 latency per step:
+
+    python -m utils.load_test --local-server --users 20 --ramp 10 --duration 60 \\
+        --think 1.0 --samples reports/load.csv --summary reports/load.json
+"""
+import argparse
+import asyncio
+import csv
+import json
+import random
+import sys
+import time
+from pathlib import Path
+from typing import Awaitable, Callable, Dict, List, Optional, Tuple
+
+from playwright.async_api import Browser, Page, async_playwright
+
+from pages.playwright_async.cart_page import CartPage
+from pages.playwright_async.login_page import LoginPage
+from pages.playwright_async.products_page import ProductsPage
+from utils.benchmark import environment, percentile
+from utils.catalog import PRODUCTS
+from utils.config import config
+
+Step = Tuple[str, Callable[[Page, random.Random], Awaitable[None]]]
+SAMPLE_FIELDS = ("time", "elapsed_s", "user", "iteration", "step", "latency_ms", "ok", "error")
+
+
+# ---------- shopper flow ----------
+
+async def _login(page: Page, rng: random.Random):
+    login_page = LoginPage(page)
+    await login_page.navigate()
+    await login_page.login(config.VALID_USER, config.PASSWORD)
+    await login_page.wait_for_url("**/inventory.html")
+
+
+async def _add_to_cart(page: Page, rng: random.Random):
+    products_page = ProductsPage(page)
+    for product in rng.sample(PRODUCTS, rng.randint(1, 3)):
+        await products_page.add_item_to_cart(product.slug)
+
+
+async def _open_cart(page: Page, rng: random.Random):
+    await ProductsPage(page).go_to_cart()
+    await CartPage(page).wait_for_url("**/cart.html")
+
+
+async def _checkout(page: Page, rng: random.Random):
+    cart_page = CartPage(page)
+    await cart_page.proceed_to_checkout()
+    await cart_page.wait_for_url("**/checkout-step-one.html")
+
+
+SHOPPER_FLOW: List[Step] = [
+    ("login", _login),
+    ("add_to_cart", _add_to_cart),
+    ("open_cart", _open_cart),
+    ("checkout", _checkout),
+]
+
+
+# ---------- results ----------
+
+class SampleWriter:
+    """Streams one record per step to .csv or .jsonl as it completes."""
+
+    def __init__(self, path: str):
+        self.path = Path(path)
+        suffix = self.path.suffix.lower()
+        if suffix not in (".csv", ".jsonl"):
+            raise ValueError(f"Samples must go to a .csv or .jsonl file, not {self.path.name}")
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._handle = open(self.path, "w", newline="")
+        self._csv = csv.writer(self._handle) if suffix == ".csv" else None
+        if self._csv is not None:
+            self._csv.writerow(SAMPLE_FIELDS)
+
+    def write(self, sample: Dict):
+        if self._csv is not None:
+            self._csv.writerow([sample[field] for field in SAMPLE_FIELDS])
+        else:
+            self._handle.write(json.dumps(sample) + "\n")
+        # Flushed per sample so a live run can be tailed or plotted
+        self._handle.flush()
+
+    def close(self):
+        self._handle.close()
+
+
+class LoadStats:
+    """Latencies and errors per step for one run."""
+
+    def __init__(self):
+        self.latencies: Dict[str, List[float]] = {}  # step -> seconds of successful runs
+        self.errors: Dict[str, int] = {}
+        self.iterations = 0
+        self.completed = 0
+        self.elapsed = 0.0
+
+    def record(self, step: str, seconds: float, ok: bool):
+        if ok:
+            self.latencies.setdefault(step, []).append(seconds)
+        else:
+            self.errors[step] = self.errors.get(step, 0) + 1
+
+    def summary(self) -> Dict[str, Dict]:
+        """Per-step count, errors, throughput and latency percentiles."""
+        steps = {}
+        elapsed = max(self.elapsed, 1e-9)
+        for step in list(self.latencies) + [step for step in self.errors if step not in self.latencies]:
+            latencies = self.latencies.get(step, [])
+            row = {
+                "count": len(latencies),
+                "errors": self.errors.get(step, 0),
+                "throughput_per_s": round(len(latencies) / elapsed, 3),
+            }
+            # No latency figures for a step that never succeeded
+            for name, pct in (("p50_ms", 50), ("p95_ms", 95), ("p99_ms", 99), ("max_ms", 100)):
+                row[name] = round(percentile(latencies, pct) * 1000, 1) if latencies else None
+            steps[step] = row
+        return steps
+
+
+def format_summary(stats: LoadStats) -> List[str]:
+    """Render the per-step summary as aligned text lines."""
+    lines = [
+        f"{stats.iterations} iterations ({stats.completed} completed) in {stats.elapsed:.1f}s, "
+        f"{stats.completed / max(stats.elapsed, 1e-9):.2f} completed flows/s",
+        f"{'step':<16}{'count':>8}{'errors':>8}{'per s':>9}{'p50':>10}{'p95':>10}{'p99':>10}",
+    ]
+    for step, row in stats.summary().items():
+        latency = "".join(f"{row[name]:>8.0f}ms" if row[name] is not None else f"{'-':>10}"
+                          for name in ("p50_ms", "p95_ms", "p99_ms"))
+        lines.append(f"{step:<16}{row['count']:>8}{row['errors']:>8}{row['throughput_per_s']:>9.2f}{latency}")
+    return lines
+
+
+# ---------- runner ----------
+
+class LoadTest:
+    """Runs the flow as concurrent virtual users in one browser."""
+
+    def __init__(self, users: int = 10, ramp: float = 10.0, duration: float = 60.0,
+                 think: float = 1.0, iterations: Optional[int] = None, flow: List[Step] = None,
+                 browser_name: str = None, headless: bool = None, seed: int = None,
+                 writer: SampleWriter = None, progress_every: float = 5.0):
+        self.users = users
+        self.ramp = ramp
+        self.duration = duration
+        self.think = think
+        self.iterations = iterations
+        self.flow = flow or SHOPPER_FLOW
+        self.browser_name = browser_name or config.PLAYWRIGHT_BROWSER
+        self.headless = headless if headless is not None else config.HEADLESS
+        self.seed = seed
+        self.writer = writer
+        self.progress_every = progress_every
+        self.stats = LoadStats()
+        self._started = 0.0
+        self._window = [0, 0]  # samples, errors since the last progress line
+
+    async def run(self) -> LoadStats:
+        """Launch the browser, run every virtual user to the end and close it."""
+        async with async_playwright() as playwright:
+            browser = await getattr(playwright, self.browser_name).launch(headless=self.headless)
+            try:
+                self._started = time.perf_counter()
+                stop_at = self._started + self.duration
+                progress = asyncio.ensure_future(self._progress())
+                try:
+                    await asyncio.gather(*(self._virtual_user(browser, user, stop_at)
+                                           for user in range(self.users)))
+                finally:
+                    progress.cancel()
+                self.stats.elapsed = time.perf_counter() - self._started
+            finally:
+                await browser.close()
+        return self.stats
+
+    def run_sync(self) -> LoadStats:
+        return asyncio.run(self.run())
+
+    async def _virtual_user(self, browser: Browser, user: int, stop_at: float):
+        # Users join evenly over the ramp
+        await asyncio.sleep(user * self.ramp / max(self.users, 1))
+        rng = random.Random(None if self.seed is None else self.seed + user)
+        iteration = 0
+        while time.perf_counter() < stop_at and (self.iterations is None or iteration < self.iterations):
+            self.stats.iterations += 1
+            context = await browser.new_context(viewport=config.VIEWPORT)
+            context.set_default_timeout(config.PLAYWRIGHT_TIMEOUT)
+            try:
+                page = await context.new_page()
+                if await self._run_flow(page, rng, user, iteration):
+                    self.stats.completed += 1
+            finally:
+                await context.close()
+            iteration += 1
+
+    async def _run_flow(self, page: Page, rng: random.Random, user: int, iteration: int) -> bool:
+        """Run the steps with think time between them; stop at the first failure."""
+        for index, (name, step) in enumerate(self.flow):
+            if index and self.think > 0:
+                # Jitter keeps users from moving in lockstep
+                await asyncio.sleep(rng.uniform(0.5, 1.5) * self.think)
+            started = time.perf_counter()
+            error = ""
+            try:
+                await step(page, rng)
+            except Exception as exc:
+                message = str(exc).strip()
+                error = type(exc).__name__ + (f": {message.splitlines()[0]}" if message else "")
+            self._record(user, iteration, name, time.perf_counter() - started, error)
+            if error:
+                return False
+        return True
+
+    def _record(self, user: int, iteration: int, step: str, seconds: float, error: str):
+        self.stats.record(step, seconds, not error)
+        self._window[0] += 1
+        self._window[1] += bool(error)
+        if self.writer is not None:
+            self.writer.write({
+                "time": round(time.time(), 3),
+                "elapsed_s": round(time.perf_counter() - self._started, 3),
+                "user": user,
+                "iteration": iteration,
+                "step": step,
+                "latency_ms": round(seconds * 1000, 1),
+                "ok": not error,
+                "error": error,
+            })
+
+    async def _progress(self):
+        """Print steps/s and errors for each progress window."""
+        while True:
+            await asyncio.sleep(self.progress_every)
+            samples, errors = self._window
+            self._window = [0, 0]
+            elapsed = time.perf_counter() - self._started
+            print(f"[{elapsed:6.1f}s] {samples / self.progress_every:6.1f} steps/s, {errors} errors",
+                  flush=True)
+
+
+def main(argv: List[str] = None) -> int:
+    """Run the shopper flow as virtual users and report per-step latency."""
+    parser = argparse.ArgumentParser(description="Load test the storefront with the page objects")
+    parser.add_argument("--users", type=int, default=10, help="Concurrent virtual users")
+    parser.add_argument("--ramp", type=float, default=10.0, help="Seconds over which users start")
+    parser.add_argument("--duration", type=float, default=60.0,
+                        help="Seconds after which users stop starting new iterations")
+    parser.add_argument("--iterations", type=int, default=None, help="Maximum iterations per user")
+    parser.add_argument("--think", type=float, default=1.0,
+                        help="Mean think time between steps in seconds (0.5x-1.5x jitter)")
+    parser.add_argument("--seed", type=int, default=None, help="Seed for product choice and think time")
+    parser.add_argument("--samples", default=None, help="Stream per-step samples to a .csv or .jsonl file")
+    parser.add_argument("--summary", default=None, help="Write the per-step summary as JSON")
+    parser.add_argument("--local-server", action="store_true",
+                        help="Run against the bundled local storefront instead of BASE_URL")
+    args = parser.parse_args(argv)
+
+    server = None
+    if args.local_server:
+        from utils.local_server import LocalStorefront
+        server = LocalStorefront().start()
+        config.BASE_URL = server.url
+    writer = SampleWriter(args.samples) if args.samples else None
+    test = LoadTest(users=args.users, ramp=args.ramp, duration=args.duration, think=args.think,
+                    iterations=args.iterations, seed=args.seed, writer=writer)
+    try:
+        stats = test.run_sync()
+    finally:
+        if writer is not None:
+            writer.close()
+        if server is not None:
+            server.stop()
+
+    for line in format_summary(stats):
+        print(line)
+    if args.summary:
+        target = Path(args.summary)
+        target.parent.mkdir(parents=True, exist_ok=True)
+        target.write_text(json.dumps({
+            "environment": environment(),
+            "settings": {"users": args.users, "ramp_s": args.ramp, "duration_s": args.duration,
+                         "iterations": args.iterations, "think_s": args.think},
+            "elapsed_s": round(stats.elapsed, 3),
+            "iterations": stats.iterations,
+            "completed": stats.completed,
+            "steps": stats.summary(),
+        }, indent=2))
+    return 1 if stats.errors else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
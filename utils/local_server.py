@@ -0,0 +1,780 @@
+"""Local SauceDemo stand-in server for offline, low-latency test runs.
+
+Serves the login, inventory, cart and checkout pages with the same element
+ids, class names and ``data-test`` attributes as https://www.saucedemo.com so
+the page objects work unchanged against either target. Session state follows
+the real storefront: the logged-in user lives in the ``session-username``
+cookie and the cart in the ``cart-contents`` localStorage key.
+
+Run standalone with ``python -m utils.local_server --port 8000``.
+"""
+import argparse
+import html
+import json
+import threading
+from http.cookies import SimpleCookie
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Optional
+from urllib.parse import parse_qs, quote, urlsplit
+
+from utils.catalog import CART_STORAGE_KEY, PRODUCTS, SESSION_COOKIE, USERS
+
+LOCKED_USERS = ("locked_out_user",)
+
+_APP_JS = """
+(function () {
+  "use strict";
+  var CART_KEY = __CART_KEY__;
+  var SESSION_COOKIE = __SESSION_COOKIE__;
+  var USERS = __USERS__;
+  var LOCKED_USERS = __LOCKED_USERS__;
+  var PASSWORD = "secret_sauce";
+  var PRODUCTS = __PRODUCTS__;
+  var TAX_RATE = 0.08;
+
+  function byId(id) {
+    for (var i = 0; i < PRODUCTS.length; i++) {
+      if (PRODUCTS[i].id === id) { return PRODUCTS[i]; }
+    }
+    return null;
+  }
+
+  function getCart() {
+    try {
+      var ids = JSON.parse(window.localStorage.getItem(CART_KEY));
+      return Array.isArray(ids) ? ids.filter(function (id) { return byId(id) !== null; }) : [];
+    } catch (e) {
+      return [];
+    }
+  }
+
+  function setCart(ids) {
+    if (ids.length) {
+      window.localStorage.setItem(CART_KEY, JSON.stringify(ids));
+    } else {
+      window.localStorage.removeItem(CART_KEY);
+    }
+    updateBadge();
+  }
+
+  function updateBadge() {
+    var link = document.querySelector(".shopping_cart_link");
+    if (!link) { return; }
+    var badge = link.querySelector(".shopping_cart_badge");
+    var count = getCart().length;
+    if (count === 0) {
+      if (badge) { badge.parentNode.removeChild(badge); }
+      return;
+    }
+    if (!badge) {
+      badge = document.createElement("span");
+      badge.className = "shopping_cart_badge";
+      badge.setAttribute("data-test", "shopping-cart-badge");
+      link.appendChild(badge);
+    }
+    badge.textContent = String(count);
+  }
+
+  function money(value) {
+    return "$" + value.toFixed(2);
+  }
+
+  function cartButton(product, inCart, extraClass) {
+    var button = document.createElement("button");
+    button.id = (inCart ? "remove-" : "add-to-cart-") + product.slug;
+    button.name = button.id;
+    button.setAttribute("data-test", button.id);
+    button.className = "btn btn_small " + extraClass + " " + (inCart ? "btn_secondary" : "btn_primary");
+    button.textContent = inCart ? "Remove" : "Add to cart";
+    button.addEventListener("click", function () {
+      var cart = getCart();
+      var index = cart.indexOf(product.id);
+      if (inCart && index >= 0) {
+        cart.splice(index, 1);
+      } else if (!inCart && index < 0) {
+        cart.push(product.id);
+      }
+      setCart(cart);
+      button.parentNode.replaceChild(cartButton(product, !inCart, extraClass), button);
+    });
+    return button;
+  }
+
+  function showError(container, message) {
+    container.innerHTML = "";
+    container.className = "error-message-container error";
+    var heading = document.createElement("h3");
+    heading.setAttribute("data-test", "error");
+    heading.textContent = message;
+    var close = document.createElement("button");
+    close.className = "error-button";
+    close.setAttribute("data-test", "error-button");
+    close.addEventListener("click", function () {
+      container.innerHTML = "";
+      container.className = "error-message-container";
+    });
+    heading.appendChild(close);
+    container.appendChild(heading);
+  }
+
+  function initLogin() {
+    var form = document.getElementById("login_form");
+    var container = document.querySelector(".error-message-container");
+    form.addEventListener("submit", function (event) {
+      event.preventDefault();
+      var username = document.getElementById("user-name").value;
+      var password = document.getElementById("password").value;
+      if (!username) {
+        return showError(container, "Epic sadface: Username is required");
+      }
+      if (!password) {
+        return showError(container, "Epic sadface: Password is required");
+      }
+      if (USERS.indexOf(username) < 0 || password !== PASSWORD) {
+        return showError(container, "Epic sadface: Username and password do not match any user in this service");
+      }
+      if (LOCKED_USERS.indexOf(username) >= 0) {
+        return showError(container, "Epic sadface: Sorry, this user has been locked out.");
+      }
+      document.cookie = SESSION_COOKIE + "=" + encodeURIComponent(username) + "; path=/";
+      window.location.assign("/inventory.html");
+    });
+  }
+
+  function initHeader() {
+    updateBadge();
+    var menu = document.querySelector(".bm-menu-wrap");
+    document.getElementById("react-burger-menu-btn").addEventListener("click", function () {
+      menu.setAttribute("aria-hidden", "false");
+      menu.style.display = "block";
+    });
+    document.getElementById("react-burger-cross-btn").addEventListener("click", function () {
+      menu.setAttribute("aria-hidden", "true");
+      menu.style.display = "none";
+    });
+    document.getElementById("logout_sidebar_link").addEventListener("click", function (event) {
+      event.preventDefault();
+      document.cookie = SESSION_COOKIE + "=; path=/; expires=Thu, 01 Jan 1970 00:00:00 GMT";
+      window.location.assign("/");
+    });
+    document.getElementById("reset_sidebar_link").addEventListener("click", function (event) {
+      event.preventDefault();
+      setCart([]);
+      window.location.reload();
+    });
+  }
+
+  function initInventory() {
+    var cart = getCart();
+    var items = document.querySelectorAll(".inventory_item");
+    for (var i = 0; i < items.length; i++) {
+      var product = byId(Number(items[i].getAttribute("data-item-id")));
+      var slot = items[i].querySelector(".pricebar");
+      var old = slot.querySelector("button");
+      slot.replaceChild(cartButton(product, cart.indexOf(product.id) >= 0, "btn_inventory"), old);
+    }
+    var select = document.querySelector(".product_sort_container");
+    var active = document.querySelector(".active_option");
+    select.addEventListener("change", function () {
+      var list = document.querySelector(".inventory_list");
+      var nodes = Array.prototype.slice.call(list.querySelectorAll(".inventory_item"));
+      var mode = select.value;
+      nodes.sort(function (a, b) {
+        var pa = byId(Number(a.getAttribute("data-item-id")));
+        var pb = byId(Number(b.getAttribute("data-item-id")));
+        if (mode === "lohi") { return pa.price - pb.price; }
+        if (mode === "hilo") { return pb.price - pa.price; }
+        var order = pa.name < pb.name ? -1 : (pa.name > pb.name ? 1 : 0);
+        return mode === "za" ? -order : order;
+      });
+      nodes.forEach(function (node) { list.appendChild(node); });
+      active.textContent = select.options[select.selectedIndex].text;
+    });
+  }
+
+  function initItem(productId) {
+    var product = byId(productId);
+    var slot = document.querySelector(".inventory_details_desc_container");
+    var old = slot.querySelector("button");
+    if (product && old) {
+      slot.replaceChild(cartButton(product, getCart().indexOf(product.id) >= 0, "btn_inventory"), old);
+    }
+  }
+
+  function cartRow(product, withRemove) {
+    var row = document.createElement("div");
+    row.className = "cart_item";
+    row.setAttribute("data-test", "inventory-item");
+    row.setAttribute("data-item-id", String(product.id));
+    var quantity = document.createElement("div");
+    quantity.className = "cart_quantity";
+    quantity.setAttribute("data-test", "item-quantity");
+    quantity.textContent = "1";
+    var label = document.createElement("div");
+    label.className = "cart_item_label";
+    var link = document.createElement("a");
+    link.id = "item_" + product.id + "_title_link";
+    link.href = "/inventory-item.html?id=" + product.id;
+    var name = document.createElement("div");
+    name.className = "inventory_item_name";
+    name.setAttribute("data-test", "inventory-item-name");
+    name.textContent = product.name;
+    link.appendChild(name);
+    var price = document.createElement("div");
+    price.className = "inventory_item_price";
+    price.setAttribute("data-test", "inventory-item-price");
+    price.textContent = money(product.price);
+    var pricebar = document.createElement("div");
+    pricebar.className = "item_pricebar";
+    pricebar.appendChild(price);
+    if (withRemove) {
+      var remove = document.createElement("button");
+      remove.id = "remove-" + product.slug;
+      remove.name = remove.id;
+      remove.setAttribute("data-test", remove.id);
+      remove.className = "btn btn_secondary btn_small cart_button";
+      remove.textContent = "Remove";
+      remove.addEventListener("click", function () {
+        var cart = getCart();
+        var index = cart.indexOf(product.id);
+        if (index >= 0) { cart.splice(index, 1); }
+        setCart(cart);
+        row.parentNode.removeChild(row);
+      });
+      pricebar.appendChild(remove);
+    }
+    label.appendChild(link);
+    label.appendChild(pricebar);
+    row.appendChild(quantity);
+    row.appendChild(label);
+    return row;
+  }
+
+  function renderCartRows(withRemove) {
+    var list = document.querySelector(".cart_list");
+    var cart = getCart();
+    var total = 0;
+    for (var i = 0; i < cart.length; i++) {
+      var product = byId(cart[i]);
+      total += product.price;
+      list.appendChild(cartRow(product, withRemove));
+    }
+    return total;
+  }
+
+  function initCart() {
+    renderCartRows(true);
+    document.getElementById("continue-shopping").addEventListener("click", function () {
+      window.location.assign("/inventory.html");
+    });
+    document.getElementById("checkout").addEventListener("click", function () {
+      window.location.assign("/checkout-step-one.html");
+    });
+  }
+
+  function initCheckoutStepOne() {
+    var container = document.querySelector(".error-message-container");
+    document.getElementById("checkout_info_form").addEventListener("submit", function (event) {
+      event.preventDefault();
+      if (!document.getElementById("first-name").value) {
+        return showError(container, "Error: First Name is required");
+      }
+      if (!document.getElementById("last-name").value) {
+        return showError(container, "Error: Last Name is required");
+      }
+      if (!document.getElementById("postal-code").value) {
+        return showError(container, "Error: Postal Code is required");
+      }
+      window.location.assign("/checkout-step-two.html");
+    });
+    document.getElementById("cancel").addEventListener("click", function () {
+      window.location.assign("/cart.html");
+    });
+  }
+
+  function initCheckoutStepTwo() {
+    var subtotal = renderCartRows(false);
+    var tax = Math.round(subtotal * TAX_RATE * 100) / 100;
+    document.querySelector(".summary_subtotal_label").textContent = "Item total: " + money(subtotal);
+    document.querySelector(".summary_tax_label").textContent = "Tax: " + money(tax);
+    document.querySelector(".summary_total_label").textContent = "Total: " + money(subtotal + tax);
+    document.getElementById("finish").addEventListener("click", function () {
+      setCart([]);
+      window.location.assign("/checkout-complete.html");
+    });
+    document.getElementById("cancel").addEventListener("click", function () {
+      window.location.assign("/inventory.html");
+    });
+  }
+
+  function initCheckoutComplete() {
+    document.getElementById("back-to-products").addEventListener("click", function () {
+      window.location.assign("/inventory.html");
+    });
+  }
+
+  window.Storefront = {
+    initLogin: initLogin,
+    initHeader: initHeader,
+    initInventory: initInventory,
+    initItem: initItem,
+    initCart: initCart,
+    initCheckoutStepOne: initCheckoutStepOne,
+    initCheckoutStepTwo: initCheckoutStepTwo,
+    initCheckoutComplete: initCheckoutComplete
+  };
+})();
+"""
+
+_STYLE_CSS = """
+body { font-family: sans-serif; margin: 0; background: #fff; color: #132322; }
+.login_logo, .app_logo { font-size: 24px; padding: 16px; text-align: center; }
+.login-box, #contents_wrapper { max-width: 960px; margin: 0 auto; padding: 16px; }
+.form_group { margin-bottom: 12px; }
+.input_error { width: 100%; padding: 8px; box-sizing: border-box; }
+.error-message-container.error { background: #e2231a; color: #fff; padding: 8px; }
+.error-button { border: 0; background: transparent; width: 16px; height: 16px; }
+.primary_header { display: flex; justify-content: space-between; align-items: center; }
+.bm-menu-wrap { display: none; }
+.shopping_cart_link { position: relative; display: inline-block; width: 32px; height: 32px; }
+.shopping_cart_badge { position: absolute; top: -4px; right: -8px; background: #e2231a;
+  color: #fff; border-radius: 50%; padding: 0 6px; font-size: 14px; }
+.header_secondary_container { display: flex; justify-content: space-between; }
+.inventory_list { display: flex; flex-wrap: wrap; gap: 16px; }
+.inventory_item { width: 45%; border: 1px solid #ededef; padding: 8px; }
+.inventory_item_img img, .inventory_details_img { width: 120px; height: 120px; }
+.pricebar, .item_pricebar { display: flex; justify-content: space-between; align-items: center; }
+.cart_item { display: flex; gap: 16px; border-bottom: 1px solid #ededef; padding: 8px 0; }
+.btn { padding: 6px 12px; cursor: pointer; }
+"""
+
+_IMAGE_SVG = """<svg xmlns="http://www.w3.org/2000/svg" width="240" height="240" viewBox="0 0 240 240">
+<rect width="240" height="240" fill="#{color}"/>
+<text x="120" y="128" font-size="18" text-anchor="middle" fill="#fff">{label}</text>
+</svg>"""
+
+_IMAGE_COLORS = ("3ddc91", "e2231a", "132322", "484c55", "9b59b6", "f39c12")
+
+_PROTECTED_PATHS = (
+    "/inventory.html",
+    "/inventory-item.html",
+    "/cart.html",
+    "/checkout-step-one.html",
+    "/checkout-step-two.html",
+    "/checkout-complete.html",
+)
+
+
+def _build_app_js() -> bytes:
+    """Render the shared storefront script with the catalog baked in."""
+    products = [product.to_dict() for product in PRODUCTS]
+    script = (_APP_JS
+              .replace("__CART_KEY__", json.dumps(CART_STORAGE_KEY))
+              .replace("__SESSION_COOKIE__", json.dumps(SESSION_COOKIE))
+              .replace("__USERS__", json.dumps(list(USERS)))
+              .replace("__LOCKED_USERS__", json.dumps(list(LOCKED_USERS)))
+              .replace("__PRODUCTS__", json.dumps(products)))
+    return script.encode("utf-8")
+
+
+def _image_path(slug: str) -> str:
+    """Return the static image URL path for a product slug."""
+    return f"/static/media/{quote(slug)}.svg"
+
+
+def _document(body: str, page_class: str) -> str:
+    """Wrap page markup in the shared document shell."""
+    return (
+        "<!DOCTYPE html><html lang=\"en\"><head><meta charset=\"utf-8\">"
+        "<title>Swag Labs</title>"
+        "<link rel=\"stylesheet\" href=\"/static/style.css\">"
+        "<script src=\"/static/app.js\"></script>"
+        f"</head><body class=\"{page_class}\"><div id=\"root\">{body}</div></body></html>"
+    )
+
+
+def _header(title: str, secondary: str = "") -> str:
+    """Render the authenticated page header with menu and cart link."""
+    return (
+        "<div id=\"menu_button_container\"><div class=\"bm-burger-button\">"
+        "<button id=\"react-burger-menu-btn\" type=\"button\">Open Menu</button></div>"
+        "<div class=\"bm-menu-wrap\" aria-hidden=\"true\"><nav class=\"bm-item-list\">"
+        "<a id=\"inventory_sidebar_link\" class=\"bm-item menu-item\" "
+        "data-test=\"inventory-sidebar-link\" href=\"/inventory.html\">All Items</a>"
+        "<a id=\"logout_sidebar_link\" class=\"bm-item menu-item\" "
+        "data-test=\"logout-sidebar-link\" href=\"/\">Logout</a>"
+        "<a id=\"reset_sidebar_link\" class=\"bm-item menu-item\" "
+        "data-test=\"reset-sidebar-link\" href=\"#\">Reset App State</a></nav>"
+        "<button id=\"react-burger-cross-btn\" type=\"button\">Close Menu</button></div></div>"
+        "<div class=\"primary_header\" data-test=\"primary-header\">"
+        "<div class=\"app_logo\">Swag Labs</div>"
+        "<div id=\"shopping_cart_container\" class=\"shopping_cart_container\">"
+        "<a class=\"shopping_cart_link\" data-test=\"shopping-cart-link\" href=\"/cart.html\"></a>"
+        "</div></div>"
+        "<div class=\"header_secondary_container\" data-test=\"secondary-header\">"
+        f"<span class=\"title\" data-test=\"title\">{html.escape(title)}</span>{secondary}</div>"
+        "<script>Storefront.initHeader();</script>"
+    )
+
+
+def _login_page(error: str = "") -> str:
+    """Render the login page, optionally with a pre-filled error."""
+    if error:
+        error_html = (
+            "<div class=\"error-message-container error\">"
+            f"<h3 data-test=\"error\">{html.escape(error)}"
+            "<button class=\"error-button\" data-test=\"error-button\"></button></h3></div>"
+        )
+    else:
+        error_html = "<div class=\"error-message-container\"></div>"
+    body = (
+        "<div class=\"login_logo\">Swag Labs</div>"
+        "<div class=\"login_wrapper\"><div class=\"login-box\"><form id=\"login_form\">"
+        "<div class=\"form_group\"><input class=\"input_error form_input\" placeholder=\"Username\" "
+        "type=\"text\" data-test=\"username\" id=\"user-name\" name=\"user-name\" "
+        "autocorrect=\"off\" autocapitalize=\"none\"></div>"
+        "<div class=\"form_group\"><input class=\"input_error form_input\" placeholder=\"Password\" "
+        "type=\"password\" data-test=\"password\" id=\"password\" name=\"password\" "
+        "autocorrect=\"off\" autocapitalize=\"none\"></div>"
+        f"{error_html}"
+        "<input type=\"submit\" class=\"submit-button btn_action\" data-test=\"login-button\" "
+        "id=\"login-button\" name=\"login-button\" value=\"Login\">"
+        "</form></div></div>"
+        "<div class=\"login_credentials_wrap\"><div id=\"login_credentials\">"
+        "<h4>Accepted usernames are:</h4>"
+        f"{'<br>'.join(USERS)}</div>"
+        "<div class=\"login_password\"><h4>Password for all users:</h4>secret_sauce</div></div>"
+        "<script>Storefront.initLogin();</script>"
+    )
+    return _document(body, "login")
+
+
+def _inventory_page() -> str:
+    """Render the product listing with all catalog items."""
+    sort = (
+        "<div class=\"right_component\"><span class=\"select_container\">"
+        "<span class=\"active_option\" data-test=\"active-option\">Name (A to Z)</span>"
+        "<select class=\"product_sort_container\" data-test=\"product-sort-container\">"
+        "<option value=\"az\">Name (A to Z)</option>"
+        "<option value=\"za\">Name (Z to A)</option>"
+        "<option value=\"lohi\">Price (low to high)</option>"
+        "<option value=\"hilo\">Price (high to low)</option>"
+        "</select></span></div>"
+    )
+    items = []
+    for product in sorted(PRODUCTS, key=lambda p: p.name):
+        name = html.escape(product.name)
+        items.append(
+            f"<div class=\"inventory_item\" data-test=\"inventory-item\" data-item-id=\"{product.item_id}\">"
+            "<div class=\"inventory_item_img\">"
+            f"<a id=\"item_{product.item_id}_img_link\" href=\"/inventory-item.html?id={product.item_id}\">"
+            f"<img alt=\"{name}\" class=\"inventory_item_img\" src=\"{_image_path(product.slug)}\" "
+            f"data-test=\"inventory-item-{html.escape(product.slug)}-img\"></a></div>"
+            "<div class=\"inventory_item_description\" data-test=\"inventory-item-description\">"
+            "<div class=\"inventory_item_label\">"
+            f"<a id=\"item_{product.item_id}_title_link\" href=\"/inventory-item.html?id={product.item_id}\">"
+            f"<div class=\"inventory_item_name\" data-test=\"inventory-item-name\">{name}</div></a>"
+            "<div class=\"inventory_item_desc\" data-test=\"inventory-item-desc\">"
+            f"{html.escape(product.description)}</div></div>"
+            "<div class=\"pricebar\">"
+            f"<div class=\"inventory_item_price\" data-test=\"inventory-item-price\">${product.price:.2f}</div>"
+            "<button class=\"btn btn_primary btn_small btn_inventory\">Add to cart</button>"
+            "</div></div></div>"
+        )
+    body = (
+        "<div id=\"page_wrapper\" class=\"page_wrapper\">"
+        f"{_header('Products', sort)}"
+        "<div id=\"contents_wrapper\"><div id=\"inventory_container\" class=\"inventory_container\">"
+        f"<div class=\"inventory_list\" data-test=\"inventory-list\">{''.join(items)}</div>"
+        "</div></div></div>"
+        "<script>Storefront.initInventory();</script>"
+    )
+    return _document(body, "inventory")
+
+
+def _inventory_item_page(query: dict) -> str:
+    """Render a single product detail page."""
+    try:
+        item_id = int(query.get("id", [""])[0])
+    except ValueError:
+        item_id = -1
+    product = next((p for p in PRODUCTS if p.item_id == item_id), None)
+    if product is None:
+        details = "<div class=\"inventory_details_name large_size\">ITEM NOT FOUND</div>"
+    else:
+        details = (
+            f"<img alt=\"{html.escape(product.name)}\" class=\"inventory_details_img\" "
+            f"src=\"{_image_path(product.slug)}\">"
+            "<div class=\"inventory_details_desc_container\">"
+            "<div class=\"inventory_details_name large_size\" data-test=\"inventory-item-name\">"
+            f"{html.escape(product.name)}</div>"
+            "<div class=\"inventory_details_desc large_size\" data-test=\"inventory-item-desc\">"
+            f"{html.escape(product.description)}</div>"
+            "<div class=\"inventory_details_price\" data-test=\"inventory-item-price\">"
+            f"${product.price:.2f}</div>"
+            "<button class=\"btn btn_primary btn_small btn_inventory\">Add to cart</button></div>"
+            f"<script>Storefront.initItem({product.item_id});</script>"
+        )
+    body = (
+        "<div id=\"page_wrapper\" class=\"page_wrapper\">"
+        f"{_header('')}"
+        "<div id=\"contents_wrapper\"><div id=\"inventory_item_container\" class=\"inventory_item_container\">"
+        "<button id=\"back-to-products\" data-test=\"back-to-products\" class=\"btn inventory_details_back_button\" "
+        "onclick=\"window.location.assign('/inventory.html')\">Back to products</button>"
+        f"<div class=\"inventory_details\">{details}</div></div></div></div>"
+    )
+    return _document(body, "inventory-item")
+
+
+def _cart_list() -> str:
+    """Render the (client-populated) cart list container."""
+    return (
+        "<div class=\"cart_list\" data-test=\"cart-list\">"
+        "<div class=\"cart_quantity_label\">QTY</div>"
+        "<div class=\"cart_desc_label\">Description</div></div>"
+    )
+
+
+def _cart_page() -> str:
+    """Render the cart page; rows are filled from localStorage."""
+    body = (
+        "<div id=\"page_wrapper\" class=\"page_wrapper\">"
+        f"{_header('Your Cart')}"
+        "<div id=\"contents_wrapper\"><div id=\"cart_contents_container\" class=\"cart_contents_container\">"
+        f"{_cart_list()}"
+        "<div class=\"cart_footer\">"
+        "<button id=\"continue-shopping\" name=\"continue-shopping\" data-test=\"continue-shopping\" "
+        "class=\"btn btn_secondary back btn_medium\">Continue Shopping</button>"
+        "<button id=\"checkout\" name=\"checkout\" data-test=\"checkout\" "
+        "class=\"btn btn_action btn_medium checkout_button\">Checkout</button>"
+        "</div></div></div></div>"
+        "<script>Storefront.initCart();</script>"
+    )
+    return _document(body, "cart")
+
+
+def _checkout_step_one_page() -> str:
+    """Render the checkout information form."""
+    fields = []
+    for field_id, data_test, placeholder in (("first-name", "firstName", "First Name"),
+                                             ("last-name", "lastName", "Last Name"),
+                                             ("postal-code", "postalCode", "Zip/Postal Code")):
+        fields.append(
+            "<div class=\"form_group\"><input class=\"input_error form_input\" "
+            f"placeholder=\"{placeholder}\" type=\"text\" data-test=\"{data_test}\" "
+            f"id=\"{field_id}\" name=\"{field_id}\"></div>"
+        )
+    body = (
+        "<div id=\"page_wrapper\" class=\"page_wrapper\">"
+        f"{_header('Checkout: Your Information')}"
+        "<div id=\"contents_wrapper\"><div id=\"checkout_info_container\" class=\"checkout_info_container\">"
+        "<form id=\"checkout_info_form\"><div class=\"checkout_info\">"
+        f"{''.join(fields)}"
+        "<div class=\"error-message-container\"></div></div>"
+        "<div class=\"checkout_buttons\">"
+        "<button id=\"cancel\" name=\"cancel\" data-test=\"cancel\" type=\"button\" "
+        "class=\"btn btn_secondary back btn_medium cart_cancel_link\">Cancel</button>"
+        "<input type=\"submit\" id=\"continue\" name=\"continue\" data-test=\"continue\" "
+        "class=\"submit-button btn btn_primary cart_button btn_action\" value=\"Continue\">"
+        "</div></form></div></div></div>"
+        "<script>Storefront.initCheckoutStepOne();</script>"
+    )
+    return _document(body, "checkout-step-one")
+
+
+def _checkout_step_two_page() -> str:
+    """Render the checkout overview with totals."""
+    body = (
+        "<div id=\"page_wrapper\" class=\"page_wrapper\">"
+        f"{_header('Checkout: Overview')}"
+        "<div id=\"contents_wrapper\"><div id=\"checkout_summary_container\" class=\"checkout_summary_container\">"
+        f"{_cart_list()}"
+        "<div class=\"summary_info\">"
+        "<div class=\"summary_info_label\" data-test=\"payment-info-label\">Payment Information:</div>"
+        "<div class=\"summary_value_label\" data-test=\"payment-info-value\">SauceCard #31337</div>"
+        "<div class=\"summary_info_label\" data-test=\"shipping-info-label\">Shipping Information:</div>"
+        "<div class=\"summary_value_label\" data-test=\"shipping-info-value\">Free Pony Express Delivery!</div>"
+        "<div class=\"summary_subtotal_label\" data-test=\"subtotal-label\"></div>"
+        "<div class=\"summary_tax_label\" data-test=\"tax-label\"></div>"
+        "<div class=\"summary_info_label summary_total_label\" data-test=\"total-label\"></div>"
+        "<div class=\"cart_footer\">"
+        "<button id=\"cancel\" name=\"cancel\" data-test=\"cancel\" "
+        "class=\"btn btn_secondary back btn_medium cart_cancel_link\">Cancel</button>"
+        "<button id=\"finish\" name=\"finish\" data-test=\"finish\" "
+        "class=\"btn btn_action btn_medium cart_button\">Finish</button>"
+        "</div></div></div></div></div>"
+        "<script>Storefront.initCheckoutStepTwo();</script>"
+    )
+    return _document(body, "checkout-step-two")
+
+
+def _checkout_complete_page() -> str:
+    """Render the order confirmation page."""
+    body = (
+        "<div id=\"page_wrapper\" class=\"page_wrapper\">"
+        f"{_header('Checkout: Complete!')}"
+        "<div id=\"contents_wrapper\"><div id=\"checkout_complete_container\" class=\"checkout_complete_container\">"
+        "<h2 class=\"complete-header\" data-test=\"complete-header\">Thank you for your order!</h2>"
+        "<div class=\"complete-text\" data-test=\"complete-text\">Your order has been dispatched, "
+        "and will arrive just as fast as the pony can get there!</div>"
+        "<button id=\"back-to-products\" name=\"back-to-products\" data-test=\"back-to-products\" "
+        "class=\"btn btn_primary btn_small\">Back Home</button>"
+        "</div></div></div>"
+        "<script>Storefront.initCheckoutComplete();</script>"
+    )
+    return _document(body, "checkout-complete")
+
+
+_STATIC = {
+    "/static/app.js": ("application/javascript; charset=utf-8", _build_app_js()),
+    "/static/style.css": ("text/css; charset=utf-8", _STYLE_CSS.encode("utf-8")),
+}
+for _index, _product in enumerate(PRODUCTS):
+    _STATIC[_image_path(_product.slug)] = (
+        "image/svg+xml",
+        _IMAGE_SVG.format(color=_IMAGE_COLORS[_index % len(_IMAGE_COLORS)],
+                          label=html.escape(_product.name[:18])).encode("utf-8"),
+    )
+
+_PAGES = {
+    "/inventory.html": lambda query: _inventory_page(),
+    "/inventory-item.html": _inventory_item_page,
+    "/cart.html": lambda query: _cart_page(),
+    "/checkout-step-one.html": lambda query: _checkout_step_one_page(),
+    "/checkout-step-two.html": lambda query: _checkout_step_two_page(),
+    "/checkout-complete.html": lambda query: _checkout_complete_page(),
+}
+
+
+class _StorefrontHandler(BaseHTTPRequestHandler):
+    """Request handler routing storefront paths to rendered pages."""
+
+    protocol_version = "HTTP/1.1"
+    server_version = "LocalStorefront/1.0"
+
+    def do_GET(self):
+        """Serve pages, static assets and the login redirect."""
+        parts = urlsplit(self.path)
+        path = parts.path or "/"
+        query = parse_qs(parts.query)
+
+        if path in _STATIC:
+            content_type, payload = _STATIC[path]
+            self._send(200, content_type, payload, cache=True)
+        elif path in ("/", "/index.html"):
+            error = ""
+            if "from" in query:
+                error = (f"Epic sadface: You can only access '{query['from'][0]}' "
+                         "when you are logged in.")
+            self._send_html(_login_page(error))
+        elif path in _PAGES:
+            if path in _PROTECTED_PATHS and not self._is_authenticated():
+                self.send_response(302)
+                self.send_header("Location", f"/?from={quote(path)}")
+                self.send_header("Content-Length", "0")
+                self.end_headers()
+                return
+            self._send_html(_PAGES[path](query))
+        else:
+            self._send(404, "text/plain; charset=utf-8", b"Not Found")
+
+    def do_HEAD(self):
+        """Answer HEAD for static assets so clients can size them."""
+        parts = urlsplit(self.path)
+        if parts.path in _STATIC:
+            content_type, payload = _STATIC[parts.path]
+            self.send_response(200)
+            self.send_header("Content-Type", content_type)
+            self.send_header("Content-Length", str(len(payload)))
+            self.end_headers()
+        else:
+            self.send_response(404)
+            self.send_header("Content-Length", "0")
+            self.end_headers()
+
+    def _is_authenticated(self) -> bool:
+        """Check the session cookie the login form sets."""
+        cookie = SimpleCookie()
+        try:
+            cookie.load(self.headers.get("Cookie", ""))
+        except Exception:
+            return False
+        morsel = cookie.get(SESSION_COOKIE)
+        return morsel is not None and morsel.value in USERS and morsel.value not in LOCKED_USERS
+
+    def _send_html(self, document: str):
+        """Send an HTML document."""
+        self._send(200, "text/html; charset=utf-8", document.encode("utf-8"))
+
+    def _send(self, status: int, content_type: str, payload: bytes, cache: bool = False):
+        """Send a complete response with an explicit length for keep-alive."""
+        self.send_response(status)
+        self.send_header("Content-Type", content_type)
+        self.send_header("Content-Length", str(len(payload)))
+        self.send_header("Cache-Control", "public, max-age=3600" if cache else "no-store")
+        self.end_headers()
+        self.wfile.write(payload)
+
+    def log_message(self, format, *args):
+        """Keep request logging out of the pytest output."""
+        pass
+
+
+class LocalStorefront:
+    """Loopback HTTP server hosting the SauceDemo stand-in."""
+
+    def __init__(self, host: str = "127.0.0.1", port: int = 0):
+        self.host = host
+        self.port = port
+        self._server: Optional[ThreadingHTTPServer] = None
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def url(self) -> str:
+        """Base URL of the running server (no trailing slash)."""
+        if self._server is None:
+            raise RuntimeError("Local storefront is not running")
+        return f"http://{self.host}:{self._server.server_address[1]}"
+
+    def start(self) -> "LocalStorefront":
+        """Bind the port (random when 0) and serve in a daemon thread."""
+        self._server = ThreadingHTTPServer((self.host, self.port), _StorefrontHandler)
+        self._server.daemon_threads = True
+        self._thread = threading.Thread(
+            target=self._server.serve_forever, name="local-storefront", daemon=True
+        )
+        self._thread.start()
+        return self
+
+    def stop(self):
+        """Shut the server down and release the port."""
+        if self._server is not None:
+            self._server.shutdown()
+            self._server.server_close()
+            self._server = None
+            self._thread = None
+
+    def __enter__(self) -> "LocalStorefront":
+        return self.start()
+
+    def __exit__(self, exc_type, exc, tb):
+        self.stop()
+
+
+def main():
+    """Serve the storefront in the foreground."""
+    parser = argparse.ArgumentParser(description="Local SauceDemo stand-in server")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8000)
+    args = parser.parse_args()
+
+    server = LocalStorefront(args.host, args.port).start()
+    print(f"Serving storefront at {server.url} (Ctrl+C to stop)")
+    try:
+        threading.Event().wait()
+    except KeyboardInterrupt:
+        server.stop()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,204 @@
+"""Duration-aware test distribution for pytest-xdist.
+
+Per-test durations from previous runs are kept in the pytest cache. With
+``--lpt-schedule`` the tests are assigned to workers longest-processing-time
+first: each test, slowest first, goes to the worker whose load would grow the
+least. A worker that does not yet run any test of the test's group (the
+engine/browser whose expensive session fixtures it needs) is charged that
+group's launch cost, so tests sharing a browser stay together unless
+balancing is worth a second launch.
+
+The assignment is computed once, sent to the workers up front, and the
+predicted makespan is reported next to the one observed.
+"""
+import statistics
+from typing import Dict, List, Sequence
+
+from xdist.scheduler import LoadScheduling
+
+from utils.config import config
+
+CACHE_KEY = "lpt/durations"
+# Assumed cost of tests and browser launches never measured
+DEFAULT_DURATION = 1.0
+DEFAULT_GROUP_COST = 2.0
+# Weight of the latest run in the stored moving average
+SMOOTHING = 0.5
+
+
+def group_for_item(item) -> str:
+    """Expensive-fixture group of a collected test item.
+
+    Tests parametrized over ``engine`` request their browser only at run
+    time, so their group comes from the parameter.
+    """
+    callspec = getattr(item, "callspec", None)
+    engine = callspec.params.get("engine") if callspec is not None else None
+    fixtures = item.fixturenames
+    if engine == "selenium" or "selenium_driver" in fixtures:
+        browser = item.config.getoption("--selenium-browser", None) or config.SELENIUM_BROWSER
+        return f"selenium:{browser}"
+    if engine == "playwright" or "playwright_browser" in fixtures:
+        return "playwright:chromium"
+    return "none"
+
+
+def guess_group(nodeid: str) -> str:
+    """Group of a test never run before, from its path."""
+    if "selenium" in nodeid:
+        return "selenium"
+    if "playwright" in nodeid:
+        return "playwright"
+    return "none"
+
+
+class DurationStore:
+    """Smoothed per-test durations and per-group launch costs."""
+
+    def __init__(self, cache):
+        self.cache = cache
+        data = cache.get(CACHE_KEY, None) if cache is not None else None
+        data = data or {}
+        self.tests: Dict[str, List] = data.get("tests", {})  # nodeid -> [seconds, group]
+        self.groups: Dict[str, float] = data.get("groups", {})  # group -> launch seconds
+
+    def duration(self, nodeid: str) -> float:
+        entry = self.tests.get(nodeid)
+        return entry[0] if entry else DEFAULT_DURATION
+
+    def group(self, nodeid: str) -> str:
+        entry = self.tests.get(nodeid)
+        return entry[1] if entry else guess_group(nodeid)
+
+    def group_cost(self, group: str) -> float:
+        return self.groups.get(group, DEFAULT_GROUP_COST)
+
+    def update(self, durations: Dict[str, float], groups: Dict[str, str],
+               setups: Dict[str, List[float]]):
+        """Fold one run's measurements in and persist them.
+
+        Args:
+            durations: nodeid -> setup + call + teardown seconds
+            groups: nodeid -> group of the test
+            setups: group -> setup seconds of every test in the group
+        """
+        for nodeid, seconds in durations.items():
+            previous = self.tests.get(nodeid)
+            if previous:
+                seconds = SMOOTHING * seconds + (1 - SMOOTHING) * previous[0]
+            self.tests[nodeid] = [round(seconds, 4), groups.get(nodeid, guess_group(nodeid))]
+        for group, samples in setups.items():
+            # The first test of a group pays the launch; the rest are typical
+            launch = max(samples) - statistics.median(samples) if len(samples) > 1 else max(samples)
+            previous = self.groups.get(group)
+            if previous is not None:
+                launch = SMOOTHING * launch + (1 - SMOOTHING) * previous
+            self.groups[group] = round(max(launch, 0.0), 4)
+        if self.cache is not None:
+            self.cache.set(CACHE_KEY, {"tests": self.tests, "groups": self.groups})
+
+
+class Plan:
+    """Assignment of collection indices to workers with predicted loads."""
+
+    __slots__ = ("assignments", "loads", "baseline_loads")
+
+    def __init__(self, assignments: List[List[int]], loads: List[float], baseline_loads: List[float]):
+        self.assignments = assignments
+        self.loads = loads
+        self.baseline_loads = baseline_loads
+
+    @property
+    def makespan(self) -> float:
+        return max(self.loads, default=0.0)
+
+    @property
+    def baseline_makespan(self) -> float:
+        """Makespan of greedy in-collection-order assignment (approximates --dist load)."""
+        return max(self.baseline_loads, default=0.0)
+
+
+def _assign(order: Sequence[int], nodeids: Sequence[str], store: DurationStore, workers: int):
+    """Greedily give each test in order to the worker finishing it soonest."""
+    loads = [0.0] * workers
+    groups = [set() for _ in range(workers)]
+    assignments: List[List[int]] = [[] for _ in range(workers)]
+    for index in order:
+        nodeid = nodeids[index]
+        group = store.group(nodeid)
+        duration = store.duration(nodeid)
+
+        def finish(worker: int) -> float:
+            launch = 0.0 if group in groups[worker] else store.group_cost(group)
+            return loads[worker] + launch + duration
+
+        worker = min(range(workers), key=finish)
+        loads[worker] = finish(worker)
+        groups[worker].add(group)
+        assignments[worker].append(index)
+    return assignments, loads
+
+
+def plan_lpt(nodeids: Sequence[str], store: DurationStore, workers: int) -> Plan:
+    """Plan an LPT assignment of nodeids over workers."""
+    by_duration = sorted(range(len(nodeids)), key=lambda index: store.duration(nodeids[index]),
+                         reverse=True)
+    assignments, loads = _assign(by_duration, nodeids, store, workers)
+    # Run each worker's share in collection order so module/class fixtures stay warm
+    for share in assignments:
+        share.sort()
+    _, baseline_loads = _assign(range(len(nodeids)), nodeids, store, workers)
+    return Plan(assignments, loads, baseline_loads)
+
+
+class LPTScheduling(LoadScheduling):
+    """xdist scheduler sending every worker its whole LPT share up front."""
+
+    def __init__(self, config, log=None):
+        super().__init__(config, log)
+        self.store = DurationStore(getattr(config, "cache", None))
+        self.plan = None
+
+    def schedule(self):
+        assert self.collection_is_completed
+
+        # Initial distribution already happened; nothing is left pending
+        if self.collection is not None:
+            for node in self.nodes:
+                self.check_schedule(node)
+            return
+
+        if not self._check_nodes_have_same_collection():
+            self.log("**Different tests collected, aborting run**")
+            return
+
+        self.collection = list(self.node2collection.values())[0]
+        if not self.collection:
+            return
+
+        self.plan = plan_lpt(self.collection, self.store, len(self.nodes))
+        for node, share in zip(self.nodes, self.plan.assignments):
+            if share:
+                self.node2pending[node].extend(share)
+                node.send_runtest_some(share)
+        for node in self.nodes:
+            node.shutdown()
+
+
+def format_makespan(plan, busy: Dict[str, float]) -> List[str]:
+    """Report predicted vs actual makespan.
+
+    Args:
+        plan: Plan used for the run, or None when xdist scheduled on its own
+        busy: worker id -> seconds spent in setup/call/teardown
+    """
+    lines = []
+    if plan is not None:
+        lines.append(f"predicted makespan: {plan.makespan:.1f}s "
+                     f"(in-order greedy, approximating --dist load: {plan.baseline_makespan:.1f}s)")
+        lines.append("predicted per worker: " + ", ".join(f"{load:.1f}s" for load in plan.loads))
+    if busy:
+        lines.append(f"actual makespan: {max(busy.values()):.1f}s")
+        lines.append("actual per worker: " + ", ".join(
+            f"{worker} {seconds:.1f}s" for worker, seconds in sorted(busy.items())))
+    return lines
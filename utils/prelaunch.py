@@ -0,0 +1,165 @@
+"""Browser launches started at session start, overlapping collection.
+
+With ``--prelaunch selenium,playwright`` each process (xdist worker) starts
+its browsers before collecting tests: Selenium drivers on a background
+thread, Playwright as a ``playwright launch-server`` subprocess the session
+fixture connects to. The first fixture to need a browser waits at most
+``PRELAUNCH_TIMEOUT`` seconds for it and launches one itself if the
+pre-launch failed or is still running.
+"""
+import json
+import os
+import subprocess
+import tempfile
+import threading
+from typing import List, Optional
+
+from utils.config import config
+
+ENGINES = ("selenium", "playwright")
+
+
+def parse_engines(value: str) -> List[str]:
+    """Engines named in a comma-separated --prelaunch / PRELAUNCH value."""
+    engines = [engine.strip().lower() for engine in (value or "").split(",") if engine.strip()]
+    unknown = [engine for engine in engines if engine not in ENGINES]
+    if unknown:
+        raise ValueError(f"Cannot pre-launch {', '.join(unknown)} (choose from {', '.join(ENGINES)})")
+    return engines
+
+
+class SeleniumPrelaunch:
+    """Selenium drivers launched on a background thread."""
+
+    def __init__(self, browser: str = None, count: int = 1):
+        self.browser = browser or config.SELENIUM_BROWSER
+        self.count = count
+        self.error: Optional[BaseException] = None
+        self._drivers = []
+        self._lock = threading.Lock()
+        self._closed = False
+        self._thread = threading.Thread(target=self._launch, name="selenium-prelaunch", daemon=True)
+
+    def start(self) -> "SeleniumPrelaunch":
+        self._thread.start()
+        return self
+
+    def _launch(self):
+        try:
+            from utils.driver_factory import DriverFactory
+            for _ in range(self.count):
+                driver = DriverFactory.get_driver(browser=self.browser)
+                with self._lock:
+                    if not self._closed:
+                        self._drivers.append(driver)
+                        continue
+                # Nobody will take it any more
+                driver.quit()
+                return
+        except Exception as error:  # reported by take(); the fixture launches instead
+            self.error = error
+
+    def take(self, timeout: float = None) -> Optional[object]:
+        """Return a pre-launched driver, or None if none is ready within timeout."""
+        with self._lock:
+            if self._drivers:
+                return self._drivers.pop(0)
+        self._thread.join(config.PRELAUNCH_TIMEOUT if timeout is None else timeout)
+        with self._lock:
+            return self._drivers.pop(0) if self._drivers else None
+
+    def take_all(self, timeout: float = None) -> List[object]:
+        """Return every driver launched within timeout (e.g. to seed a pool)."""
+        self._thread.join(config.PRELAUNCH_TIMEOUT if timeout is None else timeout)
+        with self._lock:
+            drivers, self._drivers = self._drivers, []
+        return drivers
+
+    def close(self):
+        """Quit drivers nobody took; a launch still running quits its own."""
+        with self._lock:
+            self._closed = True
+            drivers, self._drivers = self._drivers, []
+        for driver in drivers:
+            try:
+                driver.quit()
+            except Exception:
+                pass
+
+
+class PlaywrightServer:
+    """``playwright launch-server`` subprocess for the session browser."""
+
+    def __init__(self, browser: str = "chromium", headless: bool = None):
+        self.browser = browser
+        self.headless = config.HEADLESS if headless is None else headless
+        self.ws_endpoint: Optional[str] = None
+        self.error: Optional[str] = None
+        self._process: Optional[subprocess.Popen] = None
+        self._ready = threading.Event()
+        self._config_path = None
+
+    def start(self) -> "PlaywrightServer":
+        try:
+            # Private but stable: the bundled driver the Python package talks to
+            from playwright._impl._driver import compute_driver_executable, get_driver_env
+            executable = compute_driver_executable()
+            command = list(executable) if isinstance(executable, tuple) else [str(executable)]
+            env = get_driver_env()
+        except ImportError as error:
+            self._fail(f"cannot locate the Playwright driver: {error}")
+            return self
+
+        handle, self._config_path = tempfile.mkstemp(prefix="playwright-server-", suffix=".json")
+        with os.fdopen(handle, "w") as config_file:
+            json.dump({"headless": self.headless}, config_file)
+        try:
+            self._process = subprocess.Popen(
+                command + ["launch-server", "--browser", self.browser, "--config", self._config_path],
+                stdin=subprocess.DEVNULL, stdout=subprocess.PIPE, stderr=subprocess.STDOUT,
+                env=env, text=True,
+            )
+        except OSError as error:
+            self._fail(str(error))
+            return self
+        threading.Thread(target=self._read_output, name="playwright-prelaunch", daemon=True).start()
+        return self
+
+    def _read_output(self):
+        """Wait for the endpoint line, then keep draining the pipe."""
+        output = []
+        for line in self._process.stdout:
+            if self.ws_endpoint is None and line.startswith("ws://"):
+                self.ws_endpoint = line.strip()
+                self._ready.set()
+            elif self.ws_endpoint is None:
+                output.append(line)
+        if self.ws_endpoint is None:
+            # Node prints a stack trace; the "Error: ..." line says what went wrong
+            lines = [line.strip() for line in output if line.strip()]
+            reason = next((line for line in lines if line.startswith("Error")), None)
+            self._fail(reason or f"launch-server exited with {self._process.wait()}")
+
+    def _fail(self, message: str):
+        self.error = message
+        self._ready.set()
+
+    def endpoint(self, timeout: float = None) -> Optional[str]:
+        """WebSocket endpoint to connect to, or None if the server is not up in time."""
+        self._ready.wait(config.PRELAUNCH_TIMEOUT if timeout is None else timeout)
+        return self.ws_endpoint
+
+    def stop(self):
+        """Terminate the server and the browser it launched."""
+        if self._process is not None and self._process.poll() is None:
+            self._process.terminate()
+            try:
+                self._process.wait(timeout=10)
+            except subprocess.TimeoutExpired:
+                self._process.kill()
+        if self._config_path:
+            try:
+                os.remove(self._config_path)
+            except OSError:
+                pass
+            self._config_path = None
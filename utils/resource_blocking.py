@@ -0,0 +1,238 @@
+"""Resource blocking policies for images, fonts, media and third-party origins.
+
+A policy combines a preset with optional URL glob patterns:
+
+- ``none``: block nothing (default)
+- ``media``: block images, fonts and audio/video
+- ``third-party``: block every request not served by the BASE_URL host
+- ``lean``: ``media`` and ``third-party`` together
+
+Playwright applies the policy per context through request routing and counts
+what it blocked. Selenium applies it at launch through browser preferences,
+Chromium's DevTools ``Network.setBlockedURLs`` and host-resolver rules, or a
+PAC script on Firefox; those blocks happen inside the browser and are not
+counted.
+
+The transfer saved by blocking is estimated only on request
+(``--estimate-blocked-bytes``): once, at the end of the session, with one
+HEAD request per distinct blocked URL. Those requests go to the very hosts
+the policy blocks, so they never run during tests.
+"""
+import json
+import re
+import urllib.request
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, Iterable, List, Optional
+from urllib.parse import quote, urlsplit
+
+from utils.config import config
+
+PRESETS: Dict[str, Dict] = {
+    "none": {"types": (), "third_party": False},
+    "media": {"types": ("image", "font", "media"), "third_party": False},
+    "third-party": {"types": (), "third_party": True},
+    "lean": {"types": ("image", "font", "media"), "third_party": True},
+}
+
+# URL suffixes used when the browser does not report a resource type
+EXTENSIONS: Dict[str, tuple] = {
+    "image": (".png", ".jpg", ".jpeg", ".gif", ".webp", ".svg", ".ico", ".avif", ".bmp"),
+    "font": (".woff", ".woff2", ".ttf", ".otf", ".eot"),
+    "media": (".mp4", ".webm", ".ogg", ".mp3", ".wav", ".m4a", ".mov"),
+}
+
+
+def _glob_regex(pattern: str) -> str:
+    """Regular expression for a URL glob in which only ``*`` is a wildcard.
+
+    This is the syntax of Chromium's Network.setBlockedURLs, so a pattern
+    blocks the same URLs in every engine. The result is valid both as a
+    Python and as a JavaScript (PAC script) regular expression.
+    """
+    return ".*".join(re.escape(part) for part in pattern.split("*"))
+
+
+class BlockingPolicy:
+    """Decides which requests to block."""
+
+    def __init__(self, preset: str = "none", patterns: Iterable[str] = (),
+                 first_party_host: str = None):
+        if preset not in PRESETS:
+            raise ValueError(f"Unknown resource blocking preset: {preset} "
+                             f"(choose from {', '.join(PRESETS)})")
+        self.preset = preset
+        self.types = frozenset(PRESETS[preset]["types"])
+        self.third_party = PRESETS[preset]["third_party"]
+        self.patterns = tuple(pattern for pattern in patterns if pattern)
+        self._pattern_regexes = tuple(re.compile(_glob_regex(pattern)) for pattern in self.patterns)
+        self.first_party_host = first_party_host or urlsplit(config.BASE_URL).hostname
+
+    @classmethod
+    def from_config(cls, preset: str = None) -> "BlockingPolicy":
+        """Build the policy selected by config.BLOCK_RESOURCES / BLOCK_PATTERNS."""
+        patterns = [pattern.strip() for pattern in config.BLOCK_PATTERNS.split(",")]
+        return cls(preset or config.BLOCK_RESOURCES, patterns)
+
+    @property
+    def enabled(self) -> bool:
+        return bool(self.types or self.third_party or self.patterns)
+
+    def describe(self) -> str:
+        """Human readable summary of the policy."""
+        parts = [self.preset]
+        if self.patterns:
+            parts.append("patterns: " + ", ".join(self.patterns))
+        return "; ".join(parts)
+
+    @staticmethod
+    def guess_type(url: str) -> str:
+        """Infer a resource type from the URL path suffix."""
+        path = urlsplit(url).path.lower()
+        for resource_type, suffixes in EXTENSIONS.items():
+            if path.endswith(suffixes):
+                return resource_type
+        return "other"
+
+    def should_block(self, url: str, resource_type: Optional[str] = None) -> bool:
+        """Return True if the request for url should be blocked."""
+        parts = urlsplit(url)
+        if parts.scheme not in ("http", "https"):
+            return False
+        if self.third_party and parts.hostname != self.first_party_host:
+            return True
+        if self.types and (resource_type or self.guess_type(url)) in self.types:
+            return True
+        return any(regex.fullmatch(url) for regex in self._pattern_regexes)
+
+    # ---------- Selenium launch configuration ----------
+
+    def chromium_url_patterns(self) -> List[str]:
+        """URL patterns for DevTools Network.setBlockedURLs."""
+        patterns = []
+        for resource_type in sorted(self.types):
+            if resource_type != "image":  # images use the content setting
+                patterns.extend(f"*{suffix}" for suffix in EXTENSIONS[resource_type])
+        return patterns + list(self.patterns)
+
+    def chromium_arguments(self) -> List[str]:
+        """Command line switches for Chrome/Edge."""
+        if self.third_party:
+            # Unresolvable for every host except the storefront's own
+            return [f"--host-resolver-rules=MAP * ~NOTFOUND , EXCLUDE {self.first_party_host}"]
+        return []
+
+    def chromium_prefs(self) -> Dict:
+        """Profile preferences for Chrome/Edge."""
+        if "image" in self.types:
+            return {"profile.managed_default_content_settings.images": 2}
+        return {}
+
+    def firefox_preferences(self) -> Dict:
+        """about:config preferences for Firefox."""
+        prefs = {}
+        if "image" in self.types:
+            prefs["permissions.default.image"] = 2
+        if "font" in self.types:
+            prefs["browser.display.use_document_fonts"] = 0
+        if "media" in self.types:
+            prefs["media.autoplay.default"] = 5
+            prefs["media.preload.default"] = 0
+        if self.third_party or self.patterns:
+            # Route blocked requests to a dead proxy. PAC scripts only see
+            # the host for https URLs, so patterns match on http URLs only.
+            prefs["network.proxy.type"] = 2
+            prefs["network.proxy.autoconfig_url"] = "data:text/javascript," + quote(self._pac_script())
+        return prefs
+
+    def _pac_script(self) -> str:
+        """Proxy auto-config script sending blocked requests to a closed port."""
+        patterns = json.dumps([_glob_regex(pattern) for pattern in self.patterns])
+        return (
+            "function FindProxyForURL(url, host) {"
+            f" var patterns = {patterns};"
+            " for (var i = 0; i < patterns.length; i++) {"
+            "  if (new RegExp('^' + patterns[i] + '$').test(url)) { return 'PROXY 127.0.0.1:9'; }"
+            " }"
+            f" if ({json.dumps(self.third_party)} && host !== {json.dumps(self.first_party_host)})"
+            " { return 'PROXY 127.0.0.1:9'; }"
+            " return 'DIRECT'; }"
+        )
+
+
+class BlockingStats:
+    """Counts requests blocked in Playwright contexts."""
+
+    def __init__(self):
+        self.by_type: Counter = Counter()
+        self.by_url: Counter = Counter()
+        self.bytes_saved: Optional[int] = None
+
+    @property
+    def total(self) -> int:
+        return sum(self.by_type.values())
+
+    def record(self, url: str, resource_type: str):
+        self.by_type[resource_type] += 1
+        self.by_url[url] += 1
+
+    def merge(self, by_type: Dict[str, int], by_url: Dict[str, int]):
+        """Fold counts from another test or xdist worker into these stats."""
+        self.by_type.update(by_type)
+        self.by_url.update(by_url)
+
+    def estimate_bytes_saved(self, timeout: float = 2.0, workers: int = 8) -> int:
+        """Estimate bytes not downloaded from each blocked URL's Content-Length.
+
+        Makes one HEAD request per distinct URL (concurrently), so call it
+        once per session, after the tests. URLs whose size cannot be
+        determined count as zero.
+        """
+        urls = list(self.by_url)
+        with ThreadPoolExecutor(max_workers=max(1, min(workers, len(urls)))) as pool:
+            sizes = pool.map(lambda url: _content_length(url, timeout), urls)
+        self.bytes_saved = sum((size or 0) * self.by_url[url] for url, size in zip(urls, sizes))
+        return self.bytes_saved
+
+
+def _content_length(url: str, timeout: float) -> Optional[int]:
+    """Content-Length reported for url by a HEAD request, if any."""
+    try:
+        request = urllib.request.Request(url, method="HEAD")
+        with urllib.request.urlopen(request, timeout=timeout) as response:
+            length = response.headers.get("Content-Length")
+    except Exception:
+        return None
+    return int(length) if length and length.isdigit() else None
+
+
+def route_context(context, policy: BlockingPolicy, stats: BlockingStats):
+    """Apply policy to a Playwright BrowserContext, counting blocked requests."""
+    def handle(route, request):
+        if policy.should_block(request.url, request.resource_type):
+            stats.record(request.url, request.resource_type)
+            route.abort("blockedbyclient")
+        else:
+            route.continue_()
+
+    context.route("**/*", handle)
+
+
+def apply_chromium_blocking(driver, policy: BlockingPolicy):
+    """Install DevTools URL blocking on a Chrome/Edge driver."""
+    patterns = policy.chromium_url_patterns()
+    if patterns:
+        driver.execute_cdp_cmd("Network.enable", {})
+        driver.execute_cdp_cmd("Network.setBlockedURLs", {"urls": patterns})
+
+
+def format_stats(policy: BlockingPolicy, stats: BlockingStats) -> List[str]:
+    """Render blocking counters for the terminal summary."""
+    lines = [f"policy: {policy.describe()}",
+             f"blocked requests (Playwright): {stats.total}"]
+    for resource_type, count in stats.by_type.most_common():
+        lines.append(f"  {resource_type}: {count}")
+    if stats.bytes_saved is not None:
+        lines.append(f"estimated transfer saved: {stats.bytes_saved / 1024:.1f} KiB")
+    lines.append("Selenium blocks inside the browser and is not counted")
+    return lines
@@ -0,0 +1,135 @@
+"""Concurrent scenario runner on the async Playwright API.
+
+Runs many scenarios inside one browser on one event loop, each in its own
+BrowserContext (isolated cookies and storage), with a cap on how many run at
+once. One Chromium holds dozens of contexts far more cheaply than dozens of
+processes can each hold a browser.
+
+Example:
+    async def add_backpack(page):
+        login_page = LoginPage(page)
+        await login_page.navigate()
+        await login_page.login(config.VALID_USER, config.PASSWORD)
+        await ProductsPage(page).add_item_to_cart("sauce-labs-backpack")
+
+    results = ScenarioRunner(concurrency=10).run_sync([add_backpack] * 50)
+"""
+import asyncio
+import threading
+import time
+import traceback
+from typing import Awaitable, Callable, Dict, Iterable, List, Optional, Tuple, Union
+
+from playwright.async_api import Browser, Page, async_playwright
+
+from utils.config import config
+
+Scenario = Callable[[Page], Awaitable[None]]
+NamedScenario = Union[Scenario, Tuple[str, Scenario]]
+
+
+class ScenarioResult:
+    """Outcome of one scenario run."""
+
+    __slots__ = ("name", "passed", "duration", "error")
+
+    def __init__(self, name: str, passed: bool, duration: float, error: Optional[str] = None):
+        self.name = name
+        self.passed = passed
+        self.duration = duration
+        self.error = error
+
+    def __repr__(self) -> str:
+        status = "passed" if self.passed else "failed"
+        return f"ScenarioResult({self.name!r}, {status}, {self.duration:.3f}s)"
+
+
+def _named(scenarios: Iterable[NamedScenario]) -> List[Tuple[str, Scenario]]:
+    """Normalize scenarios to (name, coroutine function) pairs."""
+    named = []
+    for index, scenario in enumerate(scenarios):
+        if isinstance(scenario, tuple):
+            named.append(scenario)
+        else:
+            named.append((f"{getattr(scenario, '__name__', 'scenario')}[{index}]", scenario))
+    return named
+
+
+async def run_scenarios(browser: Browser, scenarios: Iterable[NamedScenario],
+                        concurrency: int = None,
+                        context_options: Dict = None) -> List[ScenarioResult]:
+    """Run scenarios concurrently, one fresh context each, on a launched browser.
+
+    Args:
+        browser: Async Playwright Browser to open contexts in
+        scenarios: Coroutine functions taking a Page, optionally as (name, fn)
+        concurrency: Maximum number of contexts open at once
+        context_options: Extra keyword arguments for ``browser.new_context``
+
+    Returns:
+        One ScenarioResult per scenario, in input order
+    """
+    limit = asyncio.Semaphore(concurrency or config.ASYNC_CONCURRENCY)
+    options = {"viewport": config.VIEWPORT}
+    options.update(context_options or {})
+
+    async def run_one(name: str, scenario: Scenario) -> ScenarioResult:
+        async with limit:
+            context = await browser.new_context(**options)
+            context.set_default_timeout(config.PLAYWRIGHT_TIMEOUT)
+            start = time.perf_counter()
+            try:
+                page = await context.new_page()
+                await scenario(page)
+                return ScenarioResult(name, True, time.perf_counter() - start)
+            except Exception:
+                return ScenarioResult(name, False, time.perf_counter() - start,
+                                      traceback.format_exc())
+            finally:
+                await context.close()
+
+    return await asyncio.gather(*(run_one(name, fn) for name, fn in _named(scenarios)))
+
+
+class ScenarioRunner:
+    """Launches a browser and runs scenarios concurrently in separate contexts."""
+
+    def __init__(self, concurrency: int = None, browser_name: str = None,
+                 headless: bool = None, context_options: Dict = None):
+        self.concurrency = concurrency or config.ASYNC_CONCURRENCY
+        self.browser_name = browser_name or config.PLAYWRIGHT_BROWSER
+        self.headless = headless if headless is not None else config.HEADLESS
+        self.context_options = context_options or {}
+
+    async def run(self, scenarios: Iterable[NamedScenario]) -> List[ScenarioResult]:
+        """Launch the browser, run every scenario and close it again."""
+        async with async_playwright() as playwright:
+            browser_type = getattr(playwright, self.browser_name)
+            browser = await browser_type.launch(headless=self.headless)
+            try:
+                return await run_scenarios(browser, scenarios, self.concurrency,
+                                           self.context_options)
+            finally:
+                await browser.close()
+
+    def run_sync(self, scenarios: Iterable[NamedScenario]) -> List[ScenarioResult]:
+        """Run from synchronous code, e.g. a regular pytest test.
+
+        The event loop lives on a dedicated thread so this also works while a
+        sync Playwright session is active on the calling thread.
+        """
+        scenarios = list(scenarios)
+        outcome = {}
+
+        def target():
+            try:
+                outcome["results"] = asyncio.run(self.run(scenarios))
+            except BaseException as exc:
+                outcome["error"] = exc
+
+        thread = threading.Thread(target=target, name="scenario-runner")
+        thread.start()
+        thread.join()
+        if "error" in outcome:
+            raise outcome["error"]
+        return outcome["results"]
@@ -0,0 +1,127 @@
+"""Screenshot sink that encodes and writes captures on background threads.
+
+Only the browser round trip for the raw image happens on the calling (test)
+thread. Re-encoding to JPEG/WebP, downscaling and the disk write run in a
+thread pool, so capturing a failure costs milliseconds. Frames identical to
+one already captured are not written twice.
+"""
+import hashlib
+import importlib.util
+import io
+import threading
+import warnings
+from concurrent.futures import Future, ThreadPoolExecutor
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, List
+
+from utils.config import config
+
+EXTENSIONS = {"png": "png", "jpeg": "jpg", "webp": "webp"}
+
+
+class ScreenshotSink:
+    """Captures screenshots and hands encoding and writing to a thread pool."""
+
+    def __init__(self, directory: str = None, image_format: str = None,
+                 quality: int = None, scale: float = None, workers: int = None):
+        self.directory = Path(directory or config.SCREENSHOTS_DIR)
+        self.format = (image_format or config.SCREENSHOT_FORMAT).lower()
+        if self.format not in EXTENSIONS:
+            raise ValueError(f"Unsupported screenshot format: {self.format}")
+        self.quality = quality if quality is not None else config.SCREENSHOT_QUALITY
+        self.scale = scale if scale is not None else config.SCREENSHOT_SCALE
+        if self._needs_pillow() and importlib.util.find_spec("PIL") is None:
+            warnings.warn("Pillow is not installed; screenshots are saved as full-size PNG")
+            self.format, self.scale = "png", 1.0
+        self._executor = ThreadPoolExecutor(
+            max_workers=workers or config.SCREENSHOT_WORKERS,
+            thread_name_prefix="screenshot",
+        )
+        self._pending: List[Future] = []
+        self._seen: Dict[str, str] = {}
+        self._lock = threading.Lock()
+        self._directory_ready = False
+        self.written = 0
+        self.duplicates = 0
+
+    def capture(self, driver_or_page, test_name: str, framework: str = "selenium",
+                element=None) -> str:
+        """Grab a screenshot and queue it for writing.
+
+        Args:
+            driver_or_page: Selenium WebDriver or Playwright Page
+            test_name: Name of the test, used in the filename
+            framework: 'selenium' or 'playwright'
+            element: Optional WebElement / Locator to clip the capture to
+
+        Returns:
+            Path the screenshot will be written to (or the path of an
+            identical earlier frame)
+        """
+        raw = self._grab(driver_or_page, framework, element)
+        digest = hashlib.sha1(raw).hexdigest()
+        timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+        path = self.directory / f"{framework}_{test_name}_{timestamp}.{EXTENSIONS[self.format]}"
+        with self._lock:
+            if digest in self._seen:
+                self.duplicates += 1
+                return self._seen[digest]
+            self._seen[digest] = str(path)
+            if not self._directory_ready:
+                self.directory.mkdir(parents=True, exist_ok=True)
+                self._directory_ready = True
+            self._pending.append(self._executor.submit(self._write, raw, path))
+        return str(path)
+
+    def flush(self) -> List[BaseException]:
+        """Wait for queued writes and return any errors they raised."""
+        with self._lock:
+            pending, self._pending = self._pending, []
+        return [error for error in (future.exception() for future in pending) if error]
+
+    def close(self) -> List[BaseException]:
+        """Flush pending writes and stop the worker threads."""
+        errors = self.flush()
+        self._executor.shutdown(wait=True)
+        return errors
+
+    def _needs_pillow(self) -> bool:
+        return self.format != "png" or self.scale != 1.0
+
+    def _grab(self, driver_or_page, framework: str, element) -> bytes:
+        """Fetch the raw image from the browser on the calling thread."""
+        if framework == "selenium":
+            if element is not None:
+                return element.screenshot_as_png
+            return driver_or_page.get_screenshot_as_png()
+        target = element if element is not None else driver_or_page
+        if self.format == "jpeg" and self.scale == 1.0:
+            # The browser encodes JPEG much faster than PNG and no re-encode is needed
+            return target.screenshot(type="jpeg", quality=self.quality)
+        return target.screenshot(type="png")
+
+    def _write(self, raw: bytes, path: Path):
+        """Encode (if needed) and write one capture; runs on a worker thread."""
+        if not self._needs_pillow() or (raw[:2] == b"\xff\xd8" and self.format == "jpeg"):
+            path.write_bytes(raw)
+        else:
+            self._encode(raw, path)
+        with self._lock:
+            self.written += 1
+
+    def _encode(self, raw: bytes, path: Path):
+        """Downscale and re-encode raw PNG bytes with Pillow."""
+        from PIL import Image
+
+        with Image.open(io.BytesIO(raw)) as image:
+            if self.scale != 1.0:
+                size = (max(1, int(image.width * self.scale)), max(1, int(image.height * self.scale)))
+                image = image.resize(size, Image.BILINEAR)
+            if self.format == "jpeg":
+                image = image.convert("RGB")
+                image.save(path, "JPEG", quality=self.quality, optimize=False)
+            elif self.format == "webp":
+                image.save(path, "WEBP", quality=self.quality, method=0)
+            else:
+                image.save(path, "PNG", compress_level=1)
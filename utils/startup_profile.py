@@ -0,0 +1,74 @@
+"""Import and collection timing for ``--startup-profile``.
+
+The import profiler wraps ``builtins.__import__`` and records every module
+imported for the first time on the main thread, with its cumulative time and
+what was happening when it was imported (conftest import, collecting a test
+module, or setting up a test's fixtures). Nested imports are folded into the
+outermost one, like the cumulative column of ``python -X importtime``.
+"""
+import builtins
+import sys
+import threading
+import time
+from typing import Dict, List, Tuple
+
+# Entries shown per section of the report
+TOP = 15
+
+
+class ImportProfiler:
+    """Times first-time imports while installed."""
+
+    def __init__(self):
+        self.imports: List[Tuple[str, float, str]] = []  # module, seconds, context
+        self.context = "conftest import"
+        self._original = None
+        self._thread = threading.get_ident()
+        self._depth = 0
+
+    @property
+    def installed(self) -> bool:
+        return self._original is not None
+
+    def install(self):
+        if self._original is None:
+            self._original = builtins.__import__
+            builtins.__import__ = self._import
+
+    def uninstall(self):
+        if self._original is not None:
+            builtins.__import__ = self._original
+            self._original = None
+
+    def _import(self, name, globals=None, locals=None, fromlist=(), level=0):
+        if level or name in sys.modules or threading.get_ident() != self._thread:
+            return self._original(name, globals, locals, fromlist, level)
+        self._depth += 1
+        started = time.perf_counter()
+        try:
+            return self._original(name, globals, locals, fromlist, level)
+        finally:
+            self._depth -= 1
+            if self._depth == 0:
+                self.imports.append((name, time.perf_counter() - started, self.context))
+
+
+def format_profile(conftest_seconds: float, collect: Dict[str, float],
+                   imports: List[Tuple[str, float, str]]) -> List[str]:
+    """Report conftest import, per-module collection and slowest imports.
+
+    Args:
+        conftest_seconds: time spent importing tests/conftest.py
+        collect: test module path -> collection seconds (including its imports)
+        imports: (module, seconds, context) from ImportProfiler
+    """
+    lines = [f"conftest import: {conftest_seconds * 1000:.0f}ms"]
+    if collect:
+        lines.append(f"collection: {sum(collect.values()) * 1000:.0f}ms over {len(collect)} modules")
+        for path, seconds in sorted(collect.items(), key=lambda entry: -entry[1])[:TOP]:
+            lines.append(f"  {seconds * 1000:7.1f}ms  {path}")
+    if imports:
+        lines.append(f"first-time imports: {sum(entry[1] for entry in imports) * 1000:.0f}ms")
+        for module, seconds, context in sorted(imports, key=lambda entry: -entry[1])[:TOP]:
+            lines.append(f"  {seconds * 1000:7.1f}ms  {module}  ({context})")
+    return lines
@@ -0,0 +1,333 @@
+"""Per-test timing history, trend report and slowdown detection.
+
+Every session appends the duration of each test's setup, call and teardown
+phases to ``TIMING_DB``, plus the setup cost of every fixture the test
+actually set up (``fixture:selenium_driver`` is the driver launch charged to
+the first test that needed it). Rows are keyed by commit, browser and Python
+version. Only passing phases are used for trends.
+
+A test phase has slowed down when the median of its runs on the newest
+commit is more than ``TIMING_THRESHOLD`` above the median of the
+``TIMING_WINDOW`` runs before that commit, and by at least
+``TIMING_MIN_SECONDS``:
+
+    python -m utils.timing_history report --html reports/timing_trends.html
+    python -m utils.timing_history check     # exit 1 on slowdowns
+"""
+import argparse
+import html
+import os
+import sqlite3
+import statistics
+import subprocess
+import sys
+import time
+import uuid
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from utils.config import config
+
+ROOT = Path(__file__).resolve().parent.parent
+PHASES = ("setup", "call", "teardown")
+FIXTURE_PREFIX = "fixture:"
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS runs (
+    run_id TEXT PRIMARY KEY,
+    started REAL NOT NULL,
+    commit_id TEXT NOT NULL,
+    python TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS timings (
+    run_id TEXT NOT NULL,
+    nodeid TEXT NOT NULL,
+    browser TEXT NOT NULL,
+    phase TEXT NOT NULL,
+    outcome TEXT NOT NULL,
+    seconds REAL NOT NULL,
+    PRIMARY KEY (run_id, nodeid, phase)
+);
+"""
+
+# (nodeid, browser, python, phase)
+TrendKey = Tuple[str, str, str, str]
+
+
+def current_commit(cwd: Path = ROOT) -> str:
+    """Commit under test: CI's commit variable, else git HEAD (+dirty with local changes)."""
+    for variable in ("TIMING_COMMIT", "GITHUB_SHA", "CI_COMMIT_SHA", "GIT_COMMIT"):
+        if os.getenv(variable):
+            return os.environ[variable][:12]
+    try:
+        head = subprocess.run(["git", "rev-parse", "--short=12", "HEAD"], cwd=cwd,
+                              capture_output=True, text=True, check=True).stdout.strip()
+        changes = subprocess.run(["git", "status", "--porcelain", "--untracked-files=no"], cwd=cwd,
+                                 capture_output=True, text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return "unknown"
+    return f"{head}+dirty" if changes else head
+
+
+def python_version() -> str:
+    return f"{sys.version_info.major}.{sys.version_info.minor}"
+
+
+class PhaseRecorder:
+    """Turns phase reports into (nodeid, browser, phase, outcome, seconds) rows.
+
+    A rerun replaces the earlier attempt's rows, so a test contributes one
+    row per phase and fixture.
+    """
+
+    def __init__(self):
+        self._rows: Dict[Tuple[str, str], Tuple[str, str, float]] = {}
+
+    @property
+    def rows(self) -> List[Tuple[str, str, str, str, float]]:
+        return [(nodeid, browser, phase, outcome, seconds)
+                for (nodeid, phase), (browser, outcome, seconds) in self._rows.items()]
+
+    def observe(self, report):
+        properties = dict(report.user_properties)
+        browser = properties.get("timing_browser", "none")
+        self._rows[(report.nodeid, report.when)] = (browser, report.outcome, report.duration)
+        if report.when == "setup":
+            for fixture, seconds in properties.get("fixture_timings", {}).items():
+                self._rows[(report.nodeid, FIXTURE_PREFIX + fixture)] = (
+                    browser, report.outcome, seconds
+                )
+
+
+class TimingTrend:
+    """Passing runs of one test phase on one browser and Python version, oldest first."""
+
+    def __init__(self, key: TrendKey):
+        self.nodeid, self.browser, self.python, self.phase = key
+        self.points: List[Tuple[str, float]] = []  # (commit, seconds)
+
+    @property
+    def latest_commit(self) -> str:
+        return self.points[-1][0]
+
+    def split(self, window: int = None) -> Tuple[List[float], List[float]]:
+        """Seconds on the newest commit, and up to `window` runs before it."""
+        window = window or config.TIMING_WINDOW
+        index = len(self.points)
+        while index and self.points[index - 1][0] == self.latest_commit:
+            index -= 1
+        recent = [seconds for _, seconds in self.points[index:]]
+        baseline = [seconds for _, seconds in self.points[max(index - window, 0):index]]
+        return recent, baseline
+
+    def change(self, window: int = None) -> Optional[Tuple[float, float]]:
+        """(newest median, earlier median), or None without earlier runs."""
+        recent, baseline = self.split(window)
+        if not baseline:
+            return None
+        return statistics.median(recent), statistics.median(baseline)
+
+    def slowed_down(self, threshold: float = None, min_seconds: float = None,
+                    window: int = None, min_runs: int = None) -> bool:
+        threshold = config.TIMING_THRESHOLD if threshold is None else threshold
+        min_seconds = config.TIMING_MIN_SECONDS if min_seconds is None else min_seconds
+        min_runs = config.TIMING_MIN_RUNS if min_runs is None else min_runs
+        # A phase first seen on the newest commit has nothing to compare with
+        if len(self.split(window)[1]) < max(min_runs, 1):
+            return False
+        current, earlier = self.change(window)
+        return current > earlier * (1 + threshold) and current - earlier >= min_seconds
+
+    def describe(self, window: int = None) -> str:
+        current, earlier = self.change(window)
+        ratio = f"+{current / earlier - 1:.0%}" if earlier else "new cost"
+        return (f"{self.nodeid} [{self.phase}] {self.browser} py{self.python}: "
+                f"{earlier:.3f}s -> {current:.3f}s ({ratio}) at {self.latest_commit}")
+
+
+class TimingStore:
+    """SQLite history of per-phase test timings."""
+
+    def __init__(self, path: str = None):
+        self.path = Path(path or config.TIMING_DB)
+
+    def _connect(self) -> sqlite3.Connection:
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        connection = sqlite3.connect(str(self.path), timeout=30)
+        connection.executescript(_SCHEMA)
+        return connection
+
+    def record(self, rows: Iterable[Tuple[str, str, str, str, float]], commit: str = None,
+               python: str = None, run_id: str = None, started: float = None) -> str:
+        """Append one session's (nodeid, browser, phase, outcome, seconds) rows; return its run id."""
+        run_id = run_id or uuid.uuid4().hex
+        connection = self._connect()
+        try:
+            with connection:
+                connection.execute(
+                    "INSERT INTO runs VALUES (?, ?, ?, ?)",
+                    (run_id, time.time() if started is None else started,
+                     commit or current_commit(), python or python_version()),
+                )
+                connection.executemany(
+                    "INSERT OR REPLACE INTO timings VALUES (?, ?, ?, ?, ?, ?)",
+                    [(run_id, nodeid, browser, phase, outcome, round(seconds, 4))
+                     for nodeid, browser, phase, outcome, seconds in rows],
+                )
+        finally:
+            connection.close()
+        return run_id
+
+    def trends(self, nodeids: Iterable[str] = None) -> Dict[TrendKey, TimingTrend]:
+        """Trend per (test, browser, Python, phase), plus a "total" phase per run."""
+        if not self.path.exists():
+            return {}
+        connection = self._connect()
+        try:
+            rows = connection.execute(
+                "SELECT t.nodeid, t.browser, r.python, t.phase, r.commit_id, r.run_id, t.seconds "
+                "FROM timings t JOIN runs r ON r.run_id = t.run_id "
+                "WHERE t.outcome = 'passed' ORDER BY r.started, r.run_id"
+            ).fetchall()
+        finally:
+            connection.close()
+
+        wanted = set(nodeids) if nodeids is not None else None
+        trends: Dict[TrendKey, TimingTrend] = {}
+        totals: Dict[Tuple[str, str, str, str], List] = {}
+        for nodeid, browser, python, phase, commit, run_id, seconds in rows:
+            if wanted is not None and nodeid not in wanted:
+                continue
+            key = (nodeid, browser, python, phase)
+            if key not in trends:
+                trends[key] = TimingTrend(key)
+            trends[key].points.append((commit, seconds))
+            if phase in PHASES:
+                total = totals.setdefault((nodeid, browser, python, run_id), [commit, 0.0, 0])
+                total[1] += seconds
+                total[2] += 1
+        for (nodeid, browser, python, _), (commit, seconds, phases) in totals.items():
+            # Only runs in which every phase passed
+            if phases == len(PHASES):
+                key = (nodeid, browser, python, "total")
+                if key not in trends:
+                    trends[key] = TimingTrend(key)
+                trends[key].points.append((commit, seconds))
+        return trends
+
+    def slowdowns(self, nodeids: Iterable[str] = None, threshold: float = None,
+                  min_seconds: float = None, window: int = None) -> List[TimingTrend]:
+        """Phases (not totals) slower on the newest commit, worst relative change first."""
+        found = [trend for trend in self.trends(nodeids).values()
+                 if trend.phase != "total" and trend.slowed_down(threshold, min_seconds, window)]
+
+        def relative(trend: TimingTrend) -> float:
+            current, earlier = trend.change(window)
+            return current / earlier if earlier else float("inf")
+        return sorted(found, key=relative, reverse=True)
+
+
+def _sparkline(values: List[float], width: int = 160, height: int = 28) -> str:
+    """Inline SVG polyline of values, scaled to its own min/max."""
+    if len(values) < 2:
+        return ""
+    low, high = min(values), max(values)
+    span = (high - low) or 1.0
+    step = width / (len(values) - 1)
+    points = " ".join(f"{index * step:.1f},{height - 2 - (value - low) / span * (height - 4):.1f}"
+                      for index, value in enumerate(values))
+    last_x, last_y = points.rsplit(" ", 1)[-1].split(",")
+    return (f'<svg width="{width}" height="{height}" viewBox="0 0 {width} {height}">'
+            f'<polyline fill="none" stroke="#4a6fa5" stroke-width="1.5" points="{points}"/>'
+            f'<circle cx="{last_x}" cy="{last_y}" r="2.5" fill="#4a6fa5"/></svg>')
+
+
+def render_html(trends: Dict[TrendKey, TimingTrend], slowdowns: List[TimingTrend],
+                window: int = None, title: str = "Test timing trends") -> str:
+    """Static HTML page: slowdowns, then every test's total duration over its runs."""
+    escape = html.escape
+    slowed = {(trend.nodeid, trend.browser, trend.python) for trend in slowdowns}
+    parts = [
+        "<!DOCTYPE html><html><head><meta charset='utf-8'>",
+        f"<title>{escape(title)}</title><style>",
+        "body{font:14px sans-serif;margin:2em}table{border-collapse:collapse}",
+        "td,th{padding:4px 10px;border-bottom:1px solid #ddd;text-align:left}",
+        "td.num{text-align:right;font-variant-numeric:tabular-nums}tr.slow{background:#fde8e8}",
+        "</style></head><body>",
+        f"<h1>{escape(title)}</h1>",
+        f"<h2>Slower on the newest commit ({len(slowdowns)})</h2>",
+    ]
+    if slowdowns:
+        parts.append("<table><tr><th>Test</th><th>Phase</th><th>Browser</th><th>Python</th>"
+                     "<th>Before</th><th>Now</th><th>Change</th><th>Commit</th><th>Runs</th></tr>")
+        for trend in slowdowns:
+            current, earlier = trend.change(window)
+            change = f"+{current / earlier - 1:.0%}" if earlier else "new"
+            parts.append(
+                f"<tr class='slow'><td>{escape(trend.nodeid)}</td><td>{escape(trend.phase)}</td>"
+                f"<td>{escape(trend.browser)}</td><td>{escape(trend.python)}</td>"
+                f"<td class='num'>{earlier:.3f}s</td><td class='num'>{current:.3f}s</td>"
+                f"<td class='num'>{change}</td><td>{escape(trend.latest_commit)}</td>"
+                f"<td>{_sparkline([seconds for _, seconds in trend.points])}</td></tr>"
+            )
+        parts.append("</table>")
+    else:
+        parts.append("<p>None.</p>")
+
+    totals = sorted((trend for trend in trends.values() if trend.phase == "total"),
+                    key=lambda trend: trend.points[-1][1], reverse=True)
+    parts.append(f"<h2>All tests ({len(totals)})</h2>")
+    parts.append("<table><tr><th>Test</th><th>Browser</th><th>Python</th><th>Runs</th>"
+                 "<th>Latest</th><th>Median</th><th>Trend</th></tr>")
+    for trend in totals:
+        values = [seconds for _, seconds in trend.points]
+        row_class = " class='slow'" if (trend.nodeid, trend.browser, trend.python) in slowed else ""
+        parts.append(
+            f"<tr{row_class}><td>{escape(trend.nodeid)}</td><td>{escape(trend.browser)}</td>"
+            f"<td>{escape(trend.python)}</td><td class='num'>{len(values)}</td>"
+            f"<td class='num'>{values[-1]:.3f}s</td>"
+            f"<td class='num'>{statistics.median(values):.3f}s</td><td>{_sparkline(values)}</td></tr>"
+        )
+    parts.append("</table></body></html>")
+    return "\n".join(parts)
+
+
+def main(argv: List[str] = None) -> int:
+    """Write the HTML trend report or check for slowdowns."""
+    parser = argparse.ArgumentParser(description="Per-test timing history")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+    report_parser = subparsers.add_parser("report", help="Write a static HTML trend report")
+    report_parser.add_argument("--html", default=config.TIMING_REPORT)
+    check_parser = subparsers.add_parser("check", help="Exit 1 when a test phase got slower")
+    for subparser in (report_parser, check_parser):
+        subparser.add_argument("--db", default=config.TIMING_DB)
+        subparser.add_argument("--threshold", type=float, default=config.TIMING_THRESHOLD,
+                               help="Allowed relative slowdown of the median (0.2 = 20%%)")
+        subparser.add_argument("--min-seconds", type=float, default=config.TIMING_MIN_SECONDS,
+                               help="Ignore slowdowns smaller than this many seconds")
+        subparser.add_argument("--window", type=int, default=config.TIMING_WINDOW,
+                               help="Earlier runs the newest commit is compared with")
+    args = parser.parse_args(argv)
+
+    store = TimingStore(args.db)
+    slowdowns = store.slowdowns(threshold=args.threshold, min_seconds=args.min_seconds,
+                                window=args.window)
+    for trend in slowdowns:
+        print(f"SLOWER {trend.describe(args.window)}")
+    if args.command == "report":
+        trends = store.trends()
+        if not trends:
+            print(f"No timing history in {args.db}")
+            return 0
+        path = Path(args.html)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_text(render_html(trends, slowdowns, args.window), encoding="utf-8")
+        print(f"Trend report: {path}")
+        return 0
+    if not slowdowns:
+        print("No test got slower beyond the threshold")
+    return 1 if slowdowns else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,153 @@
+"""Opt-in tracing of page-object actions as Chrome trace events.
+
+Page-object methods decorated with ``@traced(...)`` record their start, end,
+locator and the time spent in nested explicit waits. When tracing is off the
+decorator costs one attribute check per call. Traces are written per test as
+trace-event JSON that opens in chrome://tracing or https://ui.perfetto.dev.
+"""
+import functools
+import json
+import os
+import re
+import threading
+import time
+from pathlib import Path
+from typing import Dict, List, Tuple
+
+# Aggregate per (action, locator): [calls, total_ms, max_ms, wait_ms]
+ActionSummary = Dict[Tuple[str, str], List[float]]
+
+
+class ActionTracer:
+    """Collects spans for the currently running test."""
+
+    def __init__(self):
+        self.enabled = False
+        self.events: List[Dict] = []
+        self._local = threading.local()
+        self._pid = os.getpid()
+
+    def start(self):
+        """Begin recording a fresh trace."""
+        self.events = []
+        self.enabled = True
+
+    def stop(self) -> List[Dict]:
+        """Stop recording and return the collected events."""
+        self.enabled = False
+        events, self.events = self.events, []
+        return events
+
+    def record(self, action: str, category: str, locator: str, owner: str, func, args, kwargs):
+        """Run func inside a span and record it."""
+        stack = getattr(self._local, "stack", None)
+        if stack is None:
+            stack = self._local.stack = []
+        frame = [0]  # nanoseconds spent in nested waits
+        stack.append(frame)
+        start = time.perf_counter_ns()
+        try:
+            return func(*args, **kwargs)
+        finally:
+            duration = time.perf_counter_ns() - start
+            stack.pop()
+            if stack and category == "wait":
+                stack[-1][0] += duration
+            self.events.append({
+                "name": f"{owner}.{action}",
+                "cat": category,
+                "ph": "X",
+                "ts": start / 1000,
+                "dur": duration / 1000,
+                "pid": self._pid,
+                "tid": threading.get_ident(),
+                "args": {
+                    "locator": locator,
+                    "wait_ms": round(frame[0] / 1e6, 3),
+                    "nested": bool(stack),
+                },
+            })
+
+
+tracer = ActionTracer()
+
+
+def traced(action: str, locator_args: int = 0, category: str = "action"):
+    """Decorate a page-object method so it is recorded while tracing is on.
+
+    Args:
+        action: Action type shown in the trace, e.g. "click"
+        locator_args: Number of leading positional arguments that form the locator
+        category: "action" for interactions, "wait" for explicit waits
+    """
+    def decorator(func):
+        @functools.wraps(func)
+        def wrapper(self, *args, **kwargs):
+            if not tracer.enabled:
+                return func(self, *args, **kwargs)
+            locator = " ".join(str(arg) for arg in args[:locator_args])
+            return tracer.record(action, category, locator, type(self).__name__,
+                                 func, (self,) + args, kwargs)
+        return wrapper
+    return decorator
+
+
+def write_trace(events: List[Dict], test_name: str, directory: str) -> str:
+    """Write events as a trace-event JSON file and return its path."""
+    target_dir = Path(directory)
+    target_dir.mkdir(parents=True, exist_ok=True)
+    filename = re.sub(r"[^A-Za-z0-9_.-]+", "_", test_name).strip("_") + ".json"
+    path = target_dir / filename
+    metadata = {
+        "name": "process_name",
+        "ph": "M",
+        "pid": os.getpid(),
+        "args": {"name": test_name},
+    }
+    path.write_text(json.dumps({"traceEvents": [metadata] + events,
+                                "displayTimeUnit": "ms"}))
+    return str(path)
+
+
+def summarize(events: List[Dict]) -> ActionSummary:
+    """Aggregate top-level spans by action and locator."""
+    summary: ActionSummary = {}
+    for event in events:
+        if event["args"]["nested"]:
+            continue
+        key = (event["name"], event["args"]["locator"])
+        duration_ms = event["dur"] / 1000
+        entry = summary.setdefault(key, [0, 0.0, 0.0, 0.0])
+        entry[0] += 1
+        entry[1] += duration_ms
+        entry[2] = max(entry[2], duration_ms)
+        entry[3] += event["args"]["wait_ms"]
+    return summary
+
+
+def merge_summary(total: ActionSummary, rows: List[List]):
+    """Fold serialized summary rows ([action, locator, calls, total, max, wait]) into total."""
+    for action, locator, calls, total_ms, max_ms, wait_ms in rows:
+        entry = total.setdefault((action, locator), [0, 0.0, 0.0, 0.0])
+        entry[0] += calls
+        entry[1] += total_ms
+        entry[2] = max(entry[2], max_ms)
+        entry[3] += wait_ms
+
+
+def summary_rows(summary: ActionSummary) -> List[List]:
+    """Serialize a summary into plain lists (safe for xdist transport)."""
+    return [[action, locator] + [round(value, 3) for value in values]
+            for (action, locator), values in summary.items()]
+
+
+def format_slowest(summary: ActionSummary, limit: int = 15) -> List[str]:
+    """Render the actions with the highest total time."""
+    lines = [f"{'total':>10}{'calls':>7}{'max':>10}{'wait':>10}  action / locator"]
+    ranked = sorted(summary.items(), key=lambda item: item[1][1], reverse=True)
+    for (action, locator), (calls, total_ms, max_ms, wait_ms) in ranked[:limit]:
+        lines.append(
+            f"{total_ms:>8.1f}ms{int(calls):>7}{max_ms:>8.1f}ms{wait_ms:>8.1f}ms  "
+            f"{action} {locator}".rstrip()
+        )
+    return lines
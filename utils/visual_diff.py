@@ -0,0 +1,372 @@
+"""Visual regression: compare screenshots against stored baselines.
+
+Frames are matched to baselines by name. The name is the screenshot
+filename without the ``_YYYYmmdd_HHMMSS`` timestamp that ``take_screenshot``
+and ``ScreenshotSink`` append, so the newest capture of each test is
+compared. Each frame goes through three passes, cheapest first:
+
+1. content digest: byte-identical to the baseline, so it passes without
+   being decoded (the common case when nothing changed)
+2. perceptual hash: a 64-bit dHash of the decoded frame. Its Hamming
+   distance to the baseline's hash is reported. Beyond VISUAL_HASH_DISTANCE
+   the frame is flagged as a layout change
+3. pixel diff: a NumPy diff of the two frames, ignoring configured regions.
+   A pixel counts as changed when any channel differs by more than
+   VISUAL_TOLERANCE, and the frame fails when more than
+   VISUAL_MAX_DIFF_RATIO of the compared pixels changed. That is 0 by
+   default: one changed pixel fails the frame, and anti-aliasing noise is
+   left to the tolerance. Failing frames get a diff image: the new frame
+   washed out, changed pixels in red
+
+A dHash cannot see a changed price or a one-word label, so it never passes
+a frame on its own; passes 2 and 3 run on every frame whose digest differs.
+They run in a process pool.
+
+    python -m utils.visual_diff compare screenshots --baseline-dir visual/baselines/chrome
+    python -m utils.visual_diff accept screenshots --baseline-dir visual/baselines/chrome
+
+Ignore regions live in VISUAL_IGNORE_FILE, a JSON object mapping frame-name
+globs to ``[x, y, width, height]`` rectangles:
+
+    {"*_checkout_*": [[1500, 0, 420, 60]]}
+"""
+import argparse
+import fnmatch
+import hashlib
+import json
+import os
+import re
+import shutil
+import sys
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+from typing import Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+from PIL import Image
+
+from utils.config import config
+
+IMAGE_SUFFIXES = (".png", ".jpg", ".jpeg", ".webp")
+MANIFEST = "manifest.json"
+# Timestamp appended by take_screenshot/ScreenshotSink
+_TIMESTAMP = re.compile(r"_\d{8}_\d{6}$")
+
+Region = Tuple[int, int, int, int]  # x, y, width, height
+
+
+def frame_name(path: Path) -> str:
+    """Stable frame name: the filename stem without its capture timestamp."""
+    return _TIMESTAMP.sub("", Path(path).stem)
+
+
+def file_digest(path: Path) -> str:
+    return hashlib.sha1(Path(path).read_bytes()).hexdigest()
+
+
+def dhash(image: Image.Image, hash_size: int = 8) -> int:
+    """Difference hash: one bit per horizontally adjacent pair of a tiny grayscale copy."""
+    small = np.asarray(image.convert("L").resize((hash_size + 1, hash_size), Image.Resampling.BOX),
+                       dtype=np.int16)
+    bits = (small[:, 1:] > small[:, :-1]).ravel()
+    return int("".join("1" if bit else "0" for bit in bits), 2)
+
+
+def hamming(first: int, second: int) -> int:
+    return bin(first ^ second).count("1")
+
+
+def load_ignore_rules(path: str = None) -> Dict[str, List[Region]]:
+    """Frame-name glob -> ignore rectangles; empty when the file is missing."""
+    rules_path = Path(path or config.VISUAL_IGNORE_FILE)
+    if not rules_path.exists():
+        return {}
+    rules = json.loads(rules_path.read_text())
+    return {pattern: [tuple(region) for region in regions] for pattern, regions in rules.items()}
+
+
+def regions_for(name: str, rules: Dict[str, List[Region]]) -> List[Region]:
+    regions: List[Region] = []
+    for pattern, rectangles in rules.items():
+        if fnmatch.fnmatchcase(name, pattern):
+            regions.extend(rectangles)
+    return regions
+
+
+def latest_frames(directory: Path) -> Dict[str, Path]:
+    """Frame name -> newest image file for that name under directory."""
+    frames: Dict[str, Path] = {}
+    for path in sorted(Path(directory).rglob("*")):
+        if path.suffix.lower() not in IMAGE_SUFFIXES or path.stem.endswith(".diff"):
+            continue
+        name = frame_name(path)
+        # Timestamps sort lexically, so the last one seen is the newest
+        if name not in frames or path.name > frames[name].name:
+            frames[name] = path
+    return frames
+
+
+class FrameResult:
+    """Outcome of comparing one frame with its baseline.
+
+    status is one of identical, passed, failed, resized or new.
+    """
+
+    def __init__(self, name: str, status: str, diff_ratio: float = 0.0,
+                 hash_distance: Optional[int] = None, bbox: Optional[Region] = None,
+                 diff_path: Optional[str] = None):
+        self.name = name
+        self.status = status
+        self.diff_ratio = diff_ratio
+        self.hash_distance = hash_distance
+        self.bbox = bbox
+        self.diff_path = diff_path
+
+    @property
+    def ok(self) -> bool:
+        return self.status in ("identical", "passed")
+
+    def layout_changed(self, max_distance: int) -> bool:
+        return self.hash_distance is not None and self.hash_distance > max_distance
+
+    def to_dict(self) -> Dict:
+        return {"name": self.name, "status": self.status, "diff_ratio": self.diff_ratio,
+                "hash_distance": self.hash_distance, "bbox": self.bbox,
+                "diff_path": self.diff_path}
+
+
+class BaselineStore:
+    """Baseline images plus a manifest of their digests, hashes and sizes."""
+
+    def __init__(self, directory: str = None):
+        self.directory = Path(directory or config.VISUAL_BASELINE_DIR)
+        self._manifest_path = self.directory / MANIFEST
+        self.manifest: Dict[str, Dict] = (
+            json.loads(self._manifest_path.read_text()) if self._manifest_path.exists() else {}
+        )
+        self._dirty = False
+        self._files: Optional[Dict[str, Path]] = None
+
+    def path(self, name: str) -> Optional[Path]:
+        entry = self.manifest.get(name)
+        if entry is not None:
+            return self.directory / entry["file"]
+        if self._files is None:
+            # Baselines copied in by hand, not yet in the manifest
+            self._files = latest_frames(self.directory) if self.directory.exists() else {}
+        return self._files.get(name)
+
+    def entry(self, name: str) -> Optional[Dict]:
+        """Manifest entry for name, computed (and remembered) for unlisted files."""
+        if name in self.manifest:
+            return self.manifest[name]
+        path = self.path(name)
+        if path is None:
+            return None
+        return self._describe(name, path)
+
+    def accept(self, name: str, source: Path):
+        """Make source the baseline for name."""
+        self.directory.mkdir(parents=True, exist_ok=True)
+        old = self.manifest.get(name)
+        target = self.directory / f"{name}{source.suffix.lower()}"
+        if old is not None and old["file"] != target.name:
+            (self.directory / old["file"]).unlink(missing_ok=True)
+        shutil.copyfile(source, target)
+        self._describe(name, target)
+
+    def save(self):
+        if self._dirty:
+            self.directory.mkdir(parents=True, exist_ok=True)
+            self._manifest_path.write_text(json.dumps(self.manifest, indent=2, sort_keys=True))
+            self._dirty = False
+
+    def _describe(self, name: str, path: Path) -> Dict:
+        with Image.open(path) as image:
+            entry = {"file": path.name, "sha1": file_digest(path),
+                     "dhash": f"{dhash(image):016x}", "size": list(image.size)}
+        self.manifest[name] = entry
+        self._dirty = True
+        return entry
+
+
+def _load_rgb(path: Path) -> np.ndarray:
+    with Image.open(path) as image:
+        return np.asarray(image.convert("RGB"))
+
+
+def _compare_frame(job: Dict) -> FrameResult:
+    """Hash and pixel-diff one frame against its baseline (runs in a worker process)."""
+    name = job["name"]
+    with Image.open(job["candidate"]) as image:
+        distance = hamming(dhash(image), int(job["baseline_hash"], 16))
+        candidate = np.asarray(image.convert("RGB"))
+    baseline = _load_rgb(Path(job["baseline"]))
+    if candidate.shape != baseline.shape:
+        return FrameResult(name, "resized", 1.0, distance)
+
+    if candidate.tobytes() == baseline.tobytes():
+        # Re-encoded but pixel-identical
+        return FrameResult(name, "passed", 0.0, distance)
+
+    # Largest per-channel difference, in uint8 (no widening to a signed
+    # type) and over channel views (max(axis=2) is several times slower)
+    delta = np.maximum(candidate, baseline)
+    delta -= np.minimum(candidate, baseline)
+    changed = np.maximum(np.maximum(delta[..., 0], delta[..., 1]), delta[..., 2]) > job["tolerance"]
+    compared = changed.size
+    if job["regions"]:
+        ignored = np.zeros(changed.shape, dtype=bool)
+        for x, y, region_width, region_height in job["regions"]:
+            ignored[max(y, 0):max(y + region_height, 0), max(x, 0):max(x + region_width, 0)] = True
+        changed &= ~ignored
+        compared -= int(np.count_nonzero(ignored))
+
+    changed_count = int(np.count_nonzero(changed))
+    ratio = changed_count / compared if compared else 0.0
+    if changed_count == 0 or ratio <= job["max_ratio"]:
+        return FrameResult(name, "passed", ratio, distance)
+
+    rows = np.flatnonzero(changed.any(axis=1))
+    columns = np.flatnonzero(changed.any(axis=0))
+    bbox = (int(columns[0]), int(rows[0]),
+            int(columns[-1] - columns[0] + 1), int(rows[-1] - rows[0] + 1))
+    diff = candidate // 4 + 191  # washed out, so the red stands out
+    diff[changed] = (255, 0, 0)
+    diff_path = Path(job["diff_dir"]) / f"{name}.diff.png"
+    diff_path.parent.mkdir(parents=True, exist_ok=True)
+    Image.fromarray(diff).save(diff_path, compress_level=1)
+    return FrameResult(name, "failed", ratio, distance, bbox, str(diff_path))
+
+
+class VisualComparer:
+    """Compares a set of frames with a BaselineStore."""
+
+    def __init__(self, baselines: BaselineStore = None, diff_dir: str = None,
+                 tolerance: int = None, max_diff_ratio: float = None,
+                 hash_distance: int = None, ignore_rules: Dict[str, List[Region]] = None,
+                 workers: int = None):
+        self.baselines = baselines or BaselineStore()
+        self.diff_dir = Path(diff_dir or config.VISUAL_DIFF_DIR)
+        self.tolerance = tolerance if tolerance is not None else config.VISUAL_TOLERANCE
+        self.max_diff_ratio = (max_diff_ratio if max_diff_ratio is not None
+                               else config.VISUAL_MAX_DIFF_RATIO)
+        self.hash_distance = hash_distance if hash_distance is not None else config.VISUAL_HASH_DISTANCE
+        self.ignore_rules = ignore_rules if ignore_rules is not None else load_ignore_rules()
+        self.workers = workers if workers is not None else config.VISUAL_WORKERS
+
+    def compare(self, frames: Dict[str, Path]) -> List[FrameResult]:
+        """Compare frames (name -> image path); results are sorted by name."""
+        results: List[FrameResult] = []
+        jobs: List[Dict] = []
+        for name, path in sorted(frames.items()):
+            entry = self.baselines.entry(name)
+            if entry is None:
+                results.append(FrameResult(name, "new"))
+            elif file_digest(path) == entry["sha1"]:
+                results.append(FrameResult(name, "identical", hash_distance=0))
+            else:
+                jobs.append({
+                    "name": name, "candidate": str(path),
+                    "baseline": str(self.baselines.directory / entry["file"]),
+                    "baseline_hash": entry["dhash"], "regions": regions_for(name, self.ignore_rules),
+                    "tolerance": self.tolerance, "max_ratio": self.max_diff_ratio,
+                    "diff_dir": str(self.diff_dir),
+                })
+        self.baselines.save()
+        if len(jobs) > 1 and self.workers != 1:
+            workers = min(self.workers or os.cpu_count() or 1, len(jobs))
+            with ProcessPoolExecutor(max_workers=workers) as pool:
+                chunksize = max(1, len(jobs) // (workers * 4))
+                results.extend(pool.map(_compare_frame, jobs, chunksize=chunksize))
+        else:
+            results.extend(_compare_frame(job) for job in jobs)
+        return sorted(results, key=lambda result: result.name)
+
+    def compare_dir(self, directory: str) -> List[FrameResult]:
+        return self.compare(latest_frames(Path(directory)))
+
+
+def summarize(results: Sequence[FrameResult], hash_distance: int = None) -> Dict:
+    """Counts per status plus the failing frames, for the JSON summary."""
+    hash_distance = hash_distance if hash_distance is not None else config.VISUAL_HASH_DISTANCE
+    counts: Dict[str, int] = {}
+    for result in results:
+        counts[result.status] = counts.get(result.status, 0) + 1
+    return {
+        "frames": len(results),
+        "counts": counts,
+        "layout_changes": [result.name for result in results if result.layout_changed(hash_distance)],
+        "failures": [result.to_dict() for result in results if not result.ok and result.status != "new"],
+        "new": [result.name for result in results if result.status == "new"],
+    }
+
+
+def format_summary(results: Sequence[FrameResult], hash_distance: int = None) -> List[str]:
+    hash_distance = hash_distance if hash_distance is not None else config.VISUAL_HASH_DISTANCE
+    summary = summarize(results, hash_distance)
+    lines = [f"{summary['frames']} frames: "
+             + ", ".join(f"{count} {status}" for status, count in sorted(summary["counts"].items()))]
+    for result in results:
+        if result.status == "failed":
+            layout = ", layout change" if result.layout_changed(hash_distance) else ""
+            lines.append(f"FAILED {result.name}: {result.diff_ratio:.2%} of pixels changed "
+                         f"in {result.bbox} (dHash distance {result.hash_distance}{layout}) "
+                         f"-> {result.diff_path}")
+        elif result.status == "resized":
+            lines.append(f"RESIZED {result.name}: frame size differs from the baseline")
+        elif result.status == "new":
+            lines.append(f"NEW {result.name}: no baseline (run accept to add one)")
+    return lines
+
+
+def main(argv: List[str] = None) -> int:
+    """Compare screenshots with baselines, or accept them as the new baselines."""
+    parser = argparse.ArgumentParser(description="Visual regression against stored baselines")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+    compare_parser = subparsers.add_parser("compare", help="Diff frames against their baselines")
+    accept_parser = subparsers.add_parser("accept", help="Store frames as the new baselines")
+    for subparser in (compare_parser, accept_parser):
+        subparser.add_argument("frames", nargs="?", default=config.SCREENSHOTS_DIR,
+                               help="Directory of screenshots (default: %(default)s)")
+        subparser.add_argument("--baseline-dir", default=config.VISUAL_BASELINE_DIR)
+        subparser.add_argument("--only", default=None, help="Glob of frame names to include")
+    compare_parser.add_argument("--diff-dir", default=config.VISUAL_DIFF_DIR)
+    compare_parser.add_argument("--tolerance", type=int, default=config.VISUAL_TOLERANCE,
+                                help="Per-channel difference (0-255) still counted as equal")
+    compare_parser.add_argument("--max-diff-ratio", type=float, default=config.VISUAL_MAX_DIFF_RATIO,
+                                help="Share of changed pixels a frame may have and still pass")
+    compare_parser.add_argument("--ignore", default=config.VISUAL_IGNORE_FILE,
+                                help="JSON file of ignore regions per frame-name glob")
+    compare_parser.add_argument("--workers", type=int, default=config.VISUAL_WORKERS,
+                                help="Comparison processes (0: one per CPU)")
+    compare_parser.add_argument("--json", default=None, help="Write the summary as JSON")
+    compare_parser.add_argument("--allow-new", action="store_true",
+                                help="Do not fail on frames without a baseline")
+    args = parser.parse_args(argv)
+
+    frames = latest_frames(Path(args.frames))
+    if args.only:
+        frames = {name: path for name, path in frames.items() if fnmatch.fnmatchcase(name, args.only)}
+    store = BaselineStore(args.baseline_dir)
+    if args.command == "accept":
+        for name, path in sorted(frames.items()):
+            store.accept(name, path)
+        store.save()
+        print(f"Accepted {len(frames)} frames into {store.directory}")
+        return 0
+
+    comparer = VisualComparer(store, args.diff_dir, args.tolerance, args.max_diff_ratio,
+                              ignore_rules=load_ignore_rules(args.ignore), workers=args.workers)
+    results = comparer.compare(frames)
+    for line in format_summary(results, comparer.hash_distance):
+        print(line)
+    if args.json:
+        Path(args.json).parent.mkdir(parents=True, exist_ok=True)
+        Path(args.json).write_text(json.dumps(summarize(results, comparer.hash_distance), indent=2))
+    allowed = ("identical", "passed", "new") if args.allow_new else ("identical", "passed")
+    return 0 if all(result.status in allowed for result in results) else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())